@@ -1,10 +1,21 @@
 from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.accounts.tokens import claims_are_current, token_user
+from apps.accounts.user_cache import get_cached_user
 
 class CookieJWTAuthentication(JWTAuthentication):
     """
     Custom authentication class to extract the JWT access token 
     from the 'access_token' HttpOnly cookie instead of the Authorization header.
+    Users are resolved through the short-lived user cache (see user_cache);
+    safe requests whose token claims are current get a token-backed user
+    (see tokens) unless the view sets `token_user_allowed = False`.
     """
     def authenticate(self, request):
         header = self.get_header(request)
@@ -20,4 +31,35 @@ class CookieJWTAuthentication(JWTAuthentication):
             return None
 
         validated_token = self.get_validated_token(raw_token)
+        if self.token_user_allowed(request) and claims_are_current(validated_token):
+            user = token_user(validated_token)
+            if user.is_active:
+                return user, validated_token
         return self.get_user(validated_token), validated_token
+
+    def token_user_allowed(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        view = (getattr(request, 'parser_context', None) or {}).get('view')
+        return getattr(view, 'token_user_allowed', True)
+
+    def get_user(self, validated_token):
+        """JWTAuthentication.get_user, served from the user cache."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        try:
+            user = get_cached_user(user_id)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
@@ -0,0 +1,110 @@
+"""
+PetCarePlus v2 — User Location References
+
+User location is stored twice while clients migrate: the normalized
+`division_ref` / `district_ref` / `upazila_ref` foreign keys that all
+matching code queries, and the legacy `division` / `district` / `upazila`
+strings kept for reads. These helpers keep the two in step:
+
+- `sync_location_refs()` resolves the FKs from the strings (clients that
+  still send names).
+- `sync_location_names()` rewrites the strings from the FKs (clients that
+  send IDs).
+- `geocode_location_refs()` places users that have coordinates but no
+  resolvable names, through the offline reverse geocoder.
+- `backfill_location_refs()` fills the FKs of existing rows, resolving each
+  distinct name combination once; `backfill_geocoded_location_refs()` does
+  the same for the rest from their coordinates.
+"""
+
+from apps.accounts.models import DIVISION_CHOICES
+from apps.locations.geocoder import reverse_geocode
+from apps.locations.matching import LOCATION_MODELS, resolve_location_ids
+
+
+LOCATION_NAME_FIELDS = ('division', 'district', 'upazila')
+LOCATION_REF_FIELDS = ('division_ref', 'district_ref', 'upazila_ref')
+
+_DIVISION_SLUGS = {slug for slug, _ in DIVISION_CHOICES}
+
+
+def sync_location_refs(user):
+    """Point the location FKs at the locations named by the string fields."""
+    ids = resolve_location_ids(user.division, user.district, user.upazila)
+    user.division_ref_id, user.district_ref_id, user.upazila_ref_id = ids
+    return user
+
+
+def sync_location_names(user):
+    """Rewrite the legacy string fields from the location FKs."""
+    if user.division_ref_id:
+        slug = user.division_ref.name_en.lower()
+        if slug in _DIVISION_SLUGS:
+            user.division = slug
+    user.district = user.district_ref.name_en if user.district_ref_id else ''
+    user.upazila = user.upazila_ref.name_en if user.upazila_ref_id else ''
+    return user
+
+
+def geocode_location_refs(user):
+    """
+    Fill the location FKs (and names) of a user with no district from their
+    coordinates. Returns whether a location was found.
+    """
+    if user.district_ref_id:
+        return False
+    place = reverse_geocode(user.latitude, user.longitude)
+    if not place:
+        return False
+    user.division_ref_id, user.district_ref_id = place.division_id, place.district_id
+    user.upazila_ref_id = place.upazila_id
+    sync_location_names(user)
+    return True
+
+
+def backfill_location_refs(user_model, models=LOCATION_MODELS, overwrite=False):
+    """
+    Resolve location FKs for users that have location names but no FKs (or
+    every user with names when `overwrite`), one query per distinct name
+    combination. Returns the pks of the users updated.
+
+    `user_model` and `models` may be historical migration models. Rows are
+    written with QuerySet.update, so callers outside migrations must
+    invalidate the users' cached copies.
+    """
+    users = user_model.objects.exclude(division='', district='', upazila='')
+    if not overwrite:
+        users = users.filter(division_ref__isnull=True, district_ref__isnull=True, upazila_ref__isnull=True)
+
+    updated = []
+    combos = users.values_list(*LOCATION_NAME_FIELDS).distinct().order_by()
+    for division, district, upazila in list(combos):
+        ids = resolve_location_ids(division, district, upazila, models=models)
+        if not any(ids):
+            continue
+        matched = users.filter(division=division, district=district, upazila=upazila)
+        pks = list(matched.values_list('pk', flat=True))
+        user_model.objects.filter(pk__in=pks).update(
+            **{f'{field}_id': value for field, value in zip(LOCATION_REF_FIELDS, ids)}
+        )
+        updated.extend(pks)
+    return updated
+
+
+def backfill_geocoded_location_refs(user_model):
+    """
+    Place users with coordinates but no location FKs through the reverse
+    geocoder (run after `backfill_location_refs`, which prefers names).
+    Returns the pks of the users updated; callers must invalidate their
+    cached copies.
+    """
+    users = user_model.objects.filter(
+        district_ref__isnull=True, latitude__isnull=False, longitude__isnull=False
+    )
+
+    updated = []
+    for user in users.iterator():
+        if geocode_location_refs(user):
+            user.save(update_fields=[*LOCATION_REF_FIELDS, *LOCATION_NAME_FIELDS])
+            updated.append(user.pk)
+    return updated
@@ -0,0 +1,34 @@
+"""
+Management command to resolve User location foreign keys from the legacy
+division/district/upazila name fields (English or Bangla names), then from
+the coordinates of users still unplaced (see apps.locations.geocoder).
+
+Needed whenever users exist before the location tables are seeded; it is
+also run at the end of seed_bd_locations, which recreates every location.
+Run: python manage.py backfill_user_locations [--overwrite]
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.accounts.locations import backfill_geocoded_location_refs, backfill_location_refs
+from apps.accounts.user_cache import invalidate_cached_user
+
+
+class Command(BaseCommand):
+    help = 'Resolve User division/district/upazila foreign keys from the location name fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='Re-resolve users that already have location foreign keys',
+        )
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        updated = backfill_location_refs(user_model, overwrite=options['overwrite'])
+        updated += backfill_geocoded_location_refs(user_model)
+        for user_id in updated:
+            invalidate_cached_user(user_id)
+        self.stdout.write(self.style.SUCCESS(f'Resolved locations for {len(updated)} users.'))
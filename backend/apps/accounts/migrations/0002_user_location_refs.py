@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def _match(model, name, fields, **parents):
+    """(fields) of the one row named `name` (either language) under `parents`, else None."""
+    name = (name or '').strip()
+    if not name:
+        return None
+    parents = {lookup: value for lookup, value in parents.items() if value}
+    rows = list(
+        model.objects.filter(Q(name_en__iexact=name) | Q(name_bn=name), **parents)
+        .values_list(*fields)[:2]
+    )
+    return rows[0] if len(rows) == 1 else None
+
+
+def backfill_location_refs(apps, schema_editor):
+    # Self-contained name matching on historical models, frozen with this
+    # migration (the app's helpers follow the current models)
+    User = apps.get_model('accounts', 'User')
+    Division = apps.get_model('locations', 'Division')
+    District = apps.get_model('locations', 'District')
+    Upazila = apps.get_model('locations', 'Upazila')
+
+    users = User.objects.exclude(division='', district='', upazila='')
+    combos = users.values_list('division', 'district', 'upazila').distinct().order_by()
+    for division, district, upazila in list(combos):
+        division_row = _match(Division, division, ('pk',))
+        division_id = division_row[0] if division_row else None
+
+        district_id = None
+        district_row = _match(District, district, ('pk', 'division_id'), division_id=division_id)
+        if district_row:
+            district_id, division_id = district_row
+
+        upazila_id = None
+        upazila_row = _match(
+            Upazila, upazila, ('pk', 'district_id', 'district__division_id'),
+            district_id=district_id, district__division_id=division_id,
+        )
+        if upazila_row:
+            upazila_id, district_id, division_id = upazila_row
+
+        if division_id or district_id or upazila_id:
+            users.filter(division=division, district=district, upazila=upazila).update(
+                division_ref_id=division_id, district_ref_id=district_id, upazila_ref_id=upazila_id,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='district_ref',
+            field=models.ForeignKey(blank=True, help_text='জেলা (District)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='locations.district'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='division_ref',
+            field=models.ForeignKey(blank=True, help_text='বিভাগ (Division)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='locations.division'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='upazila_ref',
+            field=models.ForeignKey(blank=True, help_text='উপজেলা (Upazila)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='locations.upazila'),
+        ),
+        migrations.RunPython(backfill_location_refs, migrations.RunPython.noop),
+    ]
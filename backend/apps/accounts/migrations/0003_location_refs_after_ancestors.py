@@ -0,0 +1,15 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Ordering only: later account code (backfill_user_locations, the live
+    # name matching) filters on the denormalized location ancestors
+
+    dependencies = [
+        ('accounts', '0002_user_location_refs'),
+        ('locations', '0002_location_ancestors'),
+    ]
+
+    operations = []
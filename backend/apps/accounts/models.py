@@ -117,6 +117,33 @@ class User(AbstractBaseUser, PermissionsMixin):
         help_text='দ্রাঘিমাংশ (Longitude)'
     )
 
+    # Normalized location. The string fields above are kept in sync as a
+    # read-compatibility layer until every client sends IDs.
+    division_ref = models.ForeignKey(
+        'locations.Division',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='users',
+        help_text='বিভাগ (Division)'
+    )
+    district_ref = models.ForeignKey(
+        'locations.District',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='users',
+        help_text='জেলা (District)'
+    )
+    upazila_ref = models.ForeignKey(
+        'locations.Upazila',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='users',
+        help_text='উপজেলা (Upazila)'
+    )
+
     # ── Language preference ───────────────────
     preferred_language = models.CharField(
         max_length=2,
@@ -153,7 +180,21 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def has_location(self):
         """Check if the user has set their location."""
-        return bool(self.district)
+        return bool(self.district_ref_id or self.district)
+
+    # Same attribute names as ServiceProvider, so cascade helpers can read
+    # either a provider or a user
+    @property
+    def division_id(self):
+        return self.division_ref_id
+
+    @property
+    def district_id(self):
+        return self.district_ref_id
+
+    @property
+    def upazila_id(self):
+        return self.upazila_ref_id
 
     def save(self, *args, **kwargs):
         # Check if this is an update to an existing provider user
@@ -0,0 +1,114 @@
+"""
+PetCarePlus v2 — Saved Item Sets
+
+Per-user sets of saved object IDs (favorite providers, saved resources),
+cached under `accounts:saved:{user_id}:{model}` so list and detail pages
+can mark `is_saved` / `is_favorite` without a subquery per row.
+
+- `get_saved_id_sets()` is the batch resolver: one cache round trip for all
+  requested models, then a single indexed SavedItem query covering every
+  content type that missed.
+- SavedItem signals (and so SavedItemViewSet.toggle) drop the user's set
+  once the write commits; the next read rebuilds it.
+- If the cache backend is unavailable, reads go straight to the database.
+"""
+
+import logging
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+
+from apps.accounts.models import SavedItem
+
+logger = logging.getLogger(__name__)
+
+
+SAVED_SET_TIMEOUT = 60 * 60 * 24
+
+# model_type values accepted by the saved item endpoints
+SAVED_MODEL_TYPES = {
+    'serviceprovider': 'providers.ServiceProvider',
+    'resource': 'resources.Resource',
+}
+
+
+def get_saved_model(model_type):
+    """Model class for a saved item model_type, or None if unsupported."""
+    label = SAVED_MODEL_TYPES.get(model_type)
+    return apps.get_model(label) if label else None
+
+
+def saved_set_key(user_id, model):
+    return f'accounts:saved:{user_id}:{model._meta.label_lower}'
+
+
+def load_saved_id_sets(user_id, models):
+    """{model: frozenset of saved IDs} straight from the database, one query."""
+    content_types = ContentType.objects.get_for_models(*models)
+    models_by_ct = {ct.pk: model for model, ct in content_types.items()}
+    saved = {model: set() for model in models}
+    rows = SavedItem.objects.filter(
+        user_id=user_id, content_type_id__in=list(models_by_ct),
+    ).values_list('content_type_id', 'object_id')
+    for content_type_id, object_id in rows:
+        saved[models_by_ct[content_type_id]].add(object_id)
+    return {model: frozenset(ids) for model, ids in saved.items()}
+
+
+def get_saved_id_sets(user, models):
+    """Cached {model: frozenset of saved IDs} for each of `models`."""
+    models = list(dict.fromkeys(models))
+    if not (user and user.is_authenticated):
+        return {model: frozenset() for model in models}
+
+    keys = {model: saved_set_key(user.pk, model) for model in models}
+    try:
+        cached = cache.get_many(keys.values())
+    except Exception:
+        logger.warning('Saved item cache unavailable; reading from the database', exc_info=True)
+        return load_saved_id_sets(user.pk, models)
+
+    sets = {model: cached[key] for model, key in keys.items() if key in cached}
+    missing = [model for model in models if model not in sets]
+    if missing:
+        loaded = load_saved_id_sets(user.pk, missing)
+        sets.update(loaded)
+        try:
+            cache.set_many({keys[model]: ids for model, ids in loaded.items()}, SAVED_SET_TIMEOUT)
+        except Exception:
+            logger.warning('Could not cache saved item sets for user %s', user.pk, exc_info=True)
+    return sets
+
+
+def get_saved_ids(user, model):
+    """Cached set of the user's saved object IDs of `model`."""
+    return get_saved_id_sets(user, [model])[model]
+
+
+def invalidate_saved_ids(user_id, model):
+    """Drop a user's cached set; it is rebuilt on the next read."""
+    try:
+        cache.delete(saved_set_key(user_id, model))
+    except Exception:
+        logger.warning('Could not invalidate saved item set for user %s', user_id, exc_info=True)
+
+
+class SavedItemLookup:
+    """
+    Request-scoped view of a user's saved sets, resolved through
+    get_saved_id_sets on first use. Passed to serializers as
+    context['saved_items'].
+    """
+
+    def __init__(self, user, models=()):
+        self.user = user
+        self._ids = get_saved_id_sets(user, models) if models else {}
+
+    def ids_for(self, model):
+        if model not in self._ids:
+            self._ids.update(get_saved_id_sets(self.user, [model]))
+        return self._ids[model]
+
+    def is_saved(self, obj):
+        return obj.pk in self.ids_for(type(obj))
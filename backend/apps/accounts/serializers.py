@@ -7,7 +7,17 @@ and custom JWT token claim extensions.
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from common.fieldsets import SparseFieldsetsMixin
+from apps.accounts.locations import (
+    LOCATION_NAME_FIELDS, geocode_location_refs, sync_location_names, sync_location_refs,
+)
+from apps.accounts.token_blacklist import consume_refresh_token
+from apps.accounts.tokens import add_user_claims
+from apps.accounts.user_cache import get_cached_user
+from apps.locations.models import Division, District, Upazila
 
 User = get_user_model()
 
@@ -20,11 +30,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        # Custom claims added to the JWT payload
-        token['email'] = user.email
-        token['role'] = user.role
-        token['full_name'] = user.full_name
-        return token
+        # Custom claims added to the JWT payload (see apps.accounts.tokens)
+        return add_user_claims(token, user)
 
     def validate(self, attrs):
         data = super().validate(attrs)
@@ -44,6 +51,9 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             'district': user.district,
             'upazila': user.upazila,
             'union': user.union,
+            'division_id': user.division_id,
+            'district_id': user.district_id,
+            'upazila_id': user.upazila_id,
             'latitude': user.latitude,
             'longitude': user.longitude,
             'preferred_language': user.preferred_language,
@@ -51,6 +61,38 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Issues the new access token with claims re-read from the user, so role,
+    location and verification changes reach the token on refresh.
+
+    With ROTATE_REFRESH_TOKENS the presented refresh token is consumed
+    (blacklisted in the cache, see token_blacklist) and a new one returned;
+    presenting a consumed token again fails.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        try:
+            user = get_cached_user(refresh[api_settings.USER_ID_CLAIM])
+        except (KeyError, User.DoesNotExist):
+            user = None
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        data = {}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            consume_refresh_token(refresh)
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        data['access'] = str(add_user_claims(refresh.access_token, user))
+        return data
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for handling new user registration.
@@ -92,15 +134,28 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer for retrieving and updating user profile information.
     email and role cannot be changed via profile endpoints.
     Maps name and phone for frontend compatibility.
+
+    Location can be sent as IDs (division_id / district_id / upazila_id,
+    preferred) or as the legacy name fields; whichever is sent, the other
+    representation is kept in sync.
     """
     name = serializers.CharField(required=False, write_only=True)
     phone = serializers.CharField(required=False, write_only=True)
     full_name = serializers.ReadOnlyField()
+    division_id = serializers.PrimaryKeyRelatedField(
+        source='division_ref', queryset=Division.objects.all(), required=False, allow_null=True
+    )
+    district_id = serializers.PrimaryKeyRelatedField(
+        source='district_ref', queryset=District.objects.all(), required=False, allow_null=True
+    )
+    upazila_id = serializers.PrimaryKeyRelatedField(
+        source='upazila_ref', queryset=Upazila.objects.all(), required=False, allow_null=True
+    )
 
     class Meta:
         model = User
@@ -108,11 +163,34 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'id', 'email', 'full_name',
             'phone_number', 'photo_url', 'bio',
             'division', 'district', 'upazila', 'union', 'latitude', 'longitude',
+            'division_id', 'district_id', 'upazila_id',
             'preferred_language', 'role', 'date_joined',
             'name', 'phone'
         ]
         read_only_fields = ['id', 'email', 'role', 'date_joined']
 
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        division = attrs.get('division_ref')
+        district = attrs.get('district_ref')
+        upazila = attrs.get('upazila_ref')
+
+        # Fill in parents of the most specific level sent, and reject
+        # levels that do not belong together
+        if upazila:
+            if district and upazila.district_id != district.pk:
+                raise serializers.ValidationError({'upazila_id': 'Upazila is not in the selected district.'})
+            district = attrs['district_ref'] = upazila.district
+        if district:
+            if division and district.division_id != division.pk:
+                raise serializers.ValidationError({'district_id': 'District is not in the selected division.'})
+            attrs['division_ref'] = district.division
+        elif division and self.instance is not None and 'district_ref' not in attrs:
+            # A new division alone drops a district from another division
+            if self.instance.district_ref_id and self.instance.district_ref.division_id != division.pk:
+                attrs['district_ref'] = attrs['upazila_ref'] = None
+        return attrs
+
     def update(self, instance, validated_data):
         name = validated_data.pop('name', None)
         phone = validated_data.pop('phone', None)
@@ -127,7 +205,19 @@ class UserProfileSerializer(serializers.ModelSerializer):
         if photo_url is not None:
             instance.photo_url = photo_url
 
-        return super().update(instance, validated_data)
+        sent_ids = any(f'{field}_ref' in validated_data for field in LOCATION_NAME_FIELDS)
+        sent_names = any(field in validated_data for field in LOCATION_NAME_FIELDS)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if sent_ids:
+            sync_location_names(instance)
+        elif sent_names:
+            sync_location_refs(instance)
+        if not instance.district_ref_id and {'latitude', 'longitude'} & set(validated_data):
+            geocode_location_refs(instance)
+
+        instance.save()
+        return instance
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -0,0 +1,35 @@
+"""
+PetCarePlus v2 — Accounts Signals
+
+Keep per-user caches in step with writes:
+- saved item sets (see saved_items) are dropped once SavedItem writes commit
+- cached User objects (see user_cache) are versioned out once a User
+  save/delete commits, so a request that re-cached the old row
+  mid-transaction is not served afterwards
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.accounts.models import SavedItem, User
+from apps.accounts.saved_items import invalidate_saved_ids
+from apps.accounts.user_cache import invalidate_cached_user
+
+
+@receiver(post_save, sender=SavedItem)
+@receiver(post_delete, sender=SavedItem)
+def on_saved_item_changed(sender, instance, **kwargs):
+    model = ContentType.objects.get_for_id(instance.content_type_id).model_class()
+    if model is None:
+        return
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_saved_ids(user_id, model))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def on_user_changed(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
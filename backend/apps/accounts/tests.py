@@ -202,3 +202,382 @@ class AuthAPITests(APITestCase):
         # Check that cookie has been cleared (or set to max_age <= 0 or empty string)
         cookie = self.client.cookies.get('refresh_token')
         self.assertTrue(cookie is None or cookie.value == '')
+
+
+class SavedItemSetTests(APITestCase):
+    """
+    Tests for the cached per-user saved item sets.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.providers.models import ServiceProvider
+
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='saver@test.com', password='password123', full_name='Saver'
+        )
+        provider_user = User.objects.create_user(
+            email='vet@test.com', password='password123', full_name='Vet', role='provider'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider = ServiceProvider.objects.create(
+                user=provider_user, business_name='Saved Vet', provider_type='vet',
+                phone='01700000000', is_verified=True
+            )
+        self.toggle_url = reverse('saved_items_toggle')
+        self.client.force_authenticate(self.user)
+
+    def _toggle(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.toggle_url, {
+                'model_type': 'serviceprovider', 'object_id': self.provider.id
+            })
+
+    def test_toggle_updates_cached_set(self):
+        from apps.accounts.saved_items import get_saved_ids
+        from apps.providers.models import ServiceProvider
+
+        self.assertEqual(get_saved_ids(self.user, ServiceProvider), frozenset())
+        self.assertEqual(self._toggle().status_code, status.HTTP_201_CREATED)
+        self.assertEqual(get_saved_ids(self.user, ServiceProvider), {self.provider.id})
+
+        with self.assertNumQueries(0):
+            get_saved_ids(self.user, ServiceProvider)
+
+        self._toggle()
+        self.assertEqual(get_saved_ids(self.user, ServiceProvider), frozenset())
+
+    def test_favorites_merged_into_list_and_detail(self):
+        self._toggle()
+        detail = self.client.get(reverse('serviceprovider-detail', args=[self.provider.id]))
+        self.assertTrue(detail.data['is_favorite'])
+
+        listing = self.client.get(reverse('serviceprovider-list'))
+        self.assertTrue(listing.data['results'][0]['is_favorite'])
+
+        self.client.force_authenticate(None)
+        listing = self.client.get(reverse('serviceprovider-list'))
+        self.assertFalse(listing.data['results'][0]['is_favorite'])
+
+    def test_falls_back_to_database_when_cache_is_down(self):
+        from unittest import mock
+        from apps.accounts.saved_items import get_saved_ids
+        from apps.providers.models import ServiceProvider
+
+        self._toggle()
+        with mock.patch('apps.accounts.saved_items.cache.get', side_effect=ConnectionError), \
+                self.assertLogs('apps.accounts.saved_items', 'WARNING'):
+            self.assertEqual(get_saved_ids(self.user, ServiceProvider), {self.provider.id})
+
+
+class SavedItemBatchTests(APITestCase):
+    """
+    Tests for the batch saved-state check and the paginated saved list.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.providers.models import ServiceProvider
+        from apps.resources.models import Resource
+
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='batch@test.com', password='password123', full_name='Batch'
+        )
+        self.providers = []
+        for index in range(3):
+            provider_user = User.objects.create_user(
+                email=f'vet{index}@test.com', password='password123', full_name='Vet', role='provider'
+            )
+            self.providers.append(ServiceProvider.objects.create(
+                user=provider_user, business_name=f'Vet {index}', provider_type='vet',
+                phone='01700000000', is_verified=True
+            ))
+        self.resource = Resource.objects.create(
+            title_en='Care', title_bn='যত্ন', resource_type='information'
+        )
+        self.client.force_authenticate(self.user)
+        for obj_type, obj in (('serviceprovider', self.providers[0]), ('serviceprovider', self.providers[2]),
+                              ('resource', self.resource)):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('saved_items_toggle'), {'model_type': obj_type, 'object_id': obj.id})
+
+    def test_check_batch_answers_all_model_types(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        payload = {
+            'serviceprovider': [p.id for p in self.providers],
+            'resource': [self.resource.id, 999],
+        }
+        with self.assertNumQueries(1):  # One SavedItem query covers both content types
+            response = self.client.post(reverse('saved_items_check_batch'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['serviceprovider'], {
+            str(self.providers[0].id): True, str(self.providers[1].id): False, str(self.providers[2].id): True,
+        })
+        self.assertEqual(response.data['resource'], {str(self.resource.id): True, '999': False})
+
+    def test_check_batch_rejects_bad_input(self):
+        url = reverse('saved_items_check_batch')
+        self.assertEqual(self.client.post(url, {'pets': [1]}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(url, {'resource': ['x']}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(url, {'resource': list(range(501))}, format='json').status_code, 400)
+
+    def test_saved_list_is_paginated(self):
+        response = self.client.get(reverse('saved_items_list'), {'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([p['id'] for p in response.data['results']], [self.providers[2].id])
+        self.assertTrue(response.data['results'][0]['is_favorite'])
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(reverse('saved_items_list'), {'model_type': 'resource'})
+        self.assertEqual([r['id'] for r in response.data['results']], [self.resource.id])
+
+
+class UserCacheTests(APITestCase):
+    """
+    Tests for the cached user lookup in CookieJWTAuthentication.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='cached@test.com', password='password123', full_name='Cached'
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.profile_url = reverse('auth_me')
+
+    def _user_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, sum('FROM "accounts_user"' in q['sql'] for q in ctx.captured_queries)
+
+    def test_repeat_requests_skip_user_query(self):
+        _, first = self._user_queries()
+        self.assertEqual(first, 1)
+        _, second = self._user_queries()
+        self.assertEqual(second, 0)
+
+    def test_user_save_invalidates_cache(self):
+        self._user_queries()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.full_name = 'Renamed'
+            self.user.save()
+        response, queries = self._user_queries()
+        self.assertEqual(queries, 1)
+        self.assertEqual(response.data['full_name'], 'Renamed')
+
+    def test_deactivated_user_is_rejected(self):
+        self._user_queries()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TokenClaimsTests(APITestCase):
+    """
+    Tests for JWT user claims and token-backed users on safe requests.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='claims@test.com', password='password123', full_name='Claims',
+            role='farmer', preferred_language='en', district='Dhaka', latitude='23.790000'
+        )
+        self.notifications_url = reverse('notification-list')
+
+    def _login(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        response = self.client.post(reverse('auth_login'), {'email': 'claims@test.com', 'password': 'password123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return AccessToken(response.cookies['access_token'].value)
+
+    def _user_queries(self, method='get', url=None):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url or self.notifications_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sum('FROM "accounts_user"' in q['sql'] for q in ctx.captured_queries)
+
+    def test_login_embeds_claims(self):
+        token = self._login()
+        self.assertEqual(token['role'], 'farmer')
+        self.assertEqual(token['preferred_language'], 'en')
+        self.assertEqual(token['district'], 'Dhaka')
+        self.assertEqual(token['latitude'], '23.790000')
+        self.assertFalse(token['provider_verified'])
+
+    def test_safe_requests_use_token_backed_user(self):
+        from django.core.cache import cache
+        from apps.accounts.user_cache import get_user_version
+
+        self._login()
+        cache.delete(f'accounts:user:{self.user.pk}:{get_user_version(self.user.pk)}')  # Cold user cache
+        self.assertEqual(self._user_queries(), 0)
+
+    def test_stale_claims_fall_back_and_refresh_reissues(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self._login()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = 'pet_owner'
+            self.user.save()
+        self.assertEqual(self._user_queries(), 1)  # Claims outdated: user row is loaded
+
+        response = self.client.post(reverse('token_refresh'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        token = AccessToken(response.cookies['access_token'].value)
+        self.assertEqual(token['role'], 'pet_owner')
+        self.assertEqual(self._user_queries(), 0)
+
+    def test_profile_update_reissues_claims(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self._login()
+        response = self.client.patch(reverse('auth_me'), {'preferred_language': 'bn'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.cookies['access_token'].value)['preferred_language'], 'bn')
+
+
+class RefreshRotationTests(APITestCase):
+    """
+    Tests for refresh token rotation and the cache-backed blacklist.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        User.objects.create_user(email='rotate@test.com', password='password123', full_name='Rotate')
+        response = self.client.post(reverse('auth_login'), {'email': 'rotate@test.com', 'password': 'password123'})
+        self.refresh = response.cookies['refresh_token'].value
+        self.refresh_url = reverse('token_refresh')
+
+    def test_refresh_rotates_and_rejects_reuse(self):
+        response = self.client.post(self.refresh_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rotated = response.cookies['refresh_token'].value
+        self.assertNotEqual(rotated, self.refresh)
+
+        reused = self.client.post(self.refresh_url, {'refresh': self.refresh})
+        self.assertEqual(reused.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(self.refresh_url, {'refresh': rotated})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_logout_blacklists_refresh_token(self):
+        response = self.client.post(reverse('auth_logout'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(self.refresh_url, {'refresh': self.refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_blacklist_entry_expires_with_token(self):
+        from unittest import mock
+        from django.conf import settings
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from apps.accounts.token_blacklist import blacklist_token
+
+        token = RefreshToken(self.refresh)
+        with mock.patch('apps.accounts.token_blacklist.cache.set') as cache_set:
+            blacklist_token(token)
+        timeout = cache_set.call_args.args[2]
+        lifetime = settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds()
+        self.assertAlmostEqual(timeout, lifetime, delta=60)
+
+
+class UserLocationRefTests(APITestCase):
+    """Tests for the User location foreign keys and the legacy name fields."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.locations.models import Division, District, Upazila
+
+        cache.clear()
+        self.dhaka = Division.objects.create(name_en='Dhaka', name_bn='ঢাকা')
+        self.sylhet = Division.objects.create(name_en='Sylhet', name_bn='সিলেট')
+        self.gazipur = District.objects.create(division=self.dhaka, name_en='Gazipur', name_bn='গাজীপুর')
+        self.kaliakair = Upazila.objects.create(district=self.gazipur, name_en='Kaliakair', name_bn='কালিয়াকৈর')
+        self.user = User.objects.create_user(email='loc@test.com', password='password123', full_name='Loc')
+
+    def test_names_resolve_in_either_language(self):
+        from apps.locations.matching import resolve_location_ids
+
+        self.assertEqual(
+            resolve_location_ids('dhaka', 'GAZIPUR', 'Kaliakair'),
+            (self.dhaka.pk, self.gazipur.pk, self.kaliakair.pk),
+        )
+        # A Bangla upazila alone fills in its parents
+        self.assertEqual(resolve_location_ids(upazila='কালিয়াকৈর'), (self.dhaka.pk, self.gazipur.pk, self.kaliakair.pk))
+        # A district outside the named division does not match
+        self.assertEqual(resolve_location_ids('sylhet', 'Gazipur'), (self.sylhet.pk, None, None))
+
+    def test_backfill_command_links_existing_users(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from apps.accounts.user_cache import get_user_version
+
+        User.objects.filter(pk=self.user.pk).update(division='dhaka', district='গাজীপুর')
+        version = get_user_version(self.user.pk)
+        call_command('backfill_user_locations', stdout=StringIO())
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.division_id, self.dhaka.pk)
+        self.assertEqual(self.user.district_id, self.gazipur.pk)
+        self.assertIsNone(self.user.upazila_id)
+        self.assertNotEqual(get_user_version(self.user.pk), version)
+
+    def test_profile_update_with_ids_syncs_names(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.patch(reverse('auth_me'), {'upazila_id': self.kaliakair.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['division_id'], self.dhaka.pk)
+        self.assertEqual(response.data['district_id'], self.gazipur.pk)
+        self.assertEqual(response.data['division'], 'dhaka')
+        self.assertEqual(response.data['district'], 'Gazipur')
+        self.assertEqual(response.data['upazila'], 'Kaliakair')
+
+        response = self.client.patch(
+            reverse('auth_me'), {'division_id': self.sylhet.pk, 'district_id': self.gazipur.pk}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_profile_update_with_names_resolves_ids(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.patch(
+            reverse('auth_me'), {'division': 'dhaka', 'district': 'Gazipur'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['division_id'], self.dhaka.pk)
+        self.assertEqual(response.data['district_id'], self.gazipur.pk)
+
+    def test_token_user_carries_location_ids(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from apps.accounts.tokens import add_user_claims, token_user
+
+        self.user.district_ref = self.gazipur
+        self.user.division_ref = self.dhaka
+        self.user.save()
+        user = token_user(add_user_claims(AccessToken.for_user(self.user), self.user))
+        self.assertEqual(user.district_id, self.gazipur.pk)
+        self.assertEqual(user.division_id, self.dhaka.pk)
+        self.assertTrue(user.is_active)
@@ -0,0 +1,37 @@
+"""
+PetCarePlus v2 — Refresh Token Blacklist
+
+Rotated and logged-out refresh tokens are blacklisted by `jti` in the shared
+cache, each entry expiring together with the token it blocks, so nothing
+accumulates that needs cleaning up.
+
+`consume_refresh_token()` is the only check: it blacklists with cache.add,
+which fails for a logged-out or already rotated token, and of two concurrent
+refreshes presenting the same token only one can rotate it.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+
+def blacklist_key(jti):
+    return f'accounts:jwt:blacklist:{jti}'
+
+
+def _remaining_seconds(token):
+    return max(1, int(token['exp'] - time.time()) + 1)
+
+
+def blacklist_token(token):
+    """Block a token until it expires on its own."""
+    cache.set(blacklist_key(token[api_settings.JTI_CLAIM]), 1, _remaining_seconds(token))
+
+
+def consume_refresh_token(token):
+    """Blacklist a refresh token being rotated; raise if it was already used."""
+    if not cache.add(blacklist_key(token[api_settings.JTI_CLAIM]), 1, _remaining_seconds(token)):
+        raise TokenError(_('Token is blacklisted'))
@@ -0,0 +1,78 @@
+"""
+PetCarePlus v2 — JWT User Claims
+
+Access tokens carry the user attributes hot read paths need (role,
+language, location, provider verification), so safe requests can resolve
+permissions and personalization without loading the user row.
+
+- `add_user_claims()` stamps the claims at login, refresh and profile update.
+- Each token records the user's cache version (`cv`, see user_cache) at
+  issue time. Any User save, and any ServiceProvider save that may change
+  verification, bumps that version, after which the claims are considered
+  stale and authentication falls back to the (cached) user row until the
+  client refreshes its access token.
+- `token_user()` builds a User instance from the claims alone; fields not
+  in the token are deferred and load from the database if ever touched.
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts.user_cache import get_user_version
+
+
+# User fields embedded as claims (id travels as the user_id claim)
+USER_CLAIM_FIELDS = (
+    'email', 'full_name', 'role', 'preferred_language', 'is_active', 'is_staff',
+    'division', 'district', 'upazila', 'union', 'latitude', 'longitude',
+    'division_ref_id', 'district_ref_id', 'upazila_ref_id',
+)
+PROVIDER_VERIFIED_CLAIM = 'provider_verified'
+CLAIMS_VERSION_CLAIM = 'cv'
+
+
+def _claim_value(value):
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def add_user_claims(token, user):
+    """Stamp the user's current attributes onto a token."""
+    for name in USER_CLAIM_FIELDS:
+        token[name] = _claim_value(getattr(user, name))
+
+    provider = getattr(user, 'service_provider', None) if user.role == 'provider' else None
+    token[PROVIDER_VERIFIED_CLAIM] = bool(provider and provider.is_verified)
+    token[CLAIMS_VERSION_CLAIM] = get_user_version(user.pk)
+    return token
+
+
+def claims_are_current(validated_token):
+    """Whether the token's claims were issued at the user's current version."""
+    version = validated_token.get(CLAIMS_VERSION_CLAIM)
+    if version is None or api_settings.USER_ID_CLAIM not in validated_token:
+        return False
+    if any(name not in validated_token for name in USER_CLAIM_FIELDS):
+        return False
+    return version == get_user_version(validated_token[api_settings.USER_ID_CLAIM])
+
+
+def token_user(validated_token):
+    """A User instance backed by the token's claims (other fields deferred)."""
+    User = get_user_model()
+    claims = {'id': validated_token[api_settings.USER_ID_CLAIM]}
+    claims.update((name, validated_token[name]) for name in USER_CLAIM_FIELDS)
+
+    # from_db expects values in concrete field order
+    field_names, values = [], []
+    for field in User._meta.concrete_fields:
+        if field.attname in claims:
+            value = claims[field.attname]
+            field_names.append(field.attname)
+            values.append(None if value is None else field.to_python(value))
+
+    user = User.from_db(User.objects.db, field_names, values)
+    user.provider_verified = validated_token.get(PROVIDER_VERIFIED_CLAIM, False)
+    user.token_backed = True
+    return user
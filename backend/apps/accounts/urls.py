@@ -17,4 +17,5 @@ urlpatterns = [
     path('saved/', SavedItemViewSet.as_view({'get': 'list'}), name='saved_items_list'),
     path('saved/toggle/', SavedItemViewSet.as_view({'post': 'toggle'}), name='saved_items_toggle'),
     path('saved/check/', SavedItemViewSet.as_view({'get': 'check'}), name='saved_items_check'),
+    path('saved/check-batch/', SavedItemViewSet.as_view({'post': 'check_batch'}), name='saved_items_check_batch'),
 ]
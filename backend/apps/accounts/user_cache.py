@@ -0,0 +1,44 @@
+"""
+PetCarePlus v2 — Authenticated User Cache
+
+Short-lived cache of User rows for CookieJWTAuthentication, so an API hit
+(including cache-served endpoints) does not need a SELECT on accounts_user.
+
+Entries live under `accounts:user:{id}:{version}`; the per-user version
+counter is bumped by the User post_save/post_delete signals (profile edits,
+password changes, deactivation, last_login), which makes every cached copy
+unreachable at once. Writes that bypass signals (QuerySet.update) are
+bounded by USER_CACHE_TIMEOUT.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from common.cache_versions import bump_cache_version, get_cache_version
+
+
+USER_CACHE_TIMEOUT = 60 * 5
+
+
+def user_version_key(user_id):
+    return f'accounts:user:version:{user_id}'
+
+
+def get_user_version(user_id):
+    """Current cache version of a user (also stamped into JWT claims)."""
+    return get_cache_version(user_version_key(user_id))
+
+
+def get_cached_user(user_id):
+    """The User with this pk, from the cache when possible (DoesNotExist otherwise)."""
+    key = f'accounts:user:{user_id}:{get_user_version(user_id)}'
+    user = cache.get(key)
+    if user is None:
+        user = get_user_model().objects.get(pk=user_id)
+        cache.set(key, user, USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_cached_user(user_id):
+    """Make every cached copy of a user stale."""
+    bump_cache_version(user_version_key(user_id))
@@ -11,9 +11,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from apps.accounts.token_blacklist import blacklist_token
+from apps.accounts.tokens import add_user_claims
 from apps.accounts.serializers import (
     CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer,
     UserRegistrationSerializer,
     UserProfileSerializer,
 )
@@ -81,6 +85,7 @@ class CustomTokenRefreshView(TokenRefreshView):
     Attempts to read the refresh token from the httpOnly cookies
     before checking the POST body, securing token refresh logic.
     """
+    serializer_class = CustomTokenRefreshSerializer
 
     def post(self, request, *args, **kwargs):
         jwt_settings = getattr(settings, 'SIMPLE_JWT', {})
@@ -142,7 +147,8 @@ class CustomTokenRefreshView(TokenRefreshView):
 
 class LogoutView(APIView):
     """
-    Logout view that clears the secure httpOnly refresh token cookie.
+    Logout view that blacklists the refresh token and clears the secure
+    httpOnly token cookies.
     """
     permission_classes = [permissions.AllowAny]
 
@@ -155,6 +161,13 @@ class LogoutView(APIView):
         access_cookie = jwt_settings.get('AUTH_COOKIE', 'access_token')
         refresh_cookie = jwt_settings.get('AUTH_COOKIE_REFRESH', 'refresh_token')
         samesite = jwt_settings.get('AUTH_COOKIE_SAMESITE', 'Lax')
+
+        raw_refresh = request.COOKIES.get(refresh_cookie) or request.data.get('refresh')
+        if raw_refresh:
+            try:
+                blacklist_token(RefreshToken(raw_refresh))
+            except TokenError:
+                pass  # Expired or invalid: nothing left to revoke
         
         response.delete_cookie(access_cookie, samesite=samesite)
         response.delete_cookie(refresh_cookie, samesite=samesite)
@@ -167,60 +180,78 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     """
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    token_user_allowed = False  # Serves the full user row
 
     def get_object(self):
         return self.request.user
 
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+
+        # The saved profile made the token's claims stale; issue fresh ones
+        jwt_settings = getattr(settings, 'SIMPLE_JWT', {})
+        response.set_cookie(
+            key=jwt_settings.get('AUTH_COOKIE', 'access_token'),
+            value=str(add_user_claims(AccessToken.for_user(request.user), request.user)),
+            httponly=jwt_settings.get('AUTH_COOKIE_HTTP_ONLY', True),
+            secure=jwt_settings.get('AUTH_COOKIE_SECURE', not settings.DEBUG),
+            samesite=jwt_settings.get('AUTH_COOKIE_SAMESITE', 'Lax'),
+            max_age=int(jwt_settings.get('ACCESS_TOKEN_LIFETIME').total_seconds()),
+        )
+        return response
+
 from rest_framework import viewsets
 from apps.accounts.models import SavedItem
+from apps.accounts.saved_items import SavedItemLookup, get_saved_id_sets, get_saved_model
 from django.contrib.contenttypes.models import ContentType
-from django.apps import apps
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from rest_framework.decorators import action
+from common.fieldsets import SparseFieldsetsViewMixin
+from common.pagination import StandardPagination
 
-class SavedItemViewSet(viewsets.ViewSet):
+class SavedItemViewSet(SparseFieldsetsViewMixin, viewsets.ViewSet):
     """
     ViewSet to manage user's saved items using GenericForeignKey.
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardPagination
+    check_batch_limit = 500  # IDs per model_type in one check-batch request
+
+    def _saved_objects(self, model_type):
+        """(typed queryset, serializer class) for listing saved objects."""
+        if model_type == 'serviceprovider':
+            from apps.providers.models import ServiceProvider
+            from apps.providers.serializers import ServiceProviderSerializer
+            return ServiceProvider.objects.select_related(
+                'user', 'division', 'district', 'upazila', 'union'
+            ).prefetch_related(
+                'services', 'animal_types__animal_type'
+            ), ServiceProviderSerializer
+
+        from apps.resources.models import Resource
+        from apps.resources.serializers import ResourceSerializer
+        return Resource.objects.prefetch_related('animal_types'), ResourceSerializer
 
     def list(self, request):
         model_type = request.query_params.get('model_type', 'serviceprovider')
-        if model_type == 'serviceprovider':
-            model = apps.get_model('providers', 'ServiceProvider')
-        elif model_type == 'resource':
-            model = apps.get_model('resources', 'Resource')
-        else:
+        model = get_saved_model(model_type)
+        if model is None:
             return Response({'error': 'Invalid model_type'}, status=status.HTTP_400_BAD_REQUEST)
 
-        content_type = ContentType.objects.get_for_model(model)
-        saved_items = SavedItem.objects.filter(user=request.user, content_type=content_type).order_by('-created_at')
-        
-        object_ids = saved_items.values_list('object_id', flat=True)
-        if model_type == 'serviceprovider':
-            objects_dict = {
-                obj.id: obj for obj in model.objects.select_related(
-                    'user'
-                ).prefetch_related(
-                    'services', 'animal_types__animal_type'
-                ).filter(id__in=object_ids)
-            }
-        elif model_type == 'resource':
-            objects_dict = {
-                obj.id: obj for obj in model.objects.prefetch_related('animal_types').filter(id__in=object_ids)
-            }
-        else:
-            objects_dict = {obj.id: obj for obj in model.objects.filter(id__in=object_ids)}
-            
-        ordered_objects = [objects_dict[obj_id] for obj_id in object_ids if obj_id in objects_dict]
-        
-        if model_type == 'serviceprovider':
-            from apps.providers.serializers import ServiceProviderSerializer
-            serializer = ServiceProviderSerializer(ordered_objects, many=True)
-        elif model_type == 'resource':
-            from apps.resources.serializers import ResourceSerializer
-            serializer = ResourceSerializer(ordered_objects, many=True)
-        
-        return Response({'results': serializer.data})
+        queryset, serializer_class = self._saved_objects(model_type)
+        saved_items = SavedItem.objects.filter(
+            user=request.user, content_type=ContentType.objects.get_for_model(model)
+        ).order_by('-created_at').prefetch_related(GenericPrefetch('content_object', [queryset]))
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(saved_items, request, view=self)
+        objects = [item.content_object for item in page if item.content_object is not None]
+
+        serializer = self.apply_sparse_fieldset(serializer_class(objects, many=True, context={
+            'request': request,
+            'saved_items': SavedItemLookup(request.user),
+        }))
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['post'])
     def toggle(self, request):
@@ -230,11 +261,8 @@ class SavedItemViewSet(viewsets.ViewSet):
         if not model_type or not object_id:
             return Response({'error': 'model_type and object_id are required'}, status=status.HTTP_400_BAD_REQUEST)
             
-        if model_type == 'serviceprovider':
-            model = apps.get_model('providers', 'ServiceProvider')
-        elif model_type == 'resource':
-            model = apps.get_model('resources', 'Resource')
-        else:
+        model = get_saved_model(model_type)
+        if model is None:
             return Response({'error': 'Invalid model_type'}, status=status.HTTP_400_BAD_REQUEST)
             
         content_type = ContentType.objects.get_for_model(model)
@@ -259,19 +287,46 @@ class SavedItemViewSet(viewsets.ViewSet):
         if not model_type or not object_id:
             return Response({'error': 'model_type and object_id are required'}, status=status.HTTP_400_BAD_REQUEST)
             
-        if model_type == 'serviceprovider':
-            model = apps.get_model('providers', 'ServiceProvider')
-        elif model_type == 'resource':
-            model = apps.get_model('resources', 'Resource')
-        else:
+        model = get_saved_model(model_type)
+        if model is None:
             return Response({'error': 'Invalid model_type'}, status=status.HTTP_400_BAD_REQUEST)
-            
-        content_type = ContentType.objects.get_for_model(model)
-        
-        is_saved = SavedItem.objects.filter(
-            user=request.user,
-            content_type=content_type,
-            object_id=object_id
-        ).exists()
-        
-        return Response({'is_saved': is_saved})
+
+        try:
+            object_id = int(object_id)
+        except ValueError:
+            return Response({'error': 'object_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        saved = get_saved_id_sets(request.user, [model])[model]
+        return Response({'is_saved': object_id in saved})
+
+    @action(detail=False, methods=['post'], url_path='check-batch')
+    def check_batch(self, request):
+        """
+        Saved state of many objects at once.
+
+        Body: {"serviceprovider": [1, 2, 3], "resource": [7]}
+        Response: {"serviceprovider": {"1": true, "2": false, "3": true}, "resource": {"7": false}}
+        """
+        if not isinstance(request.data, dict) or not request.data:
+            return Response({'error': 'Expected an object of model_type: [object_id, ...]'}, status=status.HTTP_400_BAD_REQUEST)
+
+        requested = {}
+        for model_type, object_ids in request.data.items():
+            model = get_saved_model(model_type)
+            if model is None:
+                return Response({'error': f'Invalid model_type: {model_type}'}, status=status.HTTP_400_BAD_REQUEST)
+            if not isinstance(object_ids, list) or len(object_ids) > self.check_batch_limit:
+                return Response(
+                    {'error': f'{model_type} must be a list of at most {self.check_batch_limit} IDs'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                requested[model_type] = (model, [int(object_id) for object_id in object_ids])
+            except (TypeError, ValueError):
+                return Response({'error': f'{model_type} IDs must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        saved = get_saved_id_sets(request.user, [model for model, _ in requested.values()])
+        return Response({
+            model_type: {str(object_id): object_id in saved[model] for object_id in object_ids}
+            for model_type, (model, object_ids) in requested.items()
+        })
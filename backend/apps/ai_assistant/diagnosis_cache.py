@@ -0,0 +1,248 @@
+"""
+PetCarePlus v2 — Diagnosis Response Cache
+
+Per-worker cache of one-shot diagnoses in front of the Gemini call, for the
+near-identical descriptions an outbreak brings ("cow not eating, fever,
+mouth sores" / "Cow: fever, mouth sores - not eating!"):
+
+- Exact tier: entries are keyed by animal type, category, language and a
+  hash of the token set of the normalized description (the search
+  normalization: case, accents, punctuation and Bangla variants folded;
+  Bangla digits read as ASCII), so word order, repeats and punctuation do
+  not matter.
+- Near-duplicate tier (AI_DIAGNOSIS_CACHE_SIMILARITY; off by default, at
+  0): a miss takes the entry of the same animal and language whose
+  character trigram set is most similar (Jaccard) if at least the
+  threshold. Descriptions that differ in one symptom word can clear a
+  loose threshold, so turn it on only with a high one (0.9 or above).
+  Candidates come from MinHash signatures split into LSH bands, so a
+  lookup compares the few entries sharing the most bands, not all of them.
+- Entries expire AI_DIAGNOSIS_CACHE_TTL seconds after they are stored;
+  beyond AI_DIAGNOSIS_CACHE_MAX_ENTRIES the least recently used go first.
+
+Only successful model answers are stored; callers get a copy. Hits, near
+hits and misses are counted for all workers in the shared cache (see
+`get_diagnosis_cache_stats` and the diagnosis_cache_stats command).
+"""
+
+import copy
+import hashlib
+import random
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.text import normalize_text
+
+
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # of 4 rows: pairs from ~0.5 Jaccard up are likely to share a band
+NEAR_CANDIDATES = 32  # entries sharing the most bands that are compared exactly
+
+_PRIME = (1 << 61) - 1
+_seeded = random.Random(0x5EED)
+_PERMUTATIONS = [(_seeded.randrange(1, _PRIME), _seeded.randrange(_PRIME)) for _ in range(MINHASH_PERMUTATIONS)]
+
+_BANGLA_DIGITS = str.maketrans('০১২৩৪৫৬৭৮৯', '0123456789')
+
+STATS_CACHE_KEY = 'ai:diagnosis_cache:{}'
+STATS_EVENTS = ('hit', 'near_hit', 'miss')
+
+
+def description_tokens(text):
+    """Sorted distinct normalized words of a problem description."""
+    return sorted(set(normalize_text(text).translate(_BANGLA_DIGITS).split()))
+
+
+def description_shingles(tokens):
+    """32-bit hashes of the character trigrams of each word, edges marked."""
+    grams = set()
+    for token in tokens:
+        padded = f'^{token}$'
+        grams.update(padded[i:i + SHINGLE_SIZE] for i in range(max(len(padded) - SHINGLE_SIZE + 1, 1)))
+    return frozenset(zlib.crc32(gram.encode('utf-8')) for gram in grams)
+
+
+def minhash_bands(shingles):
+    """LSH band hashes of the MinHash signature of a shingle set."""
+    signature = [min((a * s + b) % _PRIME for s in shingles) for a, b in _PERMUTATIONS]
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    return tuple(hash(tuple(signature[i:i + rows])) for i in range(0, MINHASH_PERMUTATIONS, rows))
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class DiagnosisQuery:
+    """A diagnose request as the cache sees it; normalizes once."""
+
+    def __init__(self, animal_type_name, animal_category, preferred_language, problem_description):
+        self.group = (str(animal_type_name).casefold(), animal_category, preferred_language)
+        self.tokens = description_tokens(problem_description)
+        digest = hashlib.sha1('\x1f'.join(self.tokens).encode('utf-8')).hexdigest()
+        self.key = (*self.group, digest)
+        self._shingles = None
+
+    @property
+    def shingles(self):
+        if self._shingles is None:
+            self._shingles = description_shingles(self.tokens)
+        return self._shingles
+
+
+class _Entry:
+    __slots__ = ('response', 'expires_at', 'shingles', 'buckets')
+
+    def __init__(self, response, expires_at, shingles, buckets):
+        self.response = response
+        self.expires_at = expires_at
+        self.shingles = shingles
+        self.buckets = buckets
+
+
+class DiagnosisCache:
+    """LRU + TTL cache of diagnoses with a near-duplicate tier. Use `get_diagnosis_cache()`."""
+
+    def __init__(self, max_entries=2048, ttl=3600, similarity=0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._entries = OrderedDict()  # key -> _Entry, least recently used first
+        self._buckets = {}  # (group, band, band hash) -> keys
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, query):
+        """('hit' | 'near_hit', response copy), or (None, None) on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live(query.key, now)
+            kind = 'hit'
+            if entry is None and self.similarity:
+                entry, kind = self._nearest(query, now), 'near_hit'
+            if entry is None:
+                return None, None
+            return kind, copy.deepcopy(entry.response)
+
+    def put(self, query, response):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        shingles = query.shingles if self.similarity else None
+        buckets = ()
+        if shingles:
+            buckets = tuple((query.group, band, value) for band, value in enumerate(minhash_bands(shingles)))
+        entry = _Entry(copy.deepcopy(response), time.monotonic() + self.ttl, shingles, buckets)
+        with self._lock:
+            self._remove(query.key)
+            self._entries[query.key] = entry
+            for bucket in buckets:
+                self._buckets.setdefault(bucket, set()).add(query.key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def _live(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _nearest(self, query, now):
+        if not query.shingles:
+            return None
+        shared_bands = Counter()
+        for band, value in enumerate(minhash_bands(query.shingles)):
+            shared_bands.update(self._buckets.get((query.group, band, value), ()))
+
+        # The more bands an entry shares, the more similar it likely is;
+        # only the likeliest few are compared exactly
+        best_key, best_score = None, self.similarity
+        for key, _ in shared_bands.most_common(NEAR_CANDIDATES):
+            entry = self._entries[key]
+            if entry.expires_at <= now:
+                continue
+            score = jaccard(query.shingles, entry.shingles)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return self._live(best_key, now) if best_key else None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket in entry.buckets:
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+
+_lock = threading.Lock()
+_shared = {'key': None, 'cache': None}
+
+
+def get_diagnosis_cache():
+    """The process-wide diagnosis cache, rebuilt when its settings change."""
+    key = (
+        settings.AI_DIAGNOSIS_CACHE_MAX_ENTRIES, settings.AI_DIAGNOSIS_CACHE_TTL,
+        settings.AI_DIAGNOSIS_CACHE_SIMILARITY,
+    )
+    if _shared['key'] != key:
+        with _lock:
+            if _shared['key'] != key:
+                _shared['cache'] = DiagnosisCache(*key)
+                _shared['key'] = key
+    return _shared['cache']
+
+
+# ── Metrics ──────────────────────────────────────────────────────
+
+def record_lookup(event):
+    """Count a 'hit', 'near_hit' or 'miss' for every worker."""
+    key = STATS_CACHE_KEY.format(event)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_diagnosis_cache_stats():
+    """Counts of every lookup event, and the share answered from the cache."""
+    counts = cache.get_many([STATS_CACHE_KEY.format(event) for event in STATS_EVENTS])
+    stats = {event: counts.get(STATS_CACHE_KEY.format(event), 0) for event in STATS_EVENTS}
+    lookups = sum(stats.values())
+    stats['hit_ratio'] = round((stats['hit'] + stats['near_hit']) / lookups, 4) if lookups else 0.0
+    return stats
+
+
+def reset_diagnosis_cache_stats():
+    cache.delete_many([STATS_CACHE_KEY.format(event) for event in STATS_EVENTS])
+
+
+def cached_diagnosis(query):
+    """Cached response for a DiagnosisQuery (recording the lookup), or None."""
+    kind, response = get_diagnosis_cache().get(query)
+    record_lookup(kind or 'miss')
+    return response
+
+
+def store_diagnosis(query, response):
+    get_diagnosis_cache().put(query, response)
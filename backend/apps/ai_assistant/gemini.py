@@ -1,110 +1,139 @@
 """
 PetCarePlus v2 — Gemini Integration Utility
 
-Calls the Gemini API using the new google-genai SDK.
+Calls the Gemini API using the new google-genai SDK, through the shared
+client, deadlines and retry policy of gemini_client.
 Handles structured JSON outputs, system instructions, and includes a
-fallback/mock mode for test runs or missing keys.
+fallback/mock mode for test runs or missing keys. Each entry point has an
+`a`-prefixed coroutine twin for the async views. Both run the same
+`GeminiCall` (prompt, mock, parsing and fallback) through `_run` or
+`_arun`; only the transport differs.
 """
 
 import json
 import logging
-from django.conf import settings
-from google import genai
+import re
+from collections import namedtuple
 from google.genai import types
-from google.genai.errors import APIError
-import time
+
+from apps.ai_assistant.gemini_client import (
+    agenerate_content, agenerate_content_stream, generate_content, generate_content_stream, use_mock_gemini,
+)
+from apps.ai_assistant.single_flight import asingle_flight, request_fingerprint, single_flight
+from apps.ai_assistant.streaming import JsonStringStream
 
 logger = logging.getLogger(__name__)
 
 
-def call_gemini(conversation_history, preferred_language='bn', animal_type_name='Cat', guideline_context=None, total_turns=1):
-    """
-    Calls the Gemini 2.5 Flash model with conversation history and returns a structured response.
-    Automatically handles mock responses during test runs or if GEMINI_API_KEY is not configured.
-    """
-    
-    # 1. Fallback/Mock Mode (For unit tests or missing keys)
-    import sys
-    is_test = (
-        'test' in sys.argv or
-        'test' in str(settings.DATABASES.get('default', {}).get('NAME', '')) or
-        'memory' in str(settings.DATABASES.get('default', {}).get('NAME', ''))
-    )
-    if not settings.GEMINI_API_KEY or is_test:
-        user_msg = "test symptom"
-        for msg in reversed(conversation_history):
-            if msg.get('role') == 'user':
-                user_msg = msg.get('content', '')
-                break
-
-        # Check full history to simulate contextual memory for urgency classification
-        full_text = " ".join([m.get('content', '') for m in conversation_history if m.get('role') == 'user']).lower()
-        is_emergency = any(k in full_text for k in ["bleed", "accident", "emergency", "জরুরি", "রক্ত"])
-        urgency = "emergency" if is_emergency else "see_vet_this_week"
-
-
-        mock_reply_bn = (
-            "মক উত্তর: এটি একটি মক উত্তর। আপনার পোষা প্রাণীর উপসর্গ বিশ্লেষণ করা হচ্ছে। "
-            "আপনার কি আর কোনো লক্ষণ আমাদের জানাতে চান?"
-        )
-        mock_reply_en = (
-            "Mock Response: I am analyzing your pet's symptoms. Are there any other "
-            "symptoms or behaviors you would like to describe?"
-        )
+# mock(), request() -> (contents, config), parse(response), fallback(), the
+# error logged before falling back, and the single-flight fingerprint if any
+GeminiCall = namedtuple('GeminiCall', ['mock', 'request', 'parse', 'fallback', 'error', 'fingerprint'], defaults=[None])
+
+
+def _run(call, transport):
+    """Result of a GeminiCall, sent through the blocking `transport(contents, config)`."""
+    if use_mock_gemini():
+        return call.mock()
+
+    def fetch():
+        return call.parse(transport(*call.request()))
 
-        # If the user says "done" or similar, or we hit a turn count limit, complete session
-        is_done = any(k in user_msg.lower() for k in ["done", "complete", "শেষ", "yes", "হ্যাঁ"]) or total_turns >= 3
-
-        reply = mock_reply_bn if preferred_language == 'bn' else mock_reply_en
-
-
-        response_dict = {
-            "reply": reply if not is_done else ("বিশ্লেষণ সমাপ্ত।" if preferred_language == 'bn' else "Analysis complete."),
-            "session_complete": is_done,
-            "urgency_level": urgency,
-            "urgency_explanation": (
-                "জ্বর এবং খাদ্য গ্রহণে অনীহা দেখা যাচ্ছে।"
-                if preferred_language == 'bn' else "Fever and loss of appetite observed."
-            ) if is_done else "",
-            "diagnosis_summary": (
-                "মক রোগ নির্ণয়: হালকা সংক্রমণ বা এলার্জি।"
-                if preferred_language == 'bn' else "Mock Diagnosis: Mild infection or allergy."
-            ) if is_done else "",
-            "care_advice": (
-                "১. পর্যাপ্ত পানি খাওয়ান।\n২. পরিষ্কার এবং আরামদায়ক জায়গায় রাখুন।"
-                if preferred_language == 'bn' else "1. Provide fresh water.\n2. Keep in a warm, clean place."
-            ) if is_done else "",
-            "things_to_care_about": (
-                "ওষুধ প্রয়োগে সতর্কতা অবলম্বন করুন। পরিষ্কার পরিবেশ বজায় রাখুন।"
-                if preferred_language == 'bn' else "Be careful with medication dosage. Maintain a clean environment."
-            ) if is_done else "",
-            "warning_signs": {
-                "emergency_situations": "যদি রক্তপাত হয় বা শ্বাসকষ্ট দেখা দেয়।" if preferred_language == 'bn' else "If bleeding occurs or breathing difficulty appears.",
-                "negative_symptoms": "জ্বর ৪৮ ঘণ্টার বেশি থাকলে।" if preferred_language == 'bn' else "If fever persists beyond 48 hours.",
-                "when_to_worry": "যদি ২৪ ঘণ্টার মধ্যে খাবার না খায়।" if preferred_language == 'bn' else "If the animal doesn't eat within 24 hours."
-            } if is_done else None,
-            "positive_signs": {
-                "safe_indicators": "প্রাণী সক্রিয় এবং পানি পান করছে।" if preferred_language == 'bn' else "Animal is active and drinking water.",
-                "recovery_signals": "জ্বর কমে যাওয়া এবং খাবারে আগ্রহ ফিরে আসা।" if preferred_language == 'bn' else "Fever reducing and appetite returning.",
-                "when_situation_is_controlled": "যখন স্বাভাবিক আচরণ ফিরে আসবে।" if preferred_language == 'bn' else "When normal behavior returns."
-            } if is_done else None,
-            "recommended_provider_type": "vet",
-            "suggest_livestock_officer": False,
-            "resource_keywords": ["fever", "infection", "care"] if is_done else []
-        }
-        return response_dict
-
-    # 2. Live API Call
     try:
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        return single_flight(call.fingerprint, fetch) if call.fingerprint else fetch()
+    except Exception as e:
+        logger.error(f"{call.error}: {e}")
+        return call.fallback()
+
+
+async def _arun(call, transport):
+    """_run with a coroutine `transport`."""
+    if use_mock_gemini():
+        return call.mock()
+
+    async def fetch():
+        return call.parse(await transport(*call.request()))
+
+    try:
+        return await (asingle_flight(call.fingerprint, fetch) if call.fingerprint else fetch())
+    except Exception as e:
+        logger.error(f"{call.error}: {e}")
+        return call.fallback()
+
+
+def _mock_chat_response(conversation_history, preferred_language, total_turns):
+    user_msg = "test symptom"
+    for msg in reversed(conversation_history):
+        if msg.get('role') == 'user':
+            user_msg = msg.get('content', '')
+            break
+
+    # Check full history to simulate contextual memory for urgency classification
+    full_text = " ".join([m.get('content', '') for m in conversation_history if m.get('role') == 'user']).lower()
+    is_emergency = any(k in full_text for k in ["bleed", "accident", "emergency", "জরুরি", "রক্ত"])
+    urgency = "emergency" if is_emergency else "see_vet_this_week"
+
+
+    mock_reply_bn = (
+        "মক উত্তর: এটি একটি মক উত্তর। আপনার পোষা প্রাণীর উপসর্গ বিশ্লেষণ করা হচ্ছে। "
+        "আপনার কি আর কোনো লক্ষণ আমাদের জানাতে চান?"
+    )
+    mock_reply_en = (
+        "Mock Response: I am analyzing your pet's symptoms. Are there any other "
+        "symptoms or behaviors you would like to describe?"
+    )
+
+    # If the user says "done" or similar, or we hit a turn count limit, complete session
+    is_done = any(k in user_msg.lower() for k in ["done", "complete", "শেষ", "yes", "হ্যাঁ"]) or total_turns >= 3
+
+    reply = mock_reply_bn if preferred_language == 'bn' else mock_reply_en
+
+
+    response_dict = {
+        "reply": reply if not is_done else ("বিশ্লেষণ সমাপ্ত।" if preferred_language == 'bn' else "Analysis complete."),
+        "session_complete": is_done,
+        "urgency_level": urgency,
+        "urgency_explanation": (
+            "জ্বর এবং খাদ্য গ্রহণে অনীহা দেখা যাচ্ছে।"
+            if preferred_language == 'bn' else "Fever and loss of appetite observed."
+        ) if is_done else "",
+        "diagnosis_summary": (
+            "মক রোগ নির্ণয়: হালকা সংক্রমণ বা এলার্জি।"
+            if preferred_language == 'bn' else "Mock Diagnosis: Mild infection or allergy."
+        ) if is_done else "",
+        "care_advice": (
+            "১. পর্যাপ্ত পানি খাওয়ান।\n২. পরিষ্কার এবং আরামদায়ক জায়গায় রাখুন।"
+            if preferred_language == 'bn' else "1. Provide fresh water.\n2. Keep in a warm, clean place."
+        ) if is_done else "",
+        "things_to_care_about": (
+            "ওষুধ প্রয়োগে সতর্কতা অবলম্বন করুন। পরিষ্কার পরিবেশ বজায় রাখুন।"
+            if preferred_language == 'bn' else "Be careful with medication dosage. Maintain a clean environment."
+        ) if is_done else "",
+        "warning_signs": {
+            "emergency_situations": "যদি রক্তপাত হয় বা শ্বাসকষ্ট দেখা দেয়।" if preferred_language == 'bn' else "If bleeding occurs or breathing difficulty appears.",
+            "negative_symptoms": "জ্বর ৪৮ ঘণ্টার বেশি থাকলে।" if preferred_language == 'bn' else "If fever persists beyond 48 hours.",
+            "when_to_worry": "যদি ২৪ ঘণ্টার মধ্যে খাবার না খায়।" if preferred_language == 'bn' else "If the animal doesn't eat within 24 hours."
+        } if is_done else None,
+        "positive_signs": {
+            "safe_indicators": "প্রাণী সক্রিয় এবং পানি পান করছে।" if preferred_language == 'bn' else "Animal is active and drinking water.",
+            "recovery_signals": "জ্বর কমে যাওয়া এবং খাবারে আগ্রহ ফিরে আসা।" if preferred_language == 'bn' else "Fever reducing and appetite returning.",
+            "when_situation_is_controlled": "যখন স্বাভাবিক আচরণ ফিরে আসবে।" if preferred_language == 'bn' else "When normal behavior returns."
+        } if is_done else None,
+        "recommended_provider_type": "vet",
+        "suggest_livestock_officer": False,
+        "resource_keywords": ["fever", "infection", "care"] if is_done else []
+    }
+    return response_dict
 
-        # Build guidelines context section if provided
-        guidelines_section = ""
-        if guideline_context:
-            guidelines_section = f"\nVERIFIED PLATFORM CARE GUIDELINES REFERENCE:\nUse the following guidelines as context to provide accurate answers and care advice:\n{guideline_context}\n"
 
-        # Build system instruction template
-        system_instruction = f"""
+def _chat_request(conversation_history, preferred_language, animal_type_name, guideline_context):
+    """(contents, config) of a chat turn."""
+    # Build guidelines context section if provided
+    guidelines_section = ""
+    if guideline_context:
+        guidelines_section = f"\nVERIFIED PLATFORM CARE GUIDELINES REFERENCE:\nUse the following guidelines as context to provide accurate answers and care advice:\n{guideline_context}\n"
+
+    # Build system instruction template
+    system_instruction = f"""
 You are Antigravity, a professional bilingual pet and livestock care AI assistant designed for users in Bangladesh.
 You are helping a client with a {animal_type_name}. The client's preferred language is {preferred_language} ('bn' for Bangla, 'en' for English).
 
@@ -162,147 +191,218 @@ WHEN session_complete is TRUE, respond in this JSON format with ALL fields fille
 }}
 """
 
-        # Convert simple list history: {role: "user"|"assistant", content: "..."} into types.Content objects
-        contents = []
-        for msg in conversation_history:
-            role = 'user' if msg['role'] == 'user' else 'model'
-            contents.append(
-                types.Content(
-                    role=role,
-                    parts=[types.Part.from_text(text=msg['content'])]
-                )
+    # Convert simple list history: {role: "user"|"assistant", content: "..."} into types.Content objects
+    contents = []
+    for msg in conversation_history:
+        role = 'user' if msg['role'] == 'user' else 'model'
+        contents.append(
+            types.Content(
+                role=role,
+                parts=[types.Part.from_text(text=msg['content'])]
             )
-
-        config = types.GenerateContentConfig(
-            system_instruction=system_instruction,
-            response_mime_type="application/json",
-            temperature=0.2
         )
 
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = client.models.generate_content(
-                    model='gemini-2.5-flash',
-                    contents=contents,
-                    config=config
-                )
-                result = json.loads(response.text)
-                return result
-            except APIError as e:
-                if e.code == 503 and attempt < max_retries - 1:
-                    logger.warning(f"Gemini 503 error on attempt {attempt + 1}, retrying in {2 ** attempt}s...")
-                    time.sleep(2 ** attempt)
-                    continue
-                raise
+    config = types.GenerateContentConfig(
+        system_instruction=system_instruction,
+        response_mime_type="application/json",
+        temperature=0.2
+    )
+    return contents, config
+
+
+def _chat_error_response(preferred_language):
+    return {
+        "reply": "দুঃখিত, সংযোগে কিছু সমস্যা হচ্ছে। অনুগ্রহ করে আবার চেষ্টা করুন।" if preferred_language == 'bn' else "Sorry, we are having trouble connecting. Please try again.",
+        "session_complete": False,
+        "urgency_level": "monitor_at_home",
+        "diagnosis_summary": "",
+        "care_advice": ""
+    }
 
+
+def _chat_call(conversation_history, preferred_language, animal_type_name, guideline_context, total_turns):
+    return GeminiCall(
+        mock=lambda: _mock_chat_response(conversation_history, preferred_language, total_turns),
+        request=lambda: _chat_request(conversation_history, preferred_language, animal_type_name, guideline_context),
+        parse=lambda response: json.loads(response.text),
+        fallback=lambda: _chat_error_response(preferred_language),
+        error="Error calling Gemini API",
+    )
+
+
+class _ChatStream:
+    """A streamed chat response: the reply pieces as they arrive, then the parsed whole."""
+
+    def __init__(self):
+        self._reply = JsonStringStream('reply')
+        self._text = []
+
+    def feed(self, chunk):
+        """The next piece of the reply in `chunk`, or '' if it holds none."""
+        self._text.append(chunk.text or '')
+        return self._reply.feed(chunk.text or '')
+
+    def result(self):
+        return json.loads(''.join(self._text))
+
+
+def _mock_stream_events(result):
+    for piece in re.findall(r'\S+\s*', result['reply']):
+        yield 'reply', piece
+    yield 'result', result
+
+
+def call_gemini(conversation_history, preferred_language='bn', animal_type_name='Cat', guideline_context=None, total_turns=1):
+    """
+    Calls the Gemini 2.5 Flash model with conversation history and returns a structured response.
+    Automatically handles mock responses during test runs or if GEMINI_API_KEY is not configured.
+    """
+    call = _chat_call(conversation_history, preferred_language, animal_type_name, guideline_context, total_turns)
+    return _run(call, generate_content)
+
+
+async def acall_gemini(conversation_history, preferred_language='bn', animal_type_name='Cat', guideline_context=None, total_turns=1):
+    """call_gemini for async views: the model call is awaited, not blocking the worker."""
+    call = _chat_call(conversation_history, preferred_language, animal_type_name, guideline_context, total_turns)
+    return await _arun(call, agenerate_content)
+
+
+def stream_gemini(conversation_history, preferred_language='bn', animal_type_name='Cat', guideline_context=None, total_turns=1):
+    """
+    Streaming call_gemini. Yields ('reply', text) for each piece of the reply
+    as the model writes it, then ('result', dict) with the structured
+    response call_gemini would return; its "reply" is authoritative (on an
+    error midway it is the apology, not the pieces already sent).
+    """
+    call = _chat_call(conversation_history, preferred_language, animal_type_name, guideline_context, total_turns)
+    if use_mock_gemini():
+        yield from _mock_stream_events(call.mock())
+        return
+
+    stream = _ChatStream()
+    try:
+        for chunk in generate_content_stream(*call.request()):
+            piece = stream.feed(chunk)
+            if piece:
+                yield 'reply', piece
+        result = stream.result()
     except Exception as e:
-        logger.error(f"Error calling Gemini API: {e}")
-        return {
-            "reply": "দুঃখিত, সংযোগে কিছু সমস্যা হচ্ছে। অনুগ্রহ করে আবার চেষ্টা করুন।" if preferred_language == 'bn' else "Sorry, we are having trouble connecting. Please try again.",
-            "session_complete": False,
-            "urgency_level": "monitor_at_home",
-            "diagnosis_summary": "",
-            "care_advice": ""
-        }
+        logger.error(f"Error streaming Gemini API: {e}")
+        result = call.fallback()
+    yield 'result', result
+
+
+async def astream_gemini(conversation_history, preferred_language='bn', animal_type_name='Cat', guideline_context=None, total_turns=1):
+    """stream_gemini for async views, as an async iterator of the same events."""
+    call = _chat_call(conversation_history, preferred_language, animal_type_name, guideline_context, total_turns)
+    if use_mock_gemini():
+        for event in _mock_stream_events(call.mock()):
+            yield event
+        return
+
+    stream = _ChatStream()
+    try:
+        async for chunk in agenerate_content_stream(*call.request()):
+            piece = stream.feed(chunk)
+            if piece:
+                yield 'reply', piece
+        result = stream.result()
+    except Exception as e:
+        logger.error(f"Error streaming Gemini API: {e}")
+        result = call.fallback()
+    yield 'result', result
+
+
+def _polish_request(text, language):
+    """(contents, config) of a polish call."""
+    system_instruction = f"You are a helpful assistant. The user is writing a pet adoption application. Polish the provided text to make it sound professional, empathetic, and responsible. Keep it in the {'Bangla' if language == 'bn' else 'English'} language. Do NOT add greetings like 'Hello' or closings like 'Sincerely'. Just return the polished body text directly."
+    return (
+        [types.Content(role='user', parts=[types.Part.from_text(text=text)])],
+        types.GenerateContentConfig(
+            system_instruction=system_instruction,
+            temperature=0.3
+        ),
+    )
+
+
+def _polish_fingerprint(text, language):
+    # Whitespace aside, the text is the request: its case and punctuation are what gets polished
+    return request_fingerprint('polish', language, ' '.join(text.split()))
+
+
+def _polish_call(text, language):
+    return GeminiCall(
+        mock=lambda: f"✨ [Polished] {text}",
+        request=lambda: _polish_request(text, language),
+        parse=lambda response: response.text.strip(),
+        fallback=lambda: text,
+        error="Error calling Gemini for polishing",
+        fingerprint=_polish_fingerprint(text, language),
+    )
+
 
 def polish_text(text, language='bn'):
     """
     Polishes and rewrites a pet adoption application text.
     """
-    import sys
-    is_test = (
-        'test' in sys.argv or
-        'test' in str(settings.DATABASES.get('default', {}).get('NAME', '')) or
-        'memory' in str(settings.DATABASES.get('default', {}).get('NAME', ''))
+    return _run(_polish_call(text, language), generate_content)
+
+
+async def apolish_text(text, language='bn'):
+    """polish_text for async views."""
+    return await _arun(_polish_call(text, language), agenerate_content)
+
+
+def _adoption_request(listing_details, application_text):
+    """(contents, config) of an application scoring call."""
+    system_instruction = (
+        "You are an expert pet adoption counselor. Evaluate the adopter's application "
+        "based on the pet's details, requirements, and the applicant's message. "
+        "Score the application strictly from 1 to 10 based on suitability. "
+        "Return ONLY the integer score (e.g., '8'). Do not include any other text."
+    )
+
+    prompt = (
+        f"Pet Details & Requirements:\n{listing_details}\n\n"
+        f"Adopter Application Message:\n{application_text}\n\n"
+        "Score this application out of 10. Reply with just the number."
     )
-    if not settings.GEMINI_API_KEY or is_test:
-        return f"✨ [Polished] {text}"
+    return (
+        [types.Content(role='user', parts=[types.Part.from_text(text=prompt)])],
+        types.GenerateContentConfig(
+            system_instruction=system_instruction,
+            temperature=0.1
+        ),
+    )
+
 
+def _adoption_score(response_text):
+    # Try to parse the integer from the response
     try:
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        
-        system_instruction = f"You are a helpful assistant. The user is writing a pet adoption application. Polish the provided text to make it sound professional, empathetic, and responsible. Keep it in the {'Bangla' if language == 'bn' else 'English'} language. Do NOT add greetings like 'Hello' or closings like 'Sincerely'. Just return the polished body text directly."
-
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = client.models.generate_content(
-                    model='gemini-2.5-flash',
-                    contents=[types.Content(role='user', parts=[types.Part.from_text(text=text)])],
-                    config=types.GenerateContentConfig(
-                        system_instruction=system_instruction,
-                        temperature=0.3
-                    )
-                )
-                return response.text.strip()
-            except APIError as e:
-                if e.code == 503 and attempt < max_retries - 1:
-                    logger.warning(f"Gemini 503 error on attempt {attempt + 1}, retrying in {2 ** attempt}s...")
-                    time.sleep(2 ** attempt)
-                    continue
-                raise
-    except Exception as e:
-        logger.error(f"Error calling Gemini for polishing: {e}")
-        return text
+        score = int(response_text.strip())
+        return min(max(score, 1), 10)  # Clamp between 1 and 10
+    except ValueError:
+        return 5  # Fallback score if parsing fails
+
+
+def _adoption_call(listing_details, application_text):
+    return GeminiCall(
+        mock=lambda: 7,  # Mock score
+        request=lambda: _adoption_request(listing_details, application_text),
+        parse=lambda response: _adoption_score(response.text),
+        fallback=lambda: 5,
+        error="Error calling Gemini for application analysis",
+    )
+
 
 def analyze_adoption_application(listing_details, application_text):
     """
     Analyzes the adoption application against the listing details and requirements.
     Returns a score out of 10 (int).
     """
-    import sys
-    is_test = (
-        'test' in sys.argv or
-        'test' in str(settings.DATABASES.get('default', {}).get('NAME', '')) or
-        'memory' in str(settings.DATABASES.get('default', {}).get('NAME', ''))
-    )
-    if not settings.GEMINI_API_KEY or is_test:
-        return 7  # Mock score
+    return _run(_adoption_call(listing_details, application_text), generate_content)
 
-    try:
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        
-        system_instruction = (
-            "You are an expert pet adoption counselor. Evaluate the adopter's application "
-            "based on the pet's details, requirements, and the applicant's message. "
-            "Score the application strictly from 1 to 10 based on suitability. "
-            "Return ONLY the integer score (e.g., '8'). Do not include any other text."
-        )
 
-        prompt = (
-            f"Pet Details & Requirements:\n{listing_details}\n\n"
-            f"Adopter Application Message:\n{application_text}\n\n"
-            "Score this application out of 10. Reply with just the number."
-        )
-
-        max_retries = 3
-        response = None
-        for attempt in range(max_retries):
-            try:
-                response = client.models.generate_content(
-                    model='gemini-2.5-flash',
-                    contents=[types.Content(role='user', parts=[types.Part.from_text(text=prompt)])],
-                    config=types.GenerateContentConfig(
-                        system_instruction=system_instruction,
-                        temperature=0.1
-                    )
-                )
-                break
-            except APIError as e:
-                if e.code == 503 and attempt < max_retries - 1:
-                    logger.warning(f"Gemini 503 error on attempt {attempt + 1}, retrying in {2 ** attempt}s...")
-                    time.sleep(2 ** attempt)
-                    continue
-                raise
-        
-        # Try to parse the integer from the response
-        try:
-            score = int(response.text.strip())
-            return min(max(score, 1), 10)  # Clamp between 1 and 10
-        except ValueError:
-            return 5  # Fallback score if parsing fails
-            
-    except Exception as e:
-        logger.error(f"Error calling Gemini for application analysis: {e}")
-        return 5
+async def aanalyze_adoption_application(listing_details, application_text):
+    """analyze_adoption_application for async callers."""
+    return await _arun(_adoption_call(listing_details, application_text), agenerate_content)
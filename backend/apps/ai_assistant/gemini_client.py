@@ -0,0 +1,332 @@
+"""
+PetCarePlus v2 — Shared Gemini Client
+
+One google-genai client per process for every Gemini entry point
+(call_gemini, polish_text, analyze_adoption_application,
+diagnose_with_gemini) instead of a new client, and TLS handshake, per call:
+
+- `get_gemini_client()` builds the client and its keep-alive httpx pool on
+  first use, and again after a fork or a change of the GEMINI_* settings.
+- Every HTTP attempt has its own connect and read deadlines
+  (GEMINI_CONNECT_TIMEOUT / GEMINI_READ_TIMEOUT); a whole call, backoff
+  included, ends by GEMINI_CALL_DEADLINE, well inside the worker timeout.
+- `RetryPolicy` is the single retry rule: transient API statuses and
+  transport errors are retried with capped, jittered exponential backoff,
+  while the deadline leaves room for another attempt.
+
+`generate_content()` and `generate_content_stream()` put the three
+together; entry points keep their own prompts, parsing and fallbacks.
+`agenerate_content()` and `agenerate_content_stream()` are the same calls
+for async views: they await the model on an async pool, one per event loop
+(httpx async connections belong to the loop that opened them), so a worker
+keeps serving other requests while a call is in flight.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import ssl
+import threading
+import time
+import weakref
+
+import certifi
+import httpx
+from django.conf import settings
+from google import genai
+from google.genai import types
+from google.genai.errors import APIError
+
+logger = logging.getLogger(__name__)
+
+
+GEMINI_MODEL = 'gemini-2.5-flash'
+
+# Request timeout, rate limited, and server-side failures
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class GeminiDeadlineExceeded(TimeoutError):
+    """The call deadline passed before the model answered."""
+
+
+def _cap(value, limit):
+    return limit if value is None else min(value, limit)
+
+
+class DeadlineTimeoutMixin:
+    """
+    httpx client that keeps its own per-phase timeouts. The SDK passes one
+    number (or None) per request; it is used as a cap on each phase, so the
+    remaining call deadline still bounds the attempt.
+    """
+
+    def build_request(self, *args, timeout=httpx.USE_CLIENT_DEFAULT, **kwargs):
+        if isinstance(timeout, (int, float)):
+            base = self.timeout
+            timeout = httpx.Timeout(
+                connect=_cap(base.connect, timeout), read=_cap(base.read, timeout),
+                write=_cap(base.write, timeout), pool=_cap(base.pool, timeout),
+            )
+        else:
+            timeout = httpx.USE_CLIENT_DEFAULT
+        return super().build_request(*args, timeout=timeout, **kwargs)
+
+
+class DeadlineHttpxClient(DeadlineTimeoutMixin, httpx.Client):
+    pass
+
+
+class DeadlineAsyncHttpxClient(DeadlineTimeoutMixin, httpx.AsyncClient):
+    pass
+
+
+class RetryPolicy:
+    """Retry and backoff rule shared by every Gemini call."""
+
+    def __init__(self, attempts=3, initial_delay=1.0, max_delay=8.0, jitter=0.2,
+                 retry_statuses=RETRYABLE_STATUS_CODES):
+        self.attempts = max(attempts, 1)
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+
+    def is_retryable(self, exc):
+        if isinstance(exc, APIError):
+            return exc.code in self.retry_statuses
+        # Connect/read timeouts, refused and dropped connections
+        return isinstance(exc, httpx.TransportError)
+
+    def backoff(self, attempt):
+        """Seconds to wait after the failed attempt number `attempt` (0-based)."""
+        delay = min(self.initial_delay * 2 ** attempt, self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def call(self, fn, deadline):
+        """
+        fn(remaining_seconds) until it returns, fails for good, or the
+        `deadline` (a time.monotonic() value) leaves no room to retry.
+        """
+        for attempt in range(self.attempts):
+            remaining = self._remaining(attempt, deadline)
+            try:
+                return fn(remaining)
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, deadline)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    async def acall(self, fn, deadline):
+        """`call` for a coroutine function; backoff sleeps do not block the loop."""
+        for attempt in range(self.attempts):
+            remaining = self._remaining(attempt, deadline)
+            try:
+                return await fn(remaining)
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    def _remaining(self, attempt, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise GeminiDeadlineExceeded(f'Gemini call deadline passed after {attempt} attempts')
+        return remaining
+
+    def _retry_delay(self, exc, attempt, deadline):
+        """Seconds to wait before retrying after `exc`, or None to give up."""
+        if attempt == self.attempts - 1 or not self.is_retryable(exc):
+            return None
+        delay = self.backoff(attempt)
+        if time.monotonic() + delay >= deadline:
+            return None
+        logger.warning('Gemini attempt %d failed (%s), retrying in %.1fs', attempt + 1, exc, delay)
+        return delay
+
+
+def get_retry_policy():
+    return RetryPolicy(attempts=settings.GEMINI_MAX_ATTEMPTS)
+
+
+def use_mock_gemini():
+    """Mock responses during test runs or when GEMINI_API_KEY is not configured."""
+    import sys
+    is_test = (
+        'test' in sys.argv or
+        'test' in str(settings.DATABASES.get('default', {}).get('NAME', '')) or
+        'memory' in str(settings.DATABASES.get('default', {}).get('NAME', ''))
+    )
+    return not settings.GEMINI_API_KEY or is_test
+
+
+# ── Client ───────────────────────────────────────────────────────
+
+def _http_client_options(asynchronous=False):
+    pool_size = settings.GEMINI_POOL_SIZE
+    return {
+        'timeout': httpx.Timeout(
+            connect=settings.GEMINI_CONNECT_TIMEOUT, read=settings.GEMINI_READ_TIMEOUT,
+            write=settings.GEMINI_READ_TIMEOUT,
+            # An async worker runs many calls at once: waiting for a pooled
+            # connection is normal there, bounded by the call deadline alone
+            pool=None if asynchronous else settings.GEMINI_CONNECT_TIMEOUT,
+        ),
+        'limits': httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        # Same trust store as the SDK's own client
+        'verify': ssl.create_default_context(
+            cafile=os.environ.get('SSL_CERT_FILE', certifi.where()), capath=os.environ.get('SSL_CERT_DIR'),
+        ),
+        'follow_redirects': True,
+    }
+
+
+def build_gemini_client(asynchronous=False):
+    """
+    A google-genai client over a keep-alive pool with the configured
+    deadlines: a sync pool, or with `asynchronous` an async one for
+    `client.aio`, bound to the running event loop.
+    """
+    if asynchronous:
+        http_options = types.HttpOptions(
+            httpx_async_client=DeadlineAsyncHttpxClient(**_http_client_options(asynchronous=True)),
+            base_url=settings.GEMINI_BASE_URL or None,
+        )
+    else:
+        http_options = types.HttpOptions(
+            httpx_client=DeadlineHttpxClient(**_http_client_options()),
+            base_url=settings.GEMINI_BASE_URL or None,
+        )
+    return genai.Client(api_key=settings.GEMINI_API_KEY, http_options=http_options)
+
+
+def _client_key():
+    # A forked worker must not share its parent's sockets
+    return (
+        os.getpid(), settings.GEMINI_API_KEY, settings.GEMINI_BASE_URL, settings.GEMINI_CONNECT_TIMEOUT,
+        settings.GEMINI_READ_TIMEOUT, settings.GEMINI_POOL_SIZE,
+    )
+
+
+_lock = threading.Lock()
+_shared = {'key': None, 'client': None}
+
+
+def get_gemini_client():
+    """The process-wide Gemini client, built on first use."""
+    key = _client_key()
+    if _shared['key'] != key:
+        with _lock:
+            if _shared['key'] != key:
+                _shared['client'] = build_gemini_client()
+                _shared['key'] = key
+    return _shared['client']
+
+
+# event loop -> (key, client); a closed loop's client goes with it
+_loop_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_gemini_client():
+    """The Gemini client of the running event loop, for `client.aio` calls."""
+    loop = asyncio.get_running_loop()
+    key = _client_key()
+    entry = _loop_clients.get(loop)
+    if entry is None or entry[0] != key:
+        with _lock:
+            entry = _loop_clients.get(loop)
+            if entry is None or entry[0] != key:
+                entry = (key, build_gemini_client(asynchronous=True))
+                _loop_clients[loop] = entry
+    return entry[1]
+
+
+def generate_content(contents, config=None, model=GEMINI_MODEL, deadline=None):
+    """
+    `models.generate_content` on the shared client, retried under the
+    shared policy and bounded by `deadline` seconds (GEMINI_CALL_DEADLINE
+    by default). Raises the last error, or GeminiDeadlineExceeded.
+    """
+    deadline_at = time.monotonic() + (deadline or settings.GEMINI_CALL_DEADLINE)
+    client = get_gemini_client()
+    config = config or types.GenerateContentConfig()
+
+    def attempt(remaining):
+        return client.models.generate_content(
+            model=model, contents=contents, config=_with_timeout(config, remaining)
+        )
+
+    return get_retry_policy().call(attempt, deadline_at)
+
+
+def generate_content_stream(contents, config=None, model=GEMINI_MODEL, deadline=None):
+    """
+    Streaming `generate_content`: yields response chunks as the model writes
+    them. The retry policy covers opening the stream, up to the first chunk;
+    a stream that fails midway raises, as its output was already used. The
+    read timeout bounds each wait for a chunk and `deadline` the whole call.
+    """
+    deadline_at = time.monotonic() + (deadline or settings.GEMINI_CALL_DEADLINE)
+    client = get_gemini_client()
+    config = config or types.GenerateContentConfig()
+
+    def open_stream(remaining):
+        stream = client.models.generate_content_stream(
+            model=model, contents=contents, config=_with_timeout(config, remaining)
+        )
+        return next(stream, None), stream
+
+    first, stream = get_retry_policy().call(open_stream, deadline_at)
+    if first is None:
+        return
+    yield first
+    for chunk in stream:
+        if time.monotonic() > deadline_at:
+            stream.close()
+            raise GeminiDeadlineExceeded('Gemini stream outlived its call deadline')
+        yield chunk
+
+
+async def agenerate_content(contents, config=None, model=GEMINI_MODEL, deadline=None):
+    """`generate_content` for async callers: awaits the model on the loop's client."""
+    deadline_at = time.monotonic() + (deadline or settings.GEMINI_CALL_DEADLINE)
+    client = get_async_gemini_client()
+    config = config or types.GenerateContentConfig()
+
+    async def attempt(remaining):
+        return await client.aio.models.generate_content(
+            model=model, contents=contents, config=_with_timeout(config, remaining)
+        )
+
+    return await get_retry_policy().acall(attempt, deadline_at)
+
+
+async def agenerate_content_stream(contents, config=None, model=GEMINI_MODEL, deadline=None):
+    """`generate_content_stream` for async callers, as an async iterator of chunks."""
+    deadline_at = time.monotonic() + (deadline or settings.GEMINI_CALL_DEADLINE)
+    client = get_async_gemini_client()
+    config = config or types.GenerateContentConfig()
+
+    async def open_stream(remaining):
+        stream = await client.aio.models.generate_content_stream(
+            model=model, contents=contents, config=_with_timeout(config, remaining)
+        )
+        return await anext(stream, None), stream
+
+    first, stream = await get_retry_policy().acall(open_stream, deadline_at)
+    if first is None:
+        return
+    yield first
+    async for chunk in stream:
+        if time.monotonic() > deadline_at:
+            await stream.aclose()
+            raise GeminiDeadlineExceeded('Gemini stream outlived its call deadline')
+        yield chunk
+
+
+def _with_timeout(config, remaining):
+    # The SDK takes the per-request timeout in milliseconds
+    return config.model_copy(update={'http_options': types.HttpOptions(timeout=max(int(remaining * 1000), 1))})
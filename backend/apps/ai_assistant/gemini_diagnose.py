@@ -3,16 +3,20 @@ PetCarePlus v2 — Gemini One-Shot Diagnostic
 
 Single-prompt diagnostic call to Gemini 2.5 Flash.
 Returns structured JSON with diagnosis, urgency, warning/positive signs,
-resource keywords, and provider type recommendations.
+resource keywords, and provider type recommendations. Goes through the
+shared client, deadlines and retry policy of gemini_client, behind the
+diagnosis cache (repeat and near-duplicate descriptions); identical
+requests in flight share one call (single_flight).
 """
 
 import json
 import logging
-from django.conf import settings
-from google import genai
+from asgiref.sync import sync_to_async
 from google.genai import types
-from google.genai.errors import APIError
-import time
+
+from apps.ai_assistant.diagnosis_cache import DiagnosisQuery, cached_diagnosis, store_diagnosis
+from apps.ai_assistant.gemini_client import agenerate_content, generate_content, use_mock_gemini
+from apps.ai_assistant.single_flight import asingle_flight, request_fingerprint, single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -30,25 +34,57 @@ def diagnose_with_gemini(animal_type_name, animal_category, problem_description,
     Returns:
         dict with structured diagnostic response
     """
+    if use_mock_gemini():
+        return _get_mock_response(problem_description, preferred_language, animal_type_name)
 
-    # Mock mode for tests or missing API key
-    import sys
-    is_test = (
-        'test' in sys.argv or
-        'test' in str(settings.DATABASES.get('default', {}).get('NAME', '')) or
-        'memory' in str(settings.DATABASES.get('default', {}).get('NAME', ''))
-    )
+    query = DiagnosisQuery(animal_type_name, animal_category, preferred_language, problem_description)
+    cached = cached_diagnosis(query)
+    if cached is not None:
+        return cached
+
+    try:
+        contents, config = _diagnose_request(animal_type_name, animal_category, problem_description, preferred_language)
+        result = single_flight(
+            request_fingerprint('diagnose', *query.key),
+            lambda: json.loads(generate_content(contents, config).text),
+        )
+    except Exception as e:
+        logger.error(f"Error calling Gemini Diagnose API: {e}")
+        return _diagnose_error_response(preferred_language)
+    store_diagnosis(query, result)
+    return result
 
-    if not settings.GEMINI_API_KEY or is_test:
+
+async def adiagnose_with_gemini(animal_type_name, animal_category, problem_description, preferred_language='bn'):
+    """diagnose_with_gemini for async views: the model call is awaited, not blocking the worker."""
+    if use_mock_gemini():
         return _get_mock_response(problem_description, preferred_language, animal_type_name)
 
+    query = DiagnosisQuery(animal_type_name, animal_category, preferred_language, problem_description)
+    cached = await sync_to_async(cached_diagnosis)(query)
+    if cached is not None:
+        return cached
+
     try:
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        contents, config = _diagnose_request(animal_type_name, animal_category, problem_description, preferred_language)
 
-        lang_name = 'Bangla' if preferred_language == 'bn' else 'English'
-        context_type = 'livestock/farm animal' if animal_category == 'livestock' else 'companion pet'
+        async def call():
+            return json.loads((await agenerate_content(contents, config)).text)
 
-        system_instruction = f"""You are a professional bilingual veterinary AI diagnostic assistant designed for users in Bangladesh.
+        result = await asingle_flight(request_fingerprint('diagnose', *query.key), call)
+    except Exception as e:
+        logger.error(f"Error calling Gemini Diagnose API: {e}")
+        return _diagnose_error_response(preferred_language)
+    store_diagnosis(query, result)
+    return result
+
+
+def _diagnose_request(animal_type_name, animal_category, problem_description, preferred_language):
+    """(contents, config) of a diagnostic call."""
+    lang_name = 'Bangla' if preferred_language == 'bn' else 'English'
+    context_type = 'livestock/farm animal' if animal_category == 'livestock' else 'companion pet'
+
+    system_instruction = f"""You are a professional bilingual veterinary AI diagnostic assistant designed for users in Bangladesh.
 You are analyzing a {context_type}: {animal_type_name}.
 The user's preferred language is {preferred_language} ('{lang_name}').
 
@@ -127,63 +163,47 @@ You MUST respond strictly in the following JSON format:
   "suggest_livestock_officer": true | false
 }}"""
 
-        user_prompt = f"Animal: {animal_type_name} ({animal_category})\n\nProblem/Question:\n{problem_description}"
+    user_prompt = f"Animal: {animal_type_name} ({animal_category})\n\nProblem/Question:\n{problem_description}"
 
-        contents = [
-            types.Content(
-                role='user',
-                parts=[types.Part.from_text(text=user_prompt)]
-            )
-        ]
-
-        config = types.GenerateContentConfig(
-            system_instruction=system_instruction,
-            response_mime_type="application/json",
-            temperature=0.2
+    contents = [
+        types.Content(
+            role='user',
+            parts=[types.Part.from_text(text=user_prompt)]
         )
+    ]
 
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = client.models.generate_content(
-                    model='gemini-2.5-flash',
-                    contents=contents,
-                    config=config
-                )
-                result = json.loads(response.text)
-                return result
-            except APIError as e:
-                if e.code == 503 and attempt < max_retries - 1:
-                    logger.warning(f"Gemini 503 error on attempt {attempt + 1}, retrying in {2 ** attempt}s...")
-                    time.sleep(2 ** attempt)
-                    continue
-                raise
+    config = types.GenerateContentConfig(
+        system_instruction=system_instruction,
+        response_mime_type="application/json",
+        temperature=0.2
+    )
+    return contents, config
 
-    except Exception as e:
-        logger.error(f"Error calling Gemini Diagnose API: {e}")
-        error_msg = (
-            "দুঃখিত, এআই বিশ্লেষণে কিছু সমস্যা হচ্ছে। অনুগ্রহ করে আবার চেষ্টা করুন।"
-            if preferred_language == 'bn'
-            else "Sorry, there was an issue with the AI analysis. Please try again."
-        )
-        return {
-            "query_type": "disease",
-            "diagnosis": {
-                "possible_problems": error_msg,
-                "what_owner_can_do": "",
-                "things_to_care_about": ""
-            },
-            "urgency": {
-                "level": "see_vet_this_week",
-                "explanation": error_msg
-            },
-            "warning_signs": None,
-            "positive_signs": None,
-            "guided_response": "",
-            "resource_keywords": [],
-            "recommended_provider_type": "vet",
-            "suggest_livestock_officer": False
-        }
+
+def _diagnose_error_response(preferred_language):
+    error_msg = (
+        "দুঃখিত, এআই বিশ্লেষণে কিছু সমস্যা হচ্ছে। অনুগ্রহ করে আবার চেষ্টা করুন।"
+        if preferred_language == 'bn'
+        else "Sorry, there was an issue with the AI analysis. Please try again."
+    )
+    return {
+        "query_type": "disease",
+        "diagnosis": {
+            "possible_problems": error_msg,
+            "what_owner_can_do": "",
+            "things_to_care_about": ""
+        },
+        "urgency": {
+            "level": "see_vet_this_week",
+            "explanation": error_msg
+        },
+        "warning_signs": None,
+        "positive_signs": None,
+        "guided_response": "",
+        "resource_keywords": [],
+        "recommended_provider_type": "vet",
+        "suggest_livestock_officer": False
+    }
 
 
 def _get_mock_response(problem_description, preferred_language, animal_type_name):
@@ -0,0 +1,26 @@
+"""
+Management command to report the diagnosis cache lookups of every worker:
+exact hits, near-duplicate hits, misses and the hit ratio.
+Run: python manage.py diagnosis_cache_stats [--reset]
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.ai_assistant.diagnosis_cache import get_diagnosis_cache_stats, reset_diagnosis_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Reports (and optionally resets) the diagnosis cache hit/miss counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after reporting')
+
+    def handle(self, *args, **options):
+        stats = get_diagnosis_cache_stats()
+        self.stdout.write(
+            f"hits={stats['hit']} near_hits={stats['near_hit']} misses={stats['miss']} "
+            f"hit_ratio={stats['hit_ratio']:.2%}"
+        )
+        if options['reset']:
+            reset_diagnosis_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -5,6 +5,7 @@ Serializers for AI diagnostic input/output, conversation sessions, and provider
 """
 
 from rest_framework import serializers
+from common.fieldsets import SparseFieldsetsMixin
 import ast
 from apps.ai_assistant.models import AISession, AIProviderSuggestion
 from apps.animals.serializers import AnimalTypeSerializer
@@ -12,7 +13,7 @@ from apps.providers.serializers import ServiceProviderSerializer
 from apps.resources.serializers import ResourceSerializer
 
 
-class AIProviderSuggestionSerializer(serializers.ModelSerializer):
+class AIProviderSuggestionSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer for ranked provider suggestions generated after an AI diagnostic session.
     """
@@ -43,7 +44,7 @@ class AIProviderSuggestionSerializer(serializers.ModelSerializer):
         return getattr(obj, 'reason_en', '')
 
 
-class AISessionSerializer(serializers.ModelSerializer):
+class AISessionSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer for retrieving an AISession with its full conversation history
     and generated provider suggestions.
@@ -132,6 +133,21 @@ class AIDiagnoseInputSerializer(serializers.Serializer):
         max_length=50,
         help_text="User's district for location-based provider matching"
     )
+    user_division_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="Division ID for location-based provider matching (preferred over user_division)"
+    )
+    user_district_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="District ID for location-based provider matching (preferred over user_district)"
+    )
+    user_upazila_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="Upazila ID for location-based provider matching"
+    )
     user_latitude = serializers.FloatField(
         required=False,
         allow_null=True,
@@ -180,6 +196,21 @@ class AIChatSerializer(serializers.Serializer):
         max_length=50,
         help_text="User's district for location-based provider matching"
     )
+    user_division_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="Division ID for location-based provider matching (preferred over user_division)"
+    )
+    user_district_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="District ID for location-based provider matching (preferred over user_district)"
+    )
+    user_upazila_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="Upazila ID for location-based provider matching"
+    )
     user_latitude = serializers.FloatField(
         required=False,
         allow_null=True,
@@ -190,3 +221,8 @@ class AIChatSerializer(serializers.Serializer):
         allow_null=True,
         help_text="User's longitude from geolocation"
     )
+    stream = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Stream the reply as Server-Sent Events (also chosen by Accept: text/event-stream)"
+    )
@@ -0,0 +1,106 @@
+"""
+PetCarePlus v2 — Single-Flight Model Calls
+
+Identical model requests in flight at the same time (double taps, client
+retries, the same outbreak query from many farmers) share one Gemini call:
+
+- The first caller takes a short-lived lock in the shared cache
+  (`cache.add`, atomic in Redis and local memory), makes the call, and
+  publishes its result under the request's fingerprint for
+  AI_SINGLE_FLIGHT_RESULT_TTL seconds.
+- Callers finding the lock taken poll for that result, with backoff, for
+  at most AI_SINGLE_FLIGHT_WAIT seconds. A leader that fails publishes
+  nothing and frees the lock, so the next waiter leads in its place; a
+  lock left by a crashed worker expires with the call deadline. A waiter
+  still without a result when its wait runs out makes its own call.
+
+With Redis (REDIS_URL) this covers every gunicorn worker; with the
+local-memory cache, the threads of one worker. Callers fingerprint the
+normalized request (`request_fingerprint`) and pass the bare model call,
+so only successful results are shared.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+SINGLE_FLIGHT_CACHE_KEY = 'ai:single_flight:{}:{}'  # lock | result, fingerprint
+POLL_INITIAL_DELAY = 0.02
+POLL_MAX_DELAY = 0.25
+
+
+def request_fingerprint(*parts):
+    """Stable hash of the parts of a normalized request."""
+    return hashlib.sha1(json.dumps(parts, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+
+def _keys(fingerprint):
+    return SINGLE_FLIGHT_CACHE_KEY.format('lock', fingerprint), SINGLE_FLIGHT_CACHE_KEY.format('result', fingerprint)
+
+
+def _lock_timeout():
+    # A leader's call ends by the Gemini call deadline
+    return int(settings.GEMINI_CALL_DEADLINE) + 5
+
+
+def single_flight(fingerprint, fn):
+    """fn(), or the result of the identical call another caller is making."""
+    lock_key, result_key = _keys(fingerprint)
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.AI_SINGLE_FLIGHT_WAIT
+    delay = POLL_INITIAL_DELAY
+    while True:
+        published = cache.get(result_key)
+        if published is not None:
+            return published[0]
+        if cache.add(lock_key, token, timeout=_lock_timeout()):
+            break
+        if time.monotonic() + delay > deadline:
+            logger.warning('Single-flight wait for %s ran out, calling the model', fingerprint)
+            return fn()
+        time.sleep(delay)
+        delay = min(delay * 2, POLL_MAX_DELAY)
+
+    try:
+        result = fn()
+        cache.set(result_key, (result,), timeout=settings.AI_SINGLE_FLIGHT_RESULT_TTL)
+        return result
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+async def asingle_flight(fingerprint, fn):
+    """single_flight for a coroutine function; waiting does not block the loop."""
+    lock_key, result_key = _keys(fingerprint)
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.AI_SINGLE_FLIGHT_WAIT
+    delay = POLL_INITIAL_DELAY
+    while True:
+        published = await cache.aget(result_key)
+        if published is not None:
+            return published[0]
+        if await cache.aadd(lock_key, token, timeout=_lock_timeout()):
+            break
+        if time.monotonic() + delay > deadline:
+            logger.warning('Single-flight wait for %s ran out, calling the model', fingerprint)
+            return await fn()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, POLL_MAX_DELAY)
+
+    try:
+        result = await fn()
+        await cache.aset(result_key, (result,), timeout=settings.AI_SINGLE_FLIGHT_RESULT_TTL)
+        return result
+    finally:
+        if await cache.aget(lock_key) == token:
+            await cache.adelete(lock_key)
@@ -0,0 +1,96 @@
+"""
+PetCarePlus v2 — AI Response Streaming
+
+Helpers for streaming model output to clients as Server-Sent Events:
+
+- `sse_event()` encodes one event (`event:` name, one JSON `data:` line).
+- `EventStreamRenderer` lets views accept `Accept: text/event-stream`;
+  it renders the plain responses of such requests (validation and
+  permission errors) as a single `error` event.
+- `JsonStringStream` pulls the decoded text of one string field out of a
+  JSON document that arrives in arbitrary chunks, so the "reply" of a JSON
+  mode completion can be shown while the rest of the object is still being
+  generated.
+"""
+
+import json
+import re
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def sse_event(event, data):
+    """One Server-Sent Event as bytes."""
+    payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return f'event: {event}\ndata: {payload}\n\n'.encode('utf-8')
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return sse_event('error', data)
+
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class JsonStringStream:
+    """
+    Incremental decoder of the first `"<field>": "..."` string in a JSON
+    text. `feed(chunk)` returns the newly decoded characters (possibly '');
+    escapes split across chunks are held back until complete.
+    """
+
+    def __init__(self, field):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ''
+        self._pos = None  # Start of the undecoded value text, once found
+        self.done = False
+
+    def feed(self, chunk):
+        if self.done:
+            return ''
+        self._buffer += chunk
+        if self._pos is None:
+            match = self._key.search(self._buffer)
+            if not match:
+                return ''
+            self._pos = match.end()
+
+        buffer, i, out = self._buffer, self._pos, []
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                i += 1
+                break
+            if char != '\\':
+                out.append(char)
+                i += 1
+                continue
+            if i + 1 >= len(buffer):
+                break
+            if buffer[i + 1] != 'u':
+                out.append(_ESCAPES.get(buffer[i + 1], buffer[i + 1]))
+                i += 2
+                continue
+            if i + 6 > len(buffer):
+                break
+            code = int(buffer[i + 2:i + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # High surrogate: wait for its pair
+                if i + 12 > len(buffer):
+                    break
+                low = int(buffer[i + 8:i + 12], 16)
+                out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                i += 12
+            else:
+                out.append(chr(code))
+                i += 6
+
+        self._buffer, self._pos = buffer[i:], 0
+        return ''.join(out)
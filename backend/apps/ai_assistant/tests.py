@@ -2,7 +2,10 @@
 PetCarePlus v2 — AI Assistant App Unit Tests
 
 Tests covering interactive chat flows, anonymous turn-limit rate limits,
-session completion logic, and weighted provider suggestions.
+session completion logic, weighted provider suggestions, streamed (SSE)
+chat turns, async views under ASGI, the diagnosis response cache,
+single-flight coalescing of identical model calls, and the shared Gemini
+client (against a local stand-in server).
 """
 
 from django.contrib.auth import get_user_model
@@ -117,3 +120,580 @@ class AIAssistantAPITests(APITestCase):
         self.assertIn('পশু চিকিৎসক', suggestions[0]['reason_bn'])  # Auto-resolved language details
 
 
+
+
+class LocationMatchingTests(APITestCase):
+    """
+    Tests for resolving the request location to IDs and matching government
+    vets by location ID.
+    """
+
+    def setUp(self):
+        from apps.locations.models import Division, District
+
+        self.cat_type = AnimalType.objects.create(
+            name_en='Cat', name_bn='বিড়াল', slug='cat',
+            category='companion', icon='cat', supports_services=True
+        )
+        self.dhaka = Division.objects.create(name_en='Dhaka', name_bn='ঢাকা')
+        self.dhaka_district = District.objects.create(division=self.dhaka, name_en='Dhaka', name_bn='ঢাকা')
+        self.gazipur = District.objects.create(division=self.dhaka, name_en='Gazipur', name_bn='গাজীপুর')
+
+        self.local_vet = self._govt_vet('local', self.gazipur)
+        self.regional_vet = self._govt_vet('regional', self.dhaka_district)
+
+    def _govt_vet(self, slug, district):
+        user = User.objects.create_user(
+            email=f'{slug}@test.com', password='password123',
+            full_name=slug, role='provider'
+        )
+        return ServiceProvider.objects.create(
+            user=user, business_name=slug, provider_type='vet', phone='01700000000',
+            division=district.division, district=district,
+            is_government_vet=True, is_verified=True
+        )
+
+    def test_govt_vets_match_district_then_division_id(self):
+        from apps.ai_assistant.views import _get_govt_vets
+
+        vets = _get_govt_vets(self.cat_type, division_id=self.dhaka.pk, district_id=self.gazipur.pk)
+        self.assertEqual([vet.pk for vet in vets], [self.local_vet.pk])
+
+        vets = _get_govt_vets(self.cat_type, division_id=self.dhaka.pk)
+        self.assertEqual({vet.pk for vet in vets}, {self.local_vet.pk, self.regional_vet.pk})
+
+    def test_request_location_resolves_names_and_profile(self):
+        from types import SimpleNamespace
+        from apps.ai_assistant.views import _request_location
+
+        anonymous = SimpleNamespace(user=SimpleNamespace(is_authenticated=False))
+        location = _request_location(anonymous, {'user_division': 'ঢাকা', 'user_district': 'gazipur'})
+        self.assertEqual((location.division_id, location.district_id), (self.dhaka.pk, self.gazipur.pk))
+
+        user = User.objects.create_user(email='owner@test.com', password='password123', full_name='Owner')
+        user.division_ref, user.district_ref = self.dhaka, self.dhaka_district
+        location = _request_location(SimpleNamespace(user=user), {})
+        self.assertEqual(location.district_id, self.dhaka_district.pk)
+        self.assertTrue(location.has_location)
+
+
+class AIChatStreamingTests(APITestCase):
+    """
+    Tests for Server-Sent Events chat turns.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.cat_type = AnimalType.objects.create(
+            name_en='Cat', name_bn='বিড়াল', slug='cat',
+            category='companion', icon='cat', supports_services=True
+        )
+        self.user = User.objects.create_user(
+            email='streamer@test.com', password='password123',
+            full_name='Stream Owner', role='pet_owner'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.chat_url = reverse('ai_chat')
+
+    def events(self, response):
+        import json
+        from asgiref.sync import async_to_sync
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        async def read(stream):
+            return b''.join([chunk async for chunk in stream])
+
+        # The async view streams from an async iterator
+        events = []
+        for block in async_to_sync(read)(response.streaming_content).decode('utf-8').split('\n\n'):
+            if block:
+                name, data = block.split('\n')
+                events.append((name[len('event: '):], json.loads(data[len('data: '):])))
+        return events
+
+    def test_reply_is_streamed_before_the_structured_result(self):
+        response = self.client.post(self.chat_url, {
+            'message': 'My cat is sneezing', 'animal_type_id': self.cat_type.id,
+            'preferred_language': 'en', 'stream': True,
+        }, format='json')
+        events = self.events(response)
+        names = [name for name, _ in events]
+
+        self.assertEqual(names[0], 'session')
+        self.assertEqual(names[-2:], ['result', 'done'])
+        deltas = ''.join(data['delta'] for name, data in events if name == 'reply')
+        result = events[-2][1]
+        self.assertGreater(names.count('reply'), 1)
+        self.assertEqual(deltas, result['reply'])
+        self.assertFalse(result['session_complete'])
+
+        session = AISession.objects.get(pk=events[0][1]['session_id'])
+        self.assertEqual(session.conversation_history, [
+            {'role': 'user', 'content': 'My cat is sneezing'},
+            {'role': 'assistant', 'content': result['reply']},
+        ])
+        self.assertEqual(events[-1][1]['reply'], result['reply'])
+
+    def test_completed_turn_pushes_matches_and_persists_like_the_json_path(self):
+        payload = {'message': 'done', 'animal_type_id': self.cat_type.id, 'preferred_language': 'en'}
+        plain = self.client.post(self.chat_url, payload, format='json')
+        events = self.events(self.client.post(
+            self.chat_url, payload, format='json', HTTP_ACCEPT='text/event-stream'
+        ))
+        names = [name for name, _ in events]
+
+        self.assertEqual(names[-5:], ['result', 'providers', 'resources', 'govt_vets', 'done'])
+        self.assertTrue(events[-5][1]['session_complete'])
+        done = events[-1][1]
+        self.assertEqual(done['reply'], plain.data['reply'])
+        self.assertEqual(
+            done['session']['diagnostic_result']['ai_response'],
+            plain.data['session']['diagnostic_result']['ai_response'],
+        )
+
+        plain_session = AISession.objects.get(pk=plain.data['session']['id'])
+        streamed_session = AISession.objects.get(pk=events[0][1]['session_id'])
+        self.assertEqual(streamed_session.conversation_history, plain_session.conversation_history)
+        self.assertEqual(
+            (streamed_session.urgency_level, streamed_session.ai_diagnosis_summary, streamed_session.is_complete),
+            (plain_session.urgency_level, plain_session.ai_diagnosis_summary, plain_session.is_complete),
+        )
+
+    def test_invalid_turn_is_a_plain_error_response(self):
+        response = self.client.post(self.chat_url, {'message': 'hi', 'stream': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('animal_type_id', response.data)
+
+        response = self.client.post(self.chat_url, {'message': 'hi'}, format='json', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.content.startswith(b'event: error\ndata: {"animal_type_id"'))
+
+
+class AsyncAIViewTests(APITestCase):
+    """
+    Tests for the async AI views served through the ASGI handler.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.cat_type = AnimalType.objects.create(
+            name_en='Cat', name_bn='বিড়াল', slug='cat',
+            category='companion', icon='cat', supports_services=True
+        )
+
+    async def test_diagnose_calls_overlap_on_one_worker(self):
+        import asyncio
+        import time
+        from unittest import mock
+        from django.test import AsyncClient
+        from apps.ai_assistant.gemini_diagnose import _get_mock_response
+
+        async def slow_model(animal_type_name, animal_category, problem_description, preferred_language='bn'):
+            await asyncio.sleep(0.3)
+            return _get_mock_response(problem_description, preferred_language, animal_type_name)
+
+        client = AsyncClient()
+        payload = {'animal_type_id': self.cat_type.id, 'problem_description': 'My cat is sneezing'}
+        with mock.patch('apps.ai_assistant.views.adiagnose_with_gemini', slow_model):
+            start = time.monotonic()
+            responses = await asyncio.gather(*[
+                client.post(reverse('ai_diagnose'), payload, content_type='application/json')
+                for _ in range(5)
+            ])
+            elapsed = time.monotonic() - start
+
+        self.assertEqual([r.status_code for r in responses], [status.HTTP_200_OK] * 5)
+        self.assertEqual(len({r.json()['session_id'] for r in responses}), 5)
+        self.assertLess(elapsed, 5 * 0.3)
+        self.assertEqual(await AISession.objects.acount(), 5)
+
+    async def test_errors_are_rendered_as_in_sync_views(self):
+        from django.test import AsyncClient
+
+        client = AsyncClient()
+        response = await client.post(
+            reverse('ai_diagnose'), {'animal_type_id': 999, 'problem_description': 'My cat is sneezing'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('animal_type_id', response.json())
+
+        response = await client.post(reverse('ai_polish'), {'text': 'Hi'}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class JsonStringStreamTests(APITestCase):
+    """
+    Tests for decoding a JSON string field from arbitrary chunks.
+    """
+
+    def test_chunk_boundaries_do_not_change_the_text(self):
+        import json
+        from apps.ai_assistant.streaming import JsonStringStream
+
+        document = json.dumps({'reply': 'জ্বর "high"\nসাবধান 🐄', 'session_complete': False})
+        for size in (1, 2, 5, len(document)):
+            stream = JsonStringStream('reply')
+            text = ''.join(stream.feed(document[i:i + size]) for i in range(0, len(document), size))
+            self.assertEqual(text, 'জ্বর "high"\nসাবধান 🐄')
+            self.assertTrue(stream.done)
+
+
+class DiagnosisCacheTests(APITestCase):
+    """
+    Tests for the exact and near-duplicate diagnosis cache and its metrics.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.ai_assistant.diagnosis_cache import get_diagnosis_cache
+
+        cache.clear()
+        get_diagnosis_cache().clear()
+
+    def query(self, description, language='en', animal='Cow'):
+        from apps.ai_assistant.diagnosis_cache import DiagnosisQuery
+
+        return DiagnosisQuery(animal, 'livestock', language, description)
+
+    def test_exact_tier_folds_case_punctuation_order_and_bangla_variants(self):
+        from apps.ai_assistant.diagnosis_cache import DiagnosisCache
+
+        diagnoses = DiagnosisCache(similarity=0)
+        diagnoses.put(self.query('cow not eating, fever, mouth sores'), {'query_type': 'disease'})
+
+        self.assertEqual(diagnoses.get(self.query('Cow: FEVER, mouth sores - not eating!!')), ('hit', {'query_type': 'disease'}))
+        diagnoses.put(self.query('গরু খায় না, জ্বর ২ দিন', 'bn'), {'query_type': 'information'})
+        self.assertEqual(diagnoses.get(self.query('গরু খায় না। জ্বর 2 দিন', 'bn'))[0], 'hit')
+        self.assertEqual(diagnoses.get(self.query('cow not eating, fever, mouth sores', 'bn')), (None, None))
+        self.assertEqual(diagnoses.get(self.query('cow not eating, fever, mouth sores', animal='Goat')), (None, None))
+
+    def test_near_duplicates_reuse_an_answer_above_the_threshold(self):
+        from apps.ai_assistant.diagnosis_cache import DiagnosisCache
+
+        diagnoses = DiagnosisCache(similarity=0.8)
+        diagnoses.put(self.query('cow not eating, fever, mouth sores'), {'query_type': 'disease'})
+
+        self.assertEqual(diagnoses.get(self.query('cow not eating fever mouth sore')), ('near_hit', {'query_type': 'disease'}))
+        self.assertEqual(diagnoses.get(self.query('cow not eating, fever, diarrhea')), (None, None))
+        self.assertEqual(DiagnosisCache(similarity=0).get(self.query('cow not eating fever mouth sore')), (None, None))
+        # Off unless configured
+        self.assertEqual(DiagnosisCache().similarity, 0)
+
+    def test_entries_expire_and_least_recently_used_are_evicted(self):
+        from unittest import mock
+        from apps.ai_assistant.diagnosis_cache import DiagnosisCache
+
+        diagnoses = DiagnosisCache(max_entries=2, ttl=60)
+        with mock.patch('apps.ai_assistant.diagnosis_cache.time.monotonic', return_value=1000.0):
+            diagnoses.put(self.query('fever'), {'n': 1})
+            diagnoses.put(self.query('limping'), {'n': 2})
+            diagnoses.get(self.query('fever'))
+            diagnoses.put(self.query('coughing'), {'n': 3})
+            self.assertEqual(diagnoses.get(self.query('limping')), (None, None))
+            self.assertEqual(len(diagnoses), 2)
+        with mock.patch('apps.ai_assistant.diagnosis_cache.time.monotonic', return_value=1061.0):
+            self.assertEqual(diagnoses.get(self.query('fever')), (None, None))
+
+    def test_diagnose_calls_the_model_once_per_description_and_counts_lookups(self):
+        import json
+        from types import SimpleNamespace
+        from unittest import mock
+        from django.test import override_settings
+        from apps.ai_assistant.diagnosis_cache import get_diagnosis_cache_stats
+        from apps.ai_assistant.gemini_diagnose import diagnose_with_gemini
+
+        answer = {'query_type': 'disease', 'urgency': {'level': 'call_vet_now', 'explanation': 'FMD signs'}}
+        with override_settings(AI_DIAGNOSIS_CACHE_SIMILARITY=0.8), \
+                mock.patch('apps.ai_assistant.gemini_diagnose.use_mock_gemini', return_value=False), \
+                mock.patch('apps.ai_assistant.gemini_diagnose.generate_content',
+                           return_value=SimpleNamespace(text=json.dumps(answer))) as model:
+            first = diagnose_with_gemini('Cow', 'livestock', 'cow not eating, fever, mouth sores', 'en')
+            first['urgency']['level'] = 'changed by the caller'
+            again = diagnose_with_gemini('Cow', 'livestock', 'Fever, mouth sores; cow not eating', 'en')
+            near = diagnose_with_gemini('Cow', 'livestock', 'cow not eating fever mouth sore', 'en')
+
+            model.side_effect = RuntimeError('quota')
+            with self.assertLogs('apps.ai_assistant.gemini_diagnose', 'ERROR'):
+                diagnose_with_gemini('Goat', 'livestock', 'goat coughing', 'en')
+                diagnose_with_gemini('Goat', 'livestock', 'goat coughing', 'en')
+
+        self.assertEqual(model.call_count, 3)
+        self.assertEqual(again, answer)
+        self.assertEqual(near, answer)
+        self.assertEqual(get_diagnosis_cache_stats(), {'hit': 1, 'near_hit': 1, 'miss': 3, 'hit_ratio': 0.4})
+
+
+class SingleFlightTests(APITestCase):
+    """
+    Tests for sharing one model call between identical requests in flight.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.ai_assistant.diagnosis_cache import get_diagnosis_cache
+
+        cache.clear()
+        get_diagnosis_cache().clear()
+
+    def run_together(self, fn, count=5):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(count) as pool:
+            return [future.result() for future in [pool.submit(fn) for _ in range(count)]]
+
+    def test_identical_calls_in_flight_share_the_first_callers_result(self):
+        import itertools
+        import time
+        from apps.ai_assistant.single_flight import single_flight
+
+        calls = itertools.count(1)
+
+        def model():
+            time.sleep(0.2)
+            return {'call': next(calls)}
+
+        results = self.run_together(lambda: single_flight('same-request', model))
+
+        self.assertEqual(results, [{'call': 1}] * 5)
+        self.assertEqual(single_flight('same-request', model), {'call': 1})
+        self.assertEqual(single_flight('other-request', model), {'call': 2})
+
+    def test_waiters_fall_back_to_their_own_call_after_a_failure_or_their_wait(self):
+        import itertools
+        import time
+        from apps.ai_assistant.single_flight import single_flight
+
+        calls = itertools.count(1)
+
+        def failing_then_ok():
+            call = next(calls)
+            time.sleep(0.1)
+            if call == 1:
+                raise RuntimeError('quota')
+            return call
+
+        def attempt():
+            try:
+                return single_flight('failing', failing_then_ok)
+            except RuntimeError as e:
+                return str(e)
+
+        # The failed leader publishes nothing: one waiter leads again, the other shares its result
+        self.assertEqual(sorted(self.run_together(attempt, count=3), key=str), [2, 2, 'quota'])
+
+        slow = itertools.count(1)
+        with self.settings(AI_SINGLE_FLIGHT_WAIT=0.05), self.assertLogs('apps.ai_assistant.single_flight', 'WARNING'):
+            results = self.run_together(lambda: single_flight('slow', lambda: (time.sleep(0.3), next(slow))[1]), count=3)
+        self.assertEqual(sorted(results), [1, 2, 3])
+
+    def test_async_calls_share_one_model_call_without_blocking_the_loop(self):
+        import asyncio
+        from asgiref.sync import async_to_sync
+        from apps.ai_assistant.single_flight import asingle_flight
+
+        calls = []
+
+        async def model():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return 'polished'
+
+        async def together():
+            return await asyncio.gather(*[asingle_flight('polish-request', model) for _ in range(5)])
+
+        self.assertEqual(async_to_sync(together)(), ['polished'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_diagnoses_and_polishes_make_one_model_call_each(self):
+        import json
+        import time
+        from types import SimpleNamespace
+        from unittest import mock
+        from apps.ai_assistant.gemini import polish_text
+        from apps.ai_assistant.gemini_diagnose import diagnose_with_gemini
+
+        answer = {'query_type': 'disease', 'urgency': {'level': 'call_vet_now', 'explanation': 'FMD signs'}}
+
+        def slow(text):
+            return lambda *args: (time.sleep(0.2), SimpleNamespace(text=text))[1]
+
+        with mock.patch('apps.ai_assistant.gemini_diagnose.use_mock_gemini', return_value=False), \
+                mock.patch('apps.ai_assistant.gemini.use_mock_gemini', return_value=False), \
+                mock.patch('apps.ai_assistant.gemini_diagnose.generate_content',
+                           side_effect=slow(json.dumps(answer))) as diagnose_model, \
+                mock.patch('apps.ai_assistant.gemini.generate_content', side_effect=slow(' I would love to adopt. ')) as polish_model:
+            diagnoses = self.run_together(lambda: diagnose_with_gemini('Cow', 'livestock', 'cow fever, mouth sores', 'en'))
+            polished = self.run_together(lambda: polish_text('i  would love to adopt', 'en'))
+
+        self.assertEqual(diagnoses, [answer] * 5)
+        self.assertEqual(polished, ['I would love to adopt.'] * 5)
+        self.assertEqual(diagnose_model.call_count, 1)
+        self.assertEqual(polish_model.call_count, 1)
+
+
+class StandInGeminiHandler:
+    """Builds a stand-in Gemini API: answers generateContent with `statuses` in turn, then 200."""
+
+    @staticmethod
+    def serve(statuses=(), delay=0.0, stream_chunks=()):
+        import json
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        state = {'statuses': list(statuses), 'requests': 0, 'connections': set()}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                state['requests'] += 1
+                state['connections'].add(self.client_address)
+                time.sleep(delay)
+                code = state['statuses'].pop(0) if state['statuses'] else 200
+                if code == 200 and 'streamGenerateContent' in self.path:
+                    return self.stream()
+                if code == 200:
+                    body = {'candidates': [{'content': {'role': 'model', 'parts': [{'text': '{"ok": true}'}]}}]}
+                else:
+                    body = {'error': {'code': code, 'message': 'stand-in error', 'status': 'UNAVAILABLE'}}
+                payload = json.dumps(body).encode()
+                try:
+                    self.send_response(code)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client gave up (deadline tests)
+
+            def stream(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                for text in stream_chunks:
+                    chunk = {'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}}]}
+                    self.wfile.write(f'data: {json.dumps(chunk)}\r\n\r\n'.encode())
+                    self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, state
+
+
+class GeminiClientTests(APITestCase):
+    """
+    Tests for the pooled Gemini client, its deadlines and the shared retry policy.
+    """
+
+    def serve(self, statuses=(), delay=0.0, stream_chunks=(), **settings):
+        from django.test import override_settings
+
+        server, state = StandInGeminiHandler.serve(statuses, delay, stream_chunks)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        settings_override = override_settings(
+            GEMINI_API_KEY='stand-in-key', GEMINI_BASE_URL=f'http://127.0.0.1:{server.server_port}', **settings
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return state
+
+    def test_calls_share_one_client_and_connection(self):
+        from apps.ai_assistant.gemini_client import generate_content, get_gemini_client
+
+        state = self.serve()
+        client = get_gemini_client()
+        for _ in range(3):
+            self.assertEqual(generate_content('hello').text, '{"ok": true}')
+        self.assertIs(get_gemini_client(), client)
+        self.assertEqual((state['requests'], len(state['connections'])), (3, 1))
+
+    def test_transient_errors_are_retried(self):
+        from unittest import mock
+        from apps.ai_assistant.gemini_client import RetryPolicy, generate_content
+
+        state = self.serve(statuses=[503, 429])
+        with mock.patch.object(RetryPolicy, 'backoff', return_value=0), \
+                self.assertLogs('apps.ai_assistant.gemini_client', 'WARNING'):
+            self.assertEqual(generate_content('hello').text, '{"ok": true}')
+        self.assertEqual(state['requests'], 3)
+
+    def test_permanent_errors_are_not_retried(self):
+        from google.genai.errors import APIError
+        from apps.ai_assistant.gemini_client import generate_content
+
+        state = self.serve(statuses=[400])
+        with self.assertRaises(APIError):
+            generate_content('hello')
+        self.assertEqual(state['requests'], 1)
+
+    def test_read_deadline_bounds_a_stalled_call(self):
+        import time
+        import httpx
+        from apps.ai_assistant.gemini_client import generate_content
+
+        self.serve(delay=1.0, GEMINI_READ_TIMEOUT=0.2, GEMINI_MAX_ATTEMPTS=1)
+        start = time.monotonic()
+        with self.assertRaises(httpx.ReadTimeout):
+            generate_content('hello')
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_call_deadline_caps_every_attempt(self):
+        import time
+        import httpx
+        from apps.ai_assistant.gemini_client import generate_content
+
+        self.serve(delay=1.0, GEMINI_MAX_ATTEMPTS=1)
+        start = time.monotonic()
+        with self.assertRaises(httpx.TimeoutException):
+            generate_content('hello', deadline=0.3)
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_async_calls_share_the_loop_client_and_retry(self):
+        import asyncio
+        from unittest import mock
+        from asgiref.sync import async_to_sync
+        from apps.ai_assistant.gemini_client import RetryPolicy, agenerate_content, get_async_gemini_client
+
+        state = self.serve(statuses=[503], delay=0.2)
+
+        async def calls():
+            client = get_async_gemini_client()
+            responses = await asyncio.gather(*[agenerate_content('hello') for _ in range(4)])
+            return responses, get_async_gemini_client() is client
+
+        with mock.patch.object(RetryPolicy, 'backoff', return_value=0), \
+                self.assertLogs('apps.ai_assistant.gemini_client', 'WARNING'):
+            responses, same_client = async_to_sync(calls)()
+        self.assertEqual([r.text for r in responses], ['{"ok": true}'] * 4)
+        self.assertTrue(same_client)
+        self.assertEqual(state['requests'], 5)
+
+    def test_chat_reply_streams_from_json_mode_chunks(self):
+        from unittest import mock
+        from apps.ai_assistant.gemini import stream_gemini
+        from apps.ai_assistant.gemini_client import RetryPolicy
+
+        self.serve(statuses=[503], stream_chunks=['{"reply": "Keep her ', 'warm\\n", "session_', 'complete": false}'])
+        with mock.patch('apps.ai_assistant.gemini.use_mock_gemini', return_value=False), \
+                mock.patch.object(RetryPolicy, 'backoff', return_value=0), \
+                self.assertLogs('apps.ai_assistant.gemini_client', 'WARNING'):
+            events = list(stream_gemini([{'role': 'user', 'content': 'sneezing'}], preferred_language='en'))
+
+        self.assertEqual(events, [
+            ('reply', 'Keep her '), ('reply', 'warm\n'),
+            ('result', {'reply': 'Keep her warm\n', 'session_complete': False}),
+        ])
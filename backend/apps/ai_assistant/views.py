@@ -5,6 +5,10 @@ API views for the one-shot AI diagnostic endpoint, session management,
 text polishing, and provider suggestion generation.
 """
 
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.db.models import Q
 from django.conf import settings
@@ -12,9 +16,14 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
+from rest_framework.settings import api_settings
 
-from common.utils import get_local_providers
+from common.async_views import AsyncViewMixin
+from common.fieldsets import SparseFieldsetsViewMixin
+from common.utils import get_local_providers, get_nearest_providers
 from apps.animals.models import AnimalType
+from apps.locations.matching import resolve_location_ids
+from apps.locations.geocoder import reverse_geocode
 from apps.providers.models import ServiceProvider
 from apps.resources.models import Resource
 from apps.resources.serializers import ResourceSerializer
@@ -25,21 +34,89 @@ from apps.ai_assistant.serializers import (
     AIProviderSuggestionSerializer,
     AIChatSerializer,
 )
-from apps.ai_assistant.gemini_diagnose import diagnose_with_gemini
+from apps.ai_assistant.gemini_diagnose import adiagnose_with_gemini
+from apps.ai_assistant.streaming import EventStreamRenderer, sse_event
 from apps.providers.serializers import ServiceProviderSerializer
 
+logger = logging.getLogger(__name__)
+
 
 class MockUser:
     """Lightweight object carrying location attributes for provider matching."""
-    def __init__(self, division=None, district=None, upazila=None, union=None,
+    def __init__(self, division_id=None, district_id=None, upazila_id=None,
                  latitude=None, longitude=None):
-        self.division = division
-        self.district = district
-        self.upazila = upazila
-        self.union = union
+        self.division_id = division_id
+        self.district_id = district_id
+        self.upazila_id = upazila_id
         self.latitude = latitude
         self.longitude = longitude
 
+    @property
+    def has_location(self):
+        return bool(self.division_id or self.district_id or self.upazila_id or self.latitude)
+
+
+def _request_location(request, data):
+    """
+    MockUser for the location a request should be matched against.
+
+    Region: IDs sent by the client, else names sent by the client (legacy,
+    resolved to IDs in either language), else the user's profile.
+    Coordinates: sent by the client, else the profile's when the client sent
+    no region either. A request left with coordinates but no region (e.g.
+    anonymous) is placed by the offline reverse geocoder.
+    """
+    region = [data.get('user_division_id'), data.get('user_district_id'), data.get('user_upazila_id')]
+    latitude = data.get('user_latitude')
+    longitude = data.get('user_longitude')
+    client_region = any(region)
+
+    if not client_region and (data.get('user_division') or data.get('user_district')):
+        region = list(resolve_location_ids(data.get('user_division', ''), data.get('user_district', '')))
+        client_region = True
+
+    user = request.user
+    if user.is_authenticated:
+        if not client_region:
+            region = [user.division_id, user.district_id, user.upazila_id]
+            if not latitude:
+                latitude, longitude = user.latitude, user.longitude
+
+    if not any(region):
+        place = reverse_geocode(latitude, longitude)
+        if place:
+            region = [place.division_id, place.district_id, place.upazila_id]
+
+    return MockUser(*region, latitude=latitude, longitude=longitude)
+
+
+SCORING_POOL_SIZE = 15  # Providers considered by _score_and_rank_providers
+
+
+def _candidate_providers(location_user, provider_type, animal_type_id):
+    """
+    Provider candidates for scoring: the nearest SCORING_POOL_SIZE providers
+    when coordinates are known (adaptive radius), else the region cascade.
+    """
+    try:
+        lat = float(location_user.latitude)
+        lng = float(location_user.longitude)
+    except (AttributeError, TypeError, ValueError):
+        lat = lng = None
+
+    if lat is not None and lng is not None:
+        providers_qs, _, _ = get_nearest_providers(
+            lat, lng, SCORING_POOL_SIZE,
+            provider_type=provider_type,
+            animal_type_id=animal_type_id,
+        )
+        return providers_qs
+    return get_local_providers(
+        user=location_user,
+        provider_type=provider_type,
+        animal_type_id=animal_type_id
+    )
+
 
 def _score_and_rank_providers(providers_qs, max_count=5):
     """
@@ -47,7 +124,7 @@ def _score_and_rank_providers(providers_qs, max_count=5):
     Returns list of dicts with provider data, rank, score, and bilingual reason.
     """
     scored = []
-    for provider in providers_qs[:15]:
+    for provider in providers_qs[:SCORING_POOL_SIZE]:
         normalized_reviews = min(float(provider.total_reviews) / 50.0, 1.0)
         score = (
             float(provider.avg_rating) * 0.6 +
@@ -106,9 +183,10 @@ def _match_resources(animal_type, keywords, limit=6):
     return qs[:limit]
 
 
-def _get_govt_vets(animal_type, division=None, district=None, latitude=None, longitude=None):
+def _get_govt_vets(animal_type, division_id=None, district_id=None, latitude=None, longitude=None):
     """
-    Get government veterinary officers near the user's location.
+    Get government veterinary officers near the user's location
+    (district, then division, by ID).
     """
     qs = ServiceProvider.objects.filter(
         is_government_vet=True,
@@ -121,57 +199,50 @@ def _get_govt_vets(animal_type, division=None, district=None, latitude=None, lon
             Q(animal_types__isnull=True)
         ).distinct()
 
-    if district:
-        local = qs.filter(district__iexact=district)
+    if district_id:
+        local = qs.filter(district_id=district_id)
         if local.exists():
             return local[:3]
 
-    if division:
-        regional = qs.filter(division__iexact=division)
+    if division_id:
+        regional = qs.filter(division_id=division_id)
         if regional.exists():
             return regional[:3]
 
     return qs[:3]
 
 
-class AIDiagnoseView(APIView):
+class AIDiagnoseView(AsyncViewMixin, APIView):
     """
     POST /api/v1/ai/diagnose/
 
     One-shot AI diagnostic endpoint. Accepts animal type, problem description,
     and optional location. Returns structured diagnosis with matched providers
     and resources.
+
+    Async: the worker serves other requests while the model call is awaited.
     """
     permission_classes = [permissions.AllowAny]
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = AIDiagnoseInputSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         animal_type_id = serializer.validated_data['animal_type_id']
         problem_description = serializer.validated_data['problem_description']
         preferred_language = serializer.validated_data.get('preferred_language', 'bn')
-        user_division = serializer.validated_data.get('user_division', '')
-        user_district = serializer.validated_data.get('user_district', '')
-        user_latitude = serializer.validated_data.get('user_latitude')
-        user_longitude = serializer.validated_data.get('user_longitude')
 
         # 1. Validate animal type
         try:
-            animal_type = AnimalType.objects.get(id=animal_type_id)
+            animal_type = await AnimalType.objects.aget(id=animal_type_id)
         except AnimalType.DoesNotExist:
             raise ValidationError({"animal_type_id": "Specified animal type does not exist."})
 
-        # 2. Resolve location from user profile or request
-        if request.user.is_authenticated and not user_division:
-            user_division = request.user.division or ''
-            user_district = request.user.district or ''
-            if not user_latitude:
-                user_latitude = getattr(request.user, 'latitude', None)
-                user_longitude = getattr(request.user, 'longitude', None)
+        # 2. Resolve location from request or user profile
+        location_user = await sync_to_async(_request_location)(request, serializer.validated_data)
 
         # 3. Call Gemini
-        ai_result = diagnose_with_gemini(
+        ai_result = await adiagnose_with_gemini(
             animal_type_name=animal_type.name_en,
             animal_category=animal_type.category,
             problem_description=problem_description,
@@ -179,7 +250,7 @@ class AIDiagnoseView(APIView):
         )
 
         # 4. Save to AISession
-        session = AISession.objects.create(
+        session = await AISession.objects.acreate(
             user=request.user if request.user.is_authenticated else None,
             animal_type=animal_type,
             conversation_history=[
@@ -198,31 +269,21 @@ class AIDiagnoseView(APIView):
             if diagnosis_data:
                 session.ai_diagnosis_summary = diagnosis_data.get('possible_problems', '')
                 session.ai_care_advice = diagnosis_data.get('what_owner_can_do', '')
-            session.save()
+            await session.asave()
+
+        response_data = await sync_to_async(self._recommendations)(
+            request, session, animal_type, location_user, ai_result, query_type
+        )
+        return Response(response_data, status=status.HTTP_200_OK)
 
+    def _recommendations(self, request, session, animal_type, location_user, ai_result, query_type):
+        """Providers, resources and govt vets for a diagnosis, as the response body."""
         # 5. Match providers
         recommended_type = ai_result.get('recommended_provider_type', 'vet')
         providers_data = []
 
-        location_user = MockUser(
-            division=user_division,
-            district=user_district,
-            latitude=user_latitude,
-            longitude=user_longitude,
-        )
-
-        if request.user.is_authenticated:
-            providers_qs = get_local_providers(
-                user=request.user,
-                provider_type=recommended_type,
-                animal_type_id=animal_type.id
-            )
-        elif user_division or user_district or user_latitude:
-            providers_qs = get_local_providers(
-                user=location_user,
-                provider_type=recommended_type,
-                animal_type_id=animal_type.id
-            )
+        if location_user.has_location:
+            providers_qs = _candidate_providers(location_user, recommended_type, animal_type.id)
         else:
             providers_qs = ServiceProvider.objects.filter(
                 is_verified=True,
@@ -272,10 +333,10 @@ class AIDiagnoseView(APIView):
         if suggest_livestock_officer:
             govt_vets = _get_govt_vets(
                 animal_type,
-                division=user_division,
-                district=user_district,
-                latitude=user_latitude,
-                longitude=user_longitude,
+                division_id=location_user.division_id,
+                district_id=location_user.district_id,
+                latitude=location_user.latitude,
+                longitude=location_user.longitude,
             )
             govt_vets_serialized = ServiceProviderSerializer(
                 govt_vets, many=True, context={'request': request}
@@ -297,33 +358,105 @@ class AIDiagnoseView(APIView):
                 'category': animal_type.category,
             }
         }
-
-        return Response(response_data, status=status.HTTP_200_OK)
+        return response_data
 
 
-class AIChatView(APIView):
+class AIChatView(AsyncViewMixin, APIView):
     """
     POST /api/v1/ai/chat/
 
     Multi-turn diagnostic chat session. Enforces IsAuthenticated.
     Retrieves database guidelines (RAG) based on user symptom keywords.
     Completes session dynamically, matching local service providers.
+
+    With `stream: true` (or Accept: text/event-stream) the turn is sent as
+    Server-Sent Events instead of one JSON body:
+
+        session    {"session_id"}                    before the model is called
+        reply      {"delta"}                         reply text as it is generated
+        result     the structured model response     (session_complete, urgency_level, ...)
+        providers / resources / govt_vets            as each is matched, completed sessions only
+        done       the non-streaming response body
+        error      {"detail"}                        if the turn failed midway
+
+    Both modes persist the same conversation history and results. Async:
+    the model call (or stream) is awaited, the database work around it runs
+    in a thread.
     """
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, EventStreamRenderer]
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = AIChatSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        session, animal_type, guideline_context = await sync_to_async(self._start_turn)(request, data)
+        model_kwargs = {
+            'conversation_history': session.conversation_history,
+            'preferred_language': data.get('preferred_language', 'bn'),
+            'animal_type_name': animal_type.name_en,
+            'guideline_context': guideline_context if guideline_context else None,
+            'total_turns': session.total_turns,
+        }
 
-        session_id = serializer.validated_data.get('session_id')
-        message = serializer.validated_data['message']
-        animal_type_id = serializer.validated_data.get('animal_type_id')
-        preferred_language = serializer.validated_data.get('preferred_language', 'bn')
-        
-        user_division = serializer.validated_data.get('user_division', '')
-        user_district = serializer.validated_data.get('user_district', '')
-        user_latitude = serializer.validated_data.get('user_latitude')
-        user_longitude = serializer.validated_data.get('user_longitude')
+        if data.get('stream') or 'text/event-stream' in request.META.get('HTTP_ACCEPT', ''):
+            response = StreamingHttpResponse(
+                self._stream_turn(request, data, session, animal_type, model_kwargs),
+                content_type='text/event-stream',
+            )
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'  # Don't let a proxy buffer the events
+            return response
+
+        # 4. Call Gemini conversational API
+        from apps.ai_assistant.gemini import acall_gemini
+        result_dict = await acall_gemini(**model_kwargs)
+        await sync_to_async(self._save_reply)(session, result_dict)
+
+        matches = {}
+        if result_dict.get('session_complete', False):
+            matches = await sync_to_async(
+                lambda: dict(self._complete_session(request, data, session, animal_type, result_dict))
+            )()
+
+        response_data = await sync_to_async(self._response_data)(request, session, animal_type, result_dict, matches)
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    async def _stream_turn(self, request, data, session, animal_type, model_kwargs):
+        from apps.ai_assistant.gemini import astream_gemini
+
+        yield sse_event('session', {'session_id': session.id})
+        try:
+            result_dict = {}
+            async for kind, value in astream_gemini(**model_kwargs):
+                if kind == 'reply':
+                    yield sse_event('reply', {'delta': value})
+                else:
+                    result_dict = value
+            await sync_to_async(self._save_reply)(session, result_dict)
+            yield sse_event('result', result_dict)
+
+            matches = {}
+            if result_dict.get('session_complete', False):
+                steps = self._complete_session(request, data, session, animal_type, result_dict)
+                while (step := await sync_to_async(next)(steps, None)) is not None:
+                    name, matched = step
+                    matches[name] = matched
+                    yield sse_event(name, matched)
+
+            response_data = await sync_to_async(self._response_data)(request, session, animal_type, result_dict, matches)
+            yield sse_event('done', response_data)
+        except Exception:
+            logger.exception('AI chat stream failed for session %s', session.id)
+            yield sse_event('error', {'detail': 'Something went wrong. Please try again.'})
+
+    def _start_turn(self, request, data):
+        """Session, animal type and guideline context of a turn, with the user's message appended."""
+        session_id = data.get('session_id')
+        message = data['message']
+        animal_type_id = data.get('animal_type_id')
+        preferred_language = data.get('preferred_language', 'bn')
 
         # 1. Retrieve or create session
         if session_id:
@@ -371,126 +504,105 @@ class AIChatView(APIView):
         # 3. Update history with user's message
         session.conversation_history.append({"role": "user", "content": message})
         session.total_turns += 1
+        return session, animal_type, guideline_context
 
-        # 4. Call Gemini conversational API
-        from apps.ai_assistant.gemini import call_gemini
-        result_dict = call_gemini(
-            conversation_history=session.conversation_history,
-            preferred_language=preferred_language,
-            animal_type_name=animal_type.name_en,
-            guideline_context=guideline_context if guideline_context else None,
-            total_turns=session.total_turns
-        )
-
-        reply = result_dict.get('reply', '')
-        session_complete = result_dict.get('session_complete', False)
-
+    def _save_reply(self, session, result_dict):
         # Append assistant message
         # If complete, serialize the raw dict as content so history has diagnosis info
-        content_to_save = str(result_dict) if session_complete else reply
+        session_complete = result_dict.get('session_complete', False)
+        content_to_save = str(result_dict) if session_complete else result_dict.get('reply', '')
         session.conversation_history.append({"role": "assistant", "content": content_to_save})
         session.save()
 
-        # 5. Handle Session Completion (calculate recommendations)
-        providers_serialized = []
-        resources_serialized = []
-        govt_vets_serialized = []
-        query_type = 'disease'
+    def _complete_session(self, request, data, session, animal_type, result_dict):
+        """
+        Save a completed session's results and match recommendations,
+        yielding ('providers' | 'resources' | 'govt_vets', data) as each is ready.
+        """
+        session.ended_at = timezone.now()
+        
+        # Save extracted results
+        urgency_level = result_dict.get('urgency_level', 'monitor_at_home')
+        session.urgency_level = urgency_level
+        
+        diagnosis_summary = result_dict.get('diagnosis_summary', '')
+        care_advice = result_dict.get('care_advice', '')
+        session.ai_diagnosis_summary = diagnosis_summary
+        session.ai_care_advice = care_advice
+        session.save()
 
-        if session_complete:
-            session.ended_at = timezone.now()
-            
-            # Save extracted results
-            urgency_level = result_dict.get('urgency_level', 'monitor_at_home')
-            session.urgency_level = urgency_level
-            
-            diagnosis_summary = result_dict.get('diagnosis_summary', '')
-            care_advice = result_dict.get('care_advice', '')
-            session.ai_diagnosis_summary = diagnosis_summary
-            session.ai_care_advice = care_advice
-            session.save()
-
-            # Match providers based on Gemini's recommendation
-            recommended_type = result_dict.get('recommended_provider_type', 'vet')
-            
-            # Resolve locations
-            loc_div = user_division or request.user.division or ''
-            loc_dist = user_district or request.user.district or ''
-            loc_lat = user_latitude or getattr(request.user, 'latitude', None)
-            loc_lng = user_longitude or getattr(request.user, 'longitude', None)
-
-            location_user = MockUser(
-                division=loc_div,
-                district=loc_dist,
-                latitude=loc_lat,
-                longitude=loc_lng,
-            )
+        # Match providers based on Gemini's recommendation
+        recommended_type = result_dict.get('recommended_provider_type', 'vet')
+        
+        # Resolve location from request or user profile
+        location_user = _request_location(request, data)
 
-            providers_qs = get_local_providers(
-                user=location_user,
-                provider_type=recommended_type,
-                animal_type_id=animal_type.id
-            )
+        providers_qs = _candidate_providers(location_user, recommended_type, animal_type.id)
 
-            ranked_providers = _score_and_rank_providers(providers_qs, max_count=2)
-
-            # Save suggestions to DB and serialize
-            for item in ranked_providers:
-                AIProviderSuggestion.objects.update_or_create(
-                    session=session,
-                    provider=item['provider'],
-                    defaults={
-                        'rank': item['rank'],
-                        'score': item['score'],
-                        'reason_en': item['reason_en'],
-                        'reason_bn': item['reason_bn'],
-                    }
-                )
-
-            for item in ranked_providers:
-                provider_data = ServiceProviderSerializer(
-                    item['provider'], context={'request': request}
-                ).data
-                providers_serialized.append({
+        ranked_providers = _score_and_rank_providers(providers_qs, max_count=2)
+
+        # Save suggestions to DB and serialize
+        for item in ranked_providers:
+            AIProviderSuggestion.objects.update_or_create(
+                session=session,
+                provider=item['provider'],
+                defaults={
                     'rank': item['rank'],
                     'score': item['score'],
                     'reason_en': item['reason_en'],
                     'reason_bn': item['reason_bn'],
-                    'provider_details': provider_data,
-                })
-
-            # Match resources
-            resource_keywords = result_dict.get('resource_keywords', [])
-            matched_res = _match_resources(animal_type, resource_keywords, limit=2)
-            resources_serialized = ResourceSerializer(
-                matched_res, many=True, context={'request': request}
+                }
+            )
+
+        providers_serialized = []
+        for item in ranked_providers:
+            provider_data = ServiceProviderSerializer(
+                item['provider'], context={'request': request}
             ).data
+            providers_serialized.append({
+                'rank': item['rank'],
+                'score': item['score'],
+                'reason_en': item['reason_en'],
+                'reason_bn': item['reason_bn'],
+                'provider_details': provider_data,
+            })
+        yield 'providers', providers_serialized
 
-            # Match govt vets if needed
-            suggest_livestock_officer = result_dict.get('suggest_livestock_officer', False)
-            if suggest_livestock_officer:
-                govt_vets = _get_govt_vets(
-                    animal_type,
-                    division=loc_div,
-                    district=loc_dist,
-                    latitude=loc_lat,
-                    longitude=loc_lng,
-                )
-                govt_vets_serialized = ServiceProviderSerializer(
-                    govt_vets, many=True, context={'request': request}
-                ).data
+        # Match resources
+        resource_keywords = result_dict.get('resource_keywords', [])
+        matched_res = _match_resources(animal_type, resource_keywords, limit=2)
+        yield 'resources', ResourceSerializer(
+            matched_res, many=True, context={'request': request}
+        ).data
 
+        # Match govt vets if needed
+        govt_vets_serialized = []
+        suggest_livestock_officer = result_dict.get('suggest_livestock_officer', False)
+        if suggest_livestock_officer:
+            govt_vets = _get_govt_vets(
+                animal_type,
+                division_id=location_user.division_id,
+                district_id=location_user.district_id,
+                latitude=location_user.latitude,
+                longitude=location_user.longitude,
+            )
+            govt_vets_serialized = ServiceProviderSerializer(
+                govt_vets, many=True, context={'request': request}
+            ).data
+        yield 'govt_vets', govt_vets_serialized
+
+    def _response_data(self, request, session, animal_type, result_dict, matches):
         # 6. Build response
         session_serialized = AISessionSerializer(session, context={'request': request}).data
         
         # Overwrite diagnostic_result for immediate feedback on this completion turn
-        if session_complete:
+        if result_dict.get('session_complete', False):
             session_serialized['diagnostic_result'] = {
                 'ai_response': result_dict,
-                'query_type': query_type,
-                'providers': providers_serialized,
-                'resources': resources_serialized,
-                'govt_vets': govt_vets_serialized,
+                'query_type': 'disease',
+                'providers': matches.get('providers', []),
+                'resources': matches.get('resources', []),
+                'govt_vets': matches.get('govt_vets', []),
                 'animal_type': {
                     'id': animal_type.id,
                     'name_en': animal_type.name_en,
@@ -500,15 +612,13 @@ class AIChatView(APIView):
                 }
             }
 
-        response_data = {
-            'reply': reply,
+        return {
+            'reply': result_dict.get('reply', ''),
             'session': session_serialized,
         }
 
-        return Response(response_data, status=status.HTTP_200_OK)
-
 
-class AISessionListView(generics.ListAPIView):
+class AISessionListView(SparseFieldsetsViewMixin, generics.ListAPIView):
     """
     GET endpoint to retrieve a user's historical sessions.
     """
@@ -519,7 +629,7 @@ class AISessionListView(generics.ListAPIView):
         return AISession.objects.filter(user=self.request.user).order_by('-started_at')
 
 
-class AISessionDetailView(generics.RetrieveAPIView):
+class AISessionDetailView(SparseFieldsetsViewMixin, generics.RetrieveAPIView):
     """
     GET endpoint to retrieve historical session details.
     """
@@ -537,21 +647,21 @@ class AISessionDetailView(generics.RetrieveAPIView):
         return obj
 
 
-class AIPolishView(APIView):
+class AIPolishView(AsyncViewMixin, APIView):
     """
     POST endpoint to refine and polish user text using AI.
-    Used for rehoming application text polishing.
+    Used for rehoming application text polishing. Async, like AIDiagnoseView.
     """
     permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         text = request.data.get('text')
         language = request.data.get('language', 'bn')
 
         if not text:
             raise ValidationError({"text": "Required to polish."})
 
-        from apps.ai_assistant.gemini import polish_text
-        polished_text = polish_text(text, language)
+        from apps.ai_assistant.gemini import apolish_text
+        polished_text = await apolish_text(text, language)
 
         return Response({"polished_text": polished_text}, status=status.HTTP_200_OK)
@@ -6,11 +6,12 @@ Utilizes BilingualMixin to resolve dynamically translated fields.
 """
 
 from rest_framework import serializers
+from common.fieldsets import SparseFieldsetsMixin
 from common.mixins import BilingualMixin
 from apps.animals.models import AnimalType
 
 
-class AnimalTypeSerializer(BilingualMixin, serializers.ModelSerializer):
+class AnimalTypeSerializer(SparseFieldsetsMixin, BilingualMixin, serializers.ModelSerializer):
     """
     Serializer for the core AnimalType model.
     Dynamically maps the bilingual 'name' field based on request context.
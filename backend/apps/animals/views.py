@@ -8,6 +8,7 @@ Provides public read access and limits creation/modification to admin users.
 from rest_framework import viewsets, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
 
+from common.fieldsets import SparseFieldsetsViewMixin
 from common.permissions import IsAdminUser
 from apps.animals.models import AnimalType
 from apps.animals.serializers import AnimalTypeSerializer
@@ -18,7 +19,7 @@ from django.views.decorators.cache import cache_page
 
 @method_decorator(cache_page(None), name='list')
 @method_decorator(cache_page(None), name='retrieve')
-class AnimalTypeViewSet(viewsets.ModelViewSet):
+class AnimalTypeViewSet(SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for AnimalType.
     Allows public lists and details, but restricts modification to Admin users.
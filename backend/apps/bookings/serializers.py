@@ -6,11 +6,12 @@ Validates that services and pets are correctly associated.
 """
 
 from rest_framework import serializers
+from common.fieldsets import SparseFieldsetsMixin
 from apps.bookings.models import Booking
 from apps.providers.serializers import ServiceProviderSerializer, ProviderServiceSerializer
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer for the Booking model.
     Includes rich nested details for reads while using primary keys for writes.
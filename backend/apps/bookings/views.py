@@ -9,12 +9,13 @@ while providers can confirm, complete, and cancel.
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
+from common.fieldsets import SparseFieldsetsViewMixin
 
 from apps.bookings.models import Booking
 from apps.bookings.serializers import BookingSerializer
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for booking management.
     Listings are scoped to the active authenticated user role.
@@ -25,6 +26,10 @@ class BookingViewSet(viewsets.ModelViewSet):
     filterset_fields = ['status', 'booking_date', 'provider']
     ordering_fields = ['booking_date', 'created_at']
     ordering = ['-booking_date', '-created_at']
+    sparse_prefetches = {
+        'provider_details.services': ['provider__services'],
+        'provider_details.supported_animal_types': ['provider__animal_types__animal_type'],
+    }
 
     def get_queryset(self):
         user = self.request.user
@@ -19,14 +19,14 @@ class DistrictInline(admin.TabularInline):
 class UpazilaInline(admin.TabularInline):
     model = Upazila
     extra = 0
-    fields = ('name_en', 'name_bn')
+    fields = ('name_en', 'name_bn', 'lat', 'lng')
     show_change_link = True
 
 
 class UnionInline(admin.TabularInline):
     model = Union
     extra = 0
-    fields = ('name_en', 'name_bn')
+    fields = ('name_en', 'name_bn', 'lat', 'lng')
 
 
 @admin.register(Division)
@@ -55,10 +55,11 @@ class DistrictAdmin(admin.ModelAdmin):
 
 @admin.register(Upazila)
 class UpazilaAdmin(admin.ModelAdmin):
-    list_display = ('name_en', 'name_bn', 'district', 'get_division')
+    list_display = ('name_en', 'name_bn', 'district', 'get_division', 'lat', 'lng')
     list_filter = ('district__division',)
     search_fields = ('name_en', 'name_bn')
     autocomplete_fields = ['district']
+    exclude = ('division',)  # Derived from the district on save
     inlines = [UnionInline]
 
     def get_division(self, obj):
@@ -69,10 +70,11 @@ class UpazilaAdmin(admin.ModelAdmin):
 
 @admin.register(Union)
 class UnionAdmin(admin.ModelAdmin):
-    list_display = ('name_en', 'name_bn', 'upazila', 'get_district')
+    list_display = ('name_en', 'name_bn', 'upazila', 'get_district', 'lat', 'lng')
     list_filter = ('upazila__district__division',)
     search_fields = ('name_en', 'name_bn')
     autocomplete_fields = ['upazila']
+    exclude = ('district', 'division')  # Derived from the upazila on save
 
     def get_district(self, obj):
         return obj.upazila.district
@@ -0,0 +1,161 @@
+"""
+PetCarePlus v2 — Location Ancestry
+
+Materialized Division → District → Upazila → Union ancestry, so hierarchy
+checks ("is this upazila in that division?") need no chained FK joins.
+
+- In the database, Upazila carries a denormalized `division` and Union a
+  `district` and `division`; a location's ancestors are columns of its own
+  row, filled on save and updated when a parent moves.
+- In process, `get_location_ancestry()` holds the district and upazila
+  levels as plain dicts (a few hundred rows in two queries), so any ID can
+  be expanded to its ancestors or descendants without a query.
+
+Location changes bump the shared version counter once per transaction, on
+commit; seed_bd_locations recreates every location inside
+`location_changes()`, which bumps it once on exit. Each worker compares its
+copy with the counter before answering and reloads when it moved.
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+from apps.locations.matching import LocationIds
+from apps.locations.models import District, Upazila
+from common.cache_versions import bump_cache_version, get_cache_version
+
+
+VERSION_CACHE_KEY = 'locations:dataset:version'
+CHANGE_CACHE_KEY = 'locations:dataset:change:{}'
+CHANGE_LOG_TTL = 60 * 60 * 24
+
+
+def get_location_version():
+    """Current version of the location dataset."""
+    return get_cache_version(VERSION_CACHE_KEY)
+
+
+def bump_location_version(changes=None):
+    """
+    Mark the location dataset as changed for every worker, logging the
+    (kind, id) pairs in `changes` under the new version. Without them,
+    readers of the log (see apps.search.suggest) start over.
+    """
+    version = bump_cache_version(VERSION_CACHE_KEY)
+    if changes is not None:
+        cache.set(CHANGE_CACHE_KEY.format(version), sorted(changes), CHANGE_LOG_TTL)
+    return version
+
+
+_deferred = threading.local()
+
+
+@contextmanager
+def location_changes():
+    """Bump the location version once, on exit, for every change made inside."""
+    depth = getattr(_deferred, 'depth', 0)
+    _deferred.depth = depth + 1
+    try:
+        yield
+    finally:
+        _deferred.depth = depth
+        if not depth:
+            bump_location_version()
+
+
+def location_changes_deferred():
+    """Whether this thread is inside `location_changes()`."""
+    return getattr(_deferred, 'depth', 0) > 0
+
+
+def _as_id(value):
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class LocationAncestry:
+    """
+    Parent and child maps of the district and upazila levels. Use
+    `get_location_ancestry()` for the process-wide, version-synchronised
+    instance.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self.load(district_rows=(), upazila_rows=())
+
+    def load(self, district_rows=None, upazila_rows=None):
+        """(Re)build from (id, division_id) and (id, district_id, division_id) rows."""
+        if district_rows is None:
+            district_rows = District.objects.values_list('pk', 'division_id')
+        if upazila_rows is None:
+            upazila_rows = Upazila.objects.values_list('pk', 'district_id', 'division_id')
+
+        district_division = {}
+        districts_of = defaultdict(set)
+        for district_id, division_id in district_rows:
+            district_division[district_id] = division_id
+            districts_of[division_id].add(district_id)
+
+        upazila_district = {}
+        upazilas_of_district = defaultdict(set)
+        upazilas_of_division = defaultdict(set)
+        for upazila_id, district_id, division_id in upazila_rows:
+            upazila_district[upazila_id] = district_id
+            upazilas_of_district[district_id].add(upazila_id)
+            upazilas_of_division[division_id or district_division.get(district_id)].add(upazila_id)
+
+        self._district_division = district_division
+        self._upazila_district = upazila_district
+        self._districts_of = {key: frozenset(ids) for key, ids in districts_of.items()}
+        self._upazilas_of_district = {key: frozenset(ids) for key, ids in upazilas_of_district.items()}
+        self._upazilas_of_division = {key: frozenset(ids) for key, ids in upazilas_of_division.items()}
+
+    def sync(self):
+        """Reload if the shared dataset version moved."""
+        current = get_location_version()
+        if current == self.version:
+            return
+        with self._lock:
+            if current != self.version:
+                self.load()
+                self.version = current
+
+    # ── Lookups ──────────────────────────────────────────────────
+
+    def ancestors(self, division_id=None, district_id=None, upazila_id=None):
+        """
+        LocationIds with the parents of the most specific level filled in.
+        Unknown IDs (and parents given explicitly) are kept as passed.
+        """
+        division_id, district_id, upazila_id = _as_id(division_id), _as_id(district_id), _as_id(upazila_id)
+        if upazila_id and not district_id:
+            district_id = self._upazila_district.get(upazila_id)
+        if district_id and not division_id:
+            division_id = self._district_division.get(district_id)
+        return LocationIds(division_id, district_id, upazila_id)
+
+    def district_ids(self, division_id):
+        """IDs of the districts in a division."""
+        return self._districts_of.get(_as_id(division_id), frozenset())
+
+    def upazila_ids(self, district_id=None, division_id=None):
+        """IDs of the upazilas in a district (or, without one, in a division)."""
+        if district_id:
+            return self._upazilas_of_district.get(_as_id(district_id), frozenset())
+        return self._upazilas_of_division.get(_as_id(division_id), frozenset())
+
+
+_ancestry = LocationAncestry()
+
+
+def get_location_ancestry():
+    """The process-wide ancestry maps, synchronised with the dataset version."""
+    _ancestry.sync()
+    return _ancestry
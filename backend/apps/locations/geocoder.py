@@ -0,0 +1,241 @@
+"""
+PetCarePlus v2 — Offline Reverse Geocoder
+
+Maps a coordinate to the nearest Union / Upazila / District centroid with no
+external service. Centroids come from the `lat`/`lng` columns of the
+location tables, so the precision is that of the most specific level
+carrying coordinates.
+
+The index is a compact binary file built by `build_reverse_geocoder`
+(build.sh and seed_bd_locations run it) and memory-mapped by every worker:
+
+    header   magic, format, byte order, dataset version, row count
+    float64  lat[n], lng[n]
+    uint32   cell[n] (sorted), union_id[n], upazila_id[n], district_id[n], division_id[n]
+    uint8    level[n]
+
+Rows are sorted by the common.geo grid cell, so a query binary-searches the
+cells of each grid ring around the point, outward, and stops once no
+unvisited ring can hold a closer centroid of the best level found (or any
+centroid of a more specific level). Workers pick up a rebuilt file by its
+mtime; without a file, geocoding returns None (logged once per worker).
+"""
+
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from array import array
+from collections import namedtuple
+
+from django.conf import settings
+
+from apps.locations.models import District, Upazila, Union
+from common.geo import GRID_CELL_DEGREES, GRID_COLUMNS, KM_PER_DEGREE, grid_cell, grid_col, grid_row, haversine_km
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b'PCRG'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sBB2xQI12x')  # 32 bytes, keeps the float64 columns aligned
+
+LEVEL_DISTRICT = 1
+LEVEL_UPAZILA = 2
+LEVEL_UNION = 3
+LEVEL_NAMES = {LEVEL_DISTRICT: 'district', LEVEL_UPAZILA: 'upazila', LEVEL_UNION: 'union'}
+
+# Farthest a point may lie from a centroid of each level and still match
+MAX_DISTANCE_KM = {LEVEL_DISTRICT: 50.0, LEVEL_UPAZILA: 15.0, LEVEL_UNION: 5.0}
+
+GeocodeResult = namedtuple(
+    'GeocodeResult', ['division_id', 'district_id', 'upazila_id', 'union_id', 'level', 'distance_km']
+)
+
+
+def get_geocoder_path():
+    return str(getattr(settings, 'REVERSE_GEOCODER_PATH', settings.BASE_DIR / 'var' / 'reverse_geocoder.bin'))
+
+
+# ── Building ─────────────────────────────────────────────────────
+
+def centroid_rows():
+    """(level, lat, lng, union_id, upazila_id, district_id, division_id) of every located centroid."""
+    rows = []
+    for pk, division_id, lat, lng in District.objects.filter(
+        lat__isnull=False, lng__isnull=False
+    ).values_list('pk', 'division_id', 'lat', 'lng'):
+        rows.append((LEVEL_DISTRICT, float(lat), float(lng), 0, 0, pk, division_id or 0))
+    for pk, district_id, division_id, lat, lng in Upazila.objects.filter(
+        lat__isnull=False, lng__isnull=False
+    ).values_list('pk', 'district_id', 'division_id', 'lat', 'lng'):
+        rows.append((LEVEL_UPAZILA, float(lat), float(lng), 0, pk, district_id, division_id or 0))
+    for pk, upazila_id, district_id, division_id, lat, lng in Union.objects.filter(
+        lat__isnull=False, lng__isnull=False
+    ).values_list('pk', 'upazila_id', 'district_id', 'division_id', 'lat', 'lng'):
+        rows.append((LEVEL_UNION, float(lat), float(lng), pk, upazila_id, district_id or 0, division_id or 0))
+    return rows
+
+
+def build_geocoder_file(path=None, dataset_version=0, rows=None):
+    """Write the binary index atomically; returns the number of centroids."""
+    path = path or get_geocoder_path()
+    rows = centroid_rows() if rows is None else rows
+    rows = sorted(rows, key=lambda row: grid_cell(row[1], row[2]))
+
+    lats, lngs = array('d'), array('d')
+    cells, unions, upazilas, districts, divisions = (array('I') for _ in range(5))
+    levels = array('B')
+    for level, lat, lng, union_id, upazila_id, district_id, division_id in rows:
+        lats.append(lat)
+        lngs.append(lng)
+        cells.append(grid_cell(lat, lng))
+        unions.append(union_id)
+        upazilas.append(upazila_id)
+        districts.append(district_id)
+        divisions.append(division_id)
+        levels.append(level)
+
+    byte_order = 0 if sys.byteorder == 'little' else 1
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, byte_order, dataset_version, len(rows)))
+        for column in (lats, lngs, cells, unions, upazilas, districts, divisions, levels):
+            column.tofile(f)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+# ── Querying ─────────────────────────────────────────────────────
+
+class ReverseGeocoder:
+    """A memory-mapped index file. Use `get_reverse_geocoder()`."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, byte_order, self.dataset_version, count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError(f'{path} is not a reverse geocoder index (format {FORMAT_VERSION})')
+        if byte_order != (0 if sys.byteorder == 'little' else 1):
+            raise ValueError(f'{path} was built on a machine of another byte order')
+
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+
+        def column(code, size):
+            nonlocal offset
+            data = view[offset:offset + size * count].cast(code)
+            offset += size * count
+            return data
+
+        self.count = count
+        self._lats, self._lngs = column('d', 8), column('d', 8)
+        self._cells = column('I', 4)
+        self._unions, self._upazilas = column('I', 4), column('I', 4)
+        self._districts, self._divisions = column('I', 4), column('I', 4)
+        self._levels = column('B', 1)
+        self._present_levels = frozenset(bytes(self._levels))
+
+    def __len__(self):
+        return self.count
+
+    def _ring_cells(self, row, col, ring):
+        if ring == 0:
+            yield row * GRID_COLUMNS + col
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield (row - ring) * GRID_COLUMNS + c
+            yield (row + ring) * GRID_COLUMNS + c
+        for r in range(row - ring + 1, row + ring):
+            yield r * GRID_COLUMNS + col - ring
+            yield r * GRID_COLUMNS + col + ring
+
+    def lookup(self, lat, lng):
+        """GeocodeResult of the nearest centroid of the most specific level in range, or None."""
+        try:
+            lat, lng = float(lat), float(lng)
+        except (TypeError, ValueError):
+            return None
+        if not self.count or math.isnan(lat) or math.isnan(lng):
+            return None
+
+        row, col = grid_row(lat), grid_col(lng)
+        # Narrowest side of a cell at this latitude: a ring r away is at least
+        # (r - 1) of these from the point
+        cell_km = GRID_CELL_DEGREES * KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01)
+        max_ring = int(math.ceil(max(MAX_DISTANCE_KM.values()) / cell_km)) + 1
+
+        cells, levels = self._cells, self._levels
+        best = {}  # level -> (distance, row index)
+        for ring in range(max_ring + 1):
+            # Done once nothing unvisited can beat the best level found: no
+            # closer centroid of it, no centroid of a more specific level
+            reach = (ring - 1) * cell_km
+            level = max(best, default=0)
+            if (not best or best[level][0] <= reach) and all(
+                MAX_DISTANCE_KM[finer] <= reach for finer in self._present_levels if finer > level
+            ):
+                break
+            for cell in self._ring_cells(row, col, ring):
+                lo = bisect_left(cells, cell)
+                hi = bisect_right(cells, cell, lo)
+                for i in range(lo, hi):
+                    level = levels[i]
+                    distance = haversine_km(lat, lng, self._lats[i], self._lngs[i])
+                    if distance <= MAX_DISTANCE_KM[level] and distance < best.get(level, (math.inf,))[0]:
+                        best[level] = (distance, i)
+
+        if not best:
+            return None
+        level = max(best)
+        distance, i = best[level]
+        return GeocodeResult(
+            self._divisions[i] or None, self._districts[i] or None, self._upazilas[i] or None,
+            self._unions[i] or None, LEVEL_NAMES[level], round(distance, 3),
+        )
+
+
+_lock = threading.Lock()
+_loaded = {'key': None, 'geocoder': None}
+
+
+def get_reverse_geocoder():
+    """The process-wide geocoder for the current index file, or None if there is none."""
+    path = get_geocoder_path()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        if _loaded['key'] != (path, None):
+            logger.warning(
+                'No reverse geocoder index at %s (run build_reverse_geocoder); coordinates will not be geocoded',
+                path,
+            )
+            _loaded['key'], _loaded['geocoder'] = (path, None), None
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if _loaded['key'] != key:
+        with _lock:
+            if _loaded['key'] != key:
+                try:
+                    _loaded['geocoder'] = ReverseGeocoder(path)
+                except (OSError, ValueError):
+                    logger.warning('Could not load reverse geocoder index %s', path, exc_info=True)
+                    _loaded['geocoder'] = None
+                _loaded['key'] = key
+    return _loaded['geocoder']
+
+
+def reverse_geocode(lat, lng):
+    """GeocodeResult for a coordinate, or None (no index, no centroid in range)."""
+    if lat is None or lng is None:
+        return None
+    geocoder = get_reverse_geocoder()
+    return geocoder.lookup(lat, lng) if geocoder else None
@@ -0,0 +1,23 @@
+"""
+Management command to build the offline reverse geocoder index from the
+District / Upazila / Union centroids (see apps.locations.geocoder).
+Rerun after location coordinates change; build.sh and seed_bd_locations run it.
+Run: python manage.py build_reverse_geocoder [--output PATH]
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.locations.ancestry import get_location_version
+from apps.locations.geocoder import build_geocoder_file, get_geocoder_path
+
+
+class Command(BaseCommand):
+    help = 'Builds the memory-mapped reverse geocoder index from location centroids'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Index file path (defaults to settings.REVERSE_GEOCODER_PATH)')
+
+    def handle(self, *args, **options):
+        path = options['output'] or get_geocoder_path()
+        count = build_geocoder_file(path, dataset_version=get_location_version())
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} location centroids to {path}.'))
@@ -2,7 +2,9 @@ import json
 import os
 from django.conf import settings
 from django.db import transaction
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from apps.locations.ancestry import location_changes
 from apps.locations.models import Division, District, Upazila, Union
 
 class Command(BaseCommand):
@@ -43,96 +45,129 @@ class Command(BaseCommand):
             for item in items:
                 uni_bn_map[int(item['value'])] = item['title']
 
-        # Extract coordinates of currently seeded districts to preserve them
-        self.stdout.write("Extracting existing district coordinates from DB...")
+        # Extract coordinates of currently seeded locations to preserve them
+        self.stdout.write("Extracting existing location coordinates from DB...")
         existing_coords = {}
         for dist in District.objects.all():
             existing_coords[dist.name_en.lower()] = (dist.lat, dist.lng)
+        # Upazila / union centroids (set by admins) are kept by name path
+        existing_upz_coords = {
+            (district.lower(), name.lower()): (lat, lng)
+            for district, name, lat, lng in Upazila.objects.filter(lat__isnull=False).values_list(
+                'district__name_en', 'name_en', 'lat', 'lng'
+            )
+        }
+        existing_uni_coords = {
+            (district.lower(), upazila.lower(), name.lower()): (lat, lng)
+            for district, upazila, name, lat, lng in Union.objects.filter(lat__isnull=False).values_list(
+                'upazila__district__name_en', 'upazila__name_en', 'name_en', 'lat', 'lng'
+            )
+        }
 
-        self.stdout.write("Deleting existing location records...")
-        with transaction.atomic():
-            Union.objects.all().delete()
-            Upazila.objects.all().delete()
-            District.objects.all().delete()
-            Division.objects.all().delete()
+        # One version bump for the whole reseed, not one per row
+        with location_changes():
+            self.stdout.write("Deleting existing location records...")
+            with transaction.atomic():
+                Union.objects.all().delete()
+                Upazila.objects.all().delete()
+                District.objects.all().delete()
+                Division.objects.all().delete()
 
-        self.stdout.write("Seeding divisions...")
-        divisions_to_create = []
-        div_id_map = {} # Maps JSON division value to DB Division instance
+            self.stdout.write("Seeding divisions...")
+            divisions_to_create = []
+            div_id_map = {} # Maps JSON division value to DB Division instance
         
-        with transaction.atomic():
-            for div in eng_data.get('divisions_en', []):
-                val = div['value']
-                name_en = div['title']
-                name_bn = div_bn_map.get(val, name_en)
-                db_div = Division.objects.create(name_en=name_en, name_bn=name_bn)
-                div_id_map[val] = db_div
+            with transaction.atomic():
+                for div in eng_data.get('divisions_en', []):
+                    val = div['value']
+                    name_en = div['title']
+                    name_bn = div_bn_map.get(val, name_en)
+                    db_div = Division.objects.create(name_en=name_en, name_bn=name_bn)
+                    div_id_map[val] = db_div
 
-        self.stdout.write("Seeding districts...")
-        districts_to_create = []
-        dist_id_map = {} # Maps JSON district value to DB District instance
+            self.stdout.write("Seeding districts...")
+            districts_to_create = []
+            dist_id_map = {} # Maps JSON district value to DB District instance
         
-        with transaction.atomic():
-            for div_val, districts in eng_data.get('districts_en', {}).items():
-                db_div = div_id_map.get(int(div_val))
-                if not db_div:
-                    continue
-                for dist in districts:
-                    val = dist['value']
-                    name_en = dist['title']
-                    name_bn = dist_bn_map.get(val, name_en)
-                    # Lookup coordinates in existing database fallback
-                    lat, lng = existing_coords.get(name_en.lower(), (None, None))
-                    db_dist = District.objects.create(
-                        division=db_div,
-                        name_en=name_en,
-                        name_bn=name_bn,
-                        lat=lat,
-                        lng=lng
-                    )
-                    dist_id_map[val] = db_dist
+            with transaction.atomic():
+                for div_val, districts in eng_data.get('districts_en', {}).items():
+                    db_div = div_id_map.get(int(div_val))
+                    if not db_div:
+                        continue
+                    for dist in districts:
+                        val = dist['value']
+                        name_en = dist['title']
+                        name_bn = dist_bn_map.get(val, name_en)
+                        # Lookup coordinates in existing database fallback
+                        lat, lng = existing_coords.get(name_en.lower(), (None, None))
+                        db_dist = District.objects.create(
+                            division=db_div,
+                            name_en=name_en,
+                            name_bn=name_bn,
+                            lat=lat,
+                            lng=lng
+                        )
+                        dist_id_map[val] = db_dist
 
-        self.stdout.write("Seeding upazilas...")
-        upazilas_to_create = []
-        upz_id_map = {} # Maps JSON upazila value to DB Upazila instance
+            self.stdout.write("Seeding upazilas...")
+            upazilas_to_create = []
+            upz_id_map = {} # Maps JSON upazila value to DB Upazila instance
         
-        with transaction.atomic():
-            for dist_val, upazilas in eng_data.get('upazilas_en', {}).items():
-                db_dist = dist_id_map.get(int(dist_val))
-                if not db_dist:
-                    continue
-                for upz in upazilas:
-                    val = upz['value']
-                    name_en = upz['title']
-                    name_bn = upz_bn_map.get(val, name_en)
-                    db_upz = Upazila.objects.create(
-                        district=db_dist,
-                        name_en=name_en,
-                        name_bn=name_bn
-                    )
-                    upz_id_map[val] = db_upz
+            with transaction.atomic():
+                for dist_val, upazilas in eng_data.get('upazilas_en', {}).items():
+                    db_dist = dist_id_map.get(int(dist_val))
+                    if not db_dist:
+                        continue
+                    for upz in upazilas:
+                        val = upz['value']
+                        name_en = upz['title']
+                        name_bn = upz_bn_map.get(val, name_en)
+                        lat, lng = existing_upz_coords.get((db_dist.name_en.lower(), name_en.lower()), (None, None))
+                        db_upz = Upazila.objects.create(
+                            district=db_dist,
+                            name_en=name_en,
+                            name_bn=name_bn,
+                            lat=lat,
+                            lng=lng
+                        )
+                        upz_id_map[val] = db_upz
 
-        self.stdout.write("Seeding unions...")
-        unions_to_create = []
+            self.stdout.write("Seeding unions...")
+            unions_to_create = []
         
-        with transaction.atomic():
-            for upz_val, unions in eng_data.get('unions_en', {}).items():
-                db_upz = upz_id_map.get(int(upz_val))
-                if not db_upz:
-                    continue
-                for uni in unions:
-                    val = uni['value']
-                    name_en = uni['title']
-                    name_bn = uni_bn_map.get(val, name_en)
-                    unions_to_create.append(
-                        Union(
-                            upazila=db_upz,
-                            name_en=name_en,
-                            name_bn=name_bn
+            with transaction.atomic():
+                for upz_val, unions in eng_data.get('unions_en', {}).items():
+                    db_upz = upz_id_map.get(int(upz_val))
+                    if not db_upz:
+                        continue
+                    for uni in unions:
+                        val = uni['value']
+                        name_en = uni['title']
+                        name_bn = uni_bn_map.get(val, name_en)
+                        lat, lng = existing_uni_coords.get(
+                            (db_upz.district.name_en.lower(), db_upz.name_en.lower(), name_en.lower()), (None, None)
+                        )
+                        unions_to_create.append(
+                            Union(
+                                upazila=db_upz,
+                                district_id=db_upz.district_id,
+                                division_id=db_upz.division_id,
+                                name_en=name_en,
+                                name_bn=name_bn,
+                                lat=lat,
+                                lng=lng
+                            )
                         )
-                    )
             
-            # Perform bulk create in chunks of 500
-            Union.objects.bulk_create(unions_to_create, batch_size=500)
+                # Perform bulk create in chunks of 500
+                Union.objects.bulk_create(unions_to_create, batch_size=500)
 
         self.stdout.write(self.style.SUCCESS(f"Successfully seeded! Created {Division.objects.count()} divisions, {District.objects.count()} districts, {Upazila.objects.count()} upazilas, and {Union.objects.count()} unions."))
+
+        # Location IDs changed: rebuild the reverse geocoder before
+        # anything is geocoded against it
+        call_command('build_reverse_geocoder', stdout=self.stdout)
+
+        # Recreating the locations nulled every user location FK
+        self.stdout.write("Re-linking user locations...")
+        call_command('backfill_user_locations', stdout=self.stdout)
@@ -0,0 +1,60 @@
+"""
+PetCarePlus v2 — Location Name Matching
+
+Resolves free-text division/district/upazila names to locations.* primary
+keys. Names match either language (`name_en` case-insensitively, `name_bn`
+exactly); each level is searched inside the parent already resolved, and a
+match fills in any parents that were not given. Ambiguous names resolve to
+None rather than to an arbitrary row.
+"""
+
+from collections import namedtuple
+
+from django.db.models import Q
+
+from apps.locations.models import Division, District, Upazila
+
+
+LocationIds = namedtuple('LocationIds', ['division_id', 'district_id', 'upazila_id'])
+
+LOCATION_MODELS = (Division, District, Upazila)
+
+
+def _match(model, name, fields, **parents):
+    name = (name or '').strip()
+    if not name:
+        return None
+    parents = {lookup: value for lookup, value in parents.items() if value}
+    rows = list(
+        model.objects.filter(Q(name_en__iexact=name) | Q(name_bn=name), **parents)
+        .values_list(*fields)[:2]
+    )
+    return rows[0] if len(rows) == 1 else None
+
+
+def resolve_location_ids(division='', district='', upazila='', models=LOCATION_MODELS):
+    """
+    LocationIds for a set of names; unmatched levels are None.
+
+    `models` are the (Division, District, Upazila) classes to query, so
+    migrations can pass their historical models.
+    """
+    division_model, district_model, upazila_model = models
+
+    division_row = _match(division_model, division, ('pk',))
+    division_id = division_row[0] if division_row else None
+
+    district_id = None
+    district_row = _match(district_model, district, ('pk', 'division_id'), division_id=division_id)
+    if district_row:
+        district_id, division_id = district_row
+
+    upazila_id = None
+    upazila_row = _match(
+        upazila_model, upazila, ('pk', 'district_id', 'division_id'),
+        district_id=district_id, division_id=division_id,
+    )
+    if upazila_row:
+        upazila_id, district_id, division_id = upazila_row
+
+    return LocationIds(division_id, district_id, upazila_id)
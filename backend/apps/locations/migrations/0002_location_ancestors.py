@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_ancestors(apps, schema_editor):
+    District = apps.get_model('locations', 'District')
+    Upazila = apps.get_model('locations', 'Upazila')
+    Union = apps.get_model('locations', 'Union')
+
+    Upazila.objects.update(division_id=Subquery(
+        District.objects.filter(pk=OuterRef('district_id')).values('division_id')[:1]
+    ))
+    upazilas = Upazila.objects.filter(pk=OuterRef('upazila_id'))
+    Union.objects.update(
+        district_id=Subquery(upazilas.values('district_id')[:1]),
+        division_id=Subquery(upazilas.values('division_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='union',
+            name='district',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='unions', to='locations.district'),
+        ),
+        migrations.AddField(
+            model_name='union',
+            name='division',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='unions', to='locations.division'),
+        ),
+        migrations.AddField(
+            model_name='upazila',
+            name='division',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upazilas', to='locations.division'),
+        ),
+        migrations.RunPython(populate_ancestors, migrations.RunPython.noop),
+    ]
@@ -23,10 +23,25 @@ class District(models.Model):
     def __str__(self):
         return f"{self.name_en} ({self.name_bn})"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Carry a move to another division down to the denormalized columns
+        Upazila.objects.filter(district_id=self.pk).exclude(division_id=self.division_id).update(
+            division_id=self.division_id
+        )
+        Union.objects.filter(district_id=self.pk).exclude(division_id=self.division_id).update(
+            division_id=self.division_id
+        )
+
 class Upazila(models.Model):
     district = models.ForeignKey(District, on_delete=models.CASCADE, related_name='upazilas')
+    # Denormalized ancestor (see apps.locations.ancestry)
+    division = models.ForeignKey(Division, on_delete=models.CASCADE, related_name='upazilas', null=True, blank=True)
     name_en = models.CharField(max_length=50)
     name_bn = models.CharField(max_length=50)
+    # Centroid, used by the reverse geocoder (see apps.locations.geocoder)
+    lat = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    lng = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
 
     class Meta:
         ordering = ['name_en']
@@ -34,13 +49,32 @@ class Upazila(models.Model):
     def __str__(self):
         return f"{self.name_en} ({self.name_bn})"
 
+    def save(self, *args, **kwargs):
+        self.division_id = self.district.division_id
+        super().save(*args, **kwargs)
+        # Carry a move to another district down to the unions
+        Union.objects.filter(upazila_id=self.pk).exclude(
+            district_id=self.district_id, division_id=self.division_id
+        ).update(district_id=self.district_id, division_id=self.division_id)
+
 class Union(models.Model):
     upazila = models.ForeignKey(Upazila, on_delete=models.CASCADE, related_name='unions')
+    # Denormalized ancestors (see apps.locations.ancestry)
+    district = models.ForeignKey(District, on_delete=models.CASCADE, related_name='unions', null=True, blank=True)
+    division = models.ForeignKey(Division, on_delete=models.CASCADE, related_name='unions', null=True, blank=True)
     name_en = models.CharField(max_length=50)
     name_bn = models.CharField(max_length=50)
+    # Centroid, used by the reverse geocoder (see apps.locations.geocoder)
+    lat = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    lng = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
 
     class Meta:
         ordering = ['name_en']
 
     def __str__(self):
         return f"{self.name_en} ({self.name_bn})"
+
+    def save(self, *args, **kwargs):
+        self.district_id = self.upazila.district_id
+        self.division_id = self.upazila.division_id
+        super().save(*args, **kwargs)
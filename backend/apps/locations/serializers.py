@@ -1,22 +1,23 @@
 from rest_framework import serializers
+from common.fieldsets import SparseFieldsetsMixin
 from .models import Division, District, Upazila, Union
 
-class UnionSerializer(serializers.ModelSerializer):
+class UnionSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Union
         fields = '__all__'
 
-class UpazilaSerializer(serializers.ModelSerializer):
+class UpazilaSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Upazila
         fields = '__all__'
 
-class DistrictSerializer(serializers.ModelSerializer):
+class DistrictSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = District
         fields = '__all__'
 
-class DivisionSerializer(serializers.ModelSerializer):
+class DivisionSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Division
         fields = '__all__'
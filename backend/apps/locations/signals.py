@@ -0,0 +1,30 @@
+"""
+PetCarePlus v2 — Locations Signals
+
+Bump the location dataset version (see ancestry) when the hierarchy changes
+(ancestry maps, tree payloads and location API caches are all keyed by it):
+once per transaction, on commit, so every worker reloads its ancestry maps
+from committed rows. The bump logs the (kind, id) of each changed row for
+the suggestion index. Changes made inside `location_changes()`
+(seed_bd_locations) are left to its single, unlogged bump on exit.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.locations.ancestry import bump_location_version, location_changes_deferred
+from apps.locations.models import Division, District, Upazila, Union
+from common.transactions import on_commit_batch
+
+
+@receiver(post_save, sender=Division)
+@receiver(post_save, sender=District)
+@receiver(post_save, sender=Upazila)
+@receiver(post_save, sender=Union)
+@receiver(post_delete, sender=Division)
+@receiver(post_delete, sender=District)
+@receiver(post_delete, sender=Upazila)
+@receiver(post_delete, sender=Union)
+def on_location_changed(sender, instance, **kwargs):
+    if not location_changes_deferred():
+        on_commit_batch('locations:version', (sender._meta.model_name, instance.pk), bump_location_version)
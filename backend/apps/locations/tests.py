@@ -0,0 +1,255 @@
+"""
+PetCarePlus v2 — Locations App Unit Tests
+
+Tests covering the materialized location ancestry, the location tree and
+the offline reverse geocoder.
+"""
+
+from rest_framework.test import APITestCase
+
+from apps.locations.models import Division, District, Upazila, Union
+
+
+class LocationAncestryTests(APITestCase):
+    """
+    Tests for the denormalized ancestor columns and the in-process maps.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dhaka = Division.objects.create(name_en='Dhaka', name_bn='ঢাকা')
+            self.gazipur = District.objects.create(division=self.dhaka, name_en='Gazipur', name_bn='গাজীপুর')
+            self.narsingdi = District.objects.create(division=self.dhaka, name_en='Narsingdi', name_bn='নরসিংদী')
+            self.kaliakair = Upazila.objects.create(district=self.gazipur, name_en='Kaliakair', name_bn='কালিয়াকৈর')
+            self.palash = Upazila.objects.create(district=self.narsingdi, name_en='Palash', name_bn='পলাশ')
+
+    def test_ancestor_columns_are_filled_on_save(self):
+        union = Union.objects.create(upazila=self.kaliakair, name_en='Mouchak', name_bn='মৌচাক')
+        self.assertEqual(self.kaliakair.division_id, self.dhaka.pk)
+        self.assertEqual((union.district_id, union.division_id), (self.gazipur.pk, self.dhaka.pk))
+
+    def test_moving_a_parent_updates_the_ancestor_columns_below(self):
+        union = Union.objects.create(upazila=self.kaliakair, name_en='Mouchak', name_bn='মৌচাক')
+        mymensingh = Division.objects.create(name_en='Mymensingh', name_bn='ময়মনসিংহ')
+
+        self.gazipur.division = mymensingh
+        self.gazipur.save()
+        self.kaliakair.refresh_from_db()
+        union.refresh_from_db()
+        self.assertEqual(self.kaliakair.division_id, mymensingh.pk)
+        self.assertEqual((union.district_id, union.division_id), (self.gazipur.pk, mymensingh.pk))
+
+        self.kaliakair.district = self.narsingdi
+        self.kaliakair.save()
+        union.refresh_from_db()
+        self.assertEqual((union.district_id, union.division_id), (self.narsingdi.pk, self.dhaka.pk))
+        self.assertEqual(Upazila.objects.get(pk=self.palash.pk).division_id, self.dhaka.pk)
+
+    def test_ids_expand_without_queries(self):
+        from apps.locations.ancestry import get_location_ancestry
+
+        ancestry = get_location_ancestry()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                ancestry.ancestors(upazila_id=self.kaliakair.pk),
+                (self.dhaka.pk, self.gazipur.pk, self.kaliakair.pk),
+            )
+            self.assertEqual(ancestry.ancestors(district_id=str(self.narsingdi.pk)).division_id, self.dhaka.pk)
+            self.assertEqual(ancestry.district_ids(self.dhaka.pk), {self.gazipur.pk, self.narsingdi.pk})
+            self.assertEqual(ancestry.upazila_ids(division_id=self.dhaka.pk), {self.kaliakair.pk, self.palash.pk})
+            self.assertEqual(ancestry.upazila_ids(district_id=self.gazipur.pk), {self.kaliakair.pk})
+
+    def test_location_changes_reload_the_maps(self):
+        from apps.locations.ancestry import get_location_ancestry
+
+        get_location_ancestry()
+        with self.captureOnCommitCallbacks(execute=True):
+            sreepur = Upazila.objects.create(district=self.gazipur, name_en='Sreepur', name_bn='শ্রীপুর')
+        self.assertEqual(get_location_ancestry().ancestors(upazila_id=sreepur.pk).district_id, self.gazipur.pk)
+
+    def test_a_transaction_bumps_the_version_once(self):
+        from apps.locations.ancestry import get_location_version
+
+        version = get_location_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for name in ('Sreepur', 'Kapasia', 'Tongi'):
+                Upazila.objects.create(district=self.gazipur, name_en=name, name_bn=name)
+            self.assertEqual(get_location_version(), version)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(get_location_version(), version + 1)
+
+    def test_location_changes_bump_once_on_exit(self):
+        from apps.locations.ancestry import get_location_version, location_changes
+
+        version = get_location_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with location_changes():
+                Union.objects.create(upazila=self.kaliakair, name_en='Mouchak', name_bn='মৌচাক')
+                Upazila.objects.filter(pk=self.palash.pk).delete()
+                self.assertEqual(get_location_version(), version)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_location_version(), version + 1)
+
+
+class LocationTreeTests(APITestCase):
+    """
+    Tests for the versioned, columnar location tree and conditional GETs.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+        from django.urls import reverse
+
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dhaka = Division.objects.create(name_en='Dhaka', name_bn='ঢাকা')
+            self.gazipur = District.objects.create(division=self.dhaka, name_en='Gazipur', name_bn='গাজীপুর')
+            self.kaliakair = Upazila.objects.create(district=self.gazipur, name_en='Kaliakair', name_bn='কালিয়াকৈর')
+            self.mouchak = Union.objects.create(upazila=self.kaliakair, name_en='Mouchak', name_bn='মৌচাক')
+        self.tree_url = reverse('location_tree')
+
+    def test_tree_is_columnar(self):
+        response = self.client.get(self.tree_url)
+        self.assertEqual(response.status_code, 200)
+        tree = response.json()
+        self.assertEqual(tree['divisions'], {'id': [self.dhaka.pk], 'name_en': ['Dhaka'], 'name_bn': ['ঢাকা']})
+        self.assertEqual(tree['districts']['parent_id'], [self.dhaka.pk])
+        self.assertEqual(tree['upazilas']['id'], [self.kaliakair.pk])
+        self.assertEqual(tree['unions']['parent_id'], [self.kaliakair.pk])
+        self.assertEqual(response['ETag'], f'"{tree["version"]}"')
+        self.assertEqual(response['Cache-Control'], 'public, no-cache')
+
+        response = self.client.get(self.tree_url, {'version': tree['version']})
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_matching_etag_is_not_modified_without_queries(self):
+        etag = self.client.get(self.tree_url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.tree_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_location_change_moves_the_version(self):
+        etag = self.client.get(self.tree_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Union.objects.create(upazila=self.kaliakair, name_en='Sreepur', name_bn='শ্রীপুর')
+
+        response = self.client.get(self.tree_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['unions']['id']), 2)
+
+    def test_level_endpoints_are_cached_per_version(self):
+        from django.urls import reverse
+
+        url = reverse('district-list')
+        response = self.client.get(url, {'division': self.dhaka.pk})
+        self.assertEqual([d['id'] for d in response.data], [self.gazipur.pk])
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, {'division': self.dhaka.pk})
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(not_modified.status_code, 304)
+
+
+class ReverseGeocoderTests(APITestCase):
+    """
+    Tests for the memory-mapped reverse geocoder and the rows it places.
+    """
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.cache import cache
+        from django.test import override_settings
+
+        cache.clear()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(REVERSE_GEOCODER_PATH=f'{directory}/geocoder.bin')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.dhaka = Division.objects.create(name_en='Dhaka', name_bn='ঢাকা')
+        self.gazipur = District.objects.create(
+            division=self.dhaka, name_en='Gazipur', name_bn='গাজীপুর', lat='24.000000', lng='90.420000'
+        )
+        self.kaliakair = Upazila.objects.create(
+            district=self.gazipur, name_en='Kaliakair', name_bn='কালিয়াকৈর', lat='24.070000', lng='90.220000'
+        )
+        self.mouchak = Union.objects.create(
+            upazila=self.kaliakair, name_en='Mouchak', name_bn='মৌচাক', lat='24.060000', lng='90.270000'
+        )
+
+    def _build(self):
+        from apps.locations.geocoder import build_geocoder_file
+
+        self.assertEqual(build_geocoder_file(), 3)
+
+    def test_nearest_centroid_of_the_most_specific_level_in_range(self):
+        from apps.locations.geocoder import reverse_geocode
+
+        self._build()
+        with self.assertNumQueries(0):
+            union = reverse_geocode('24.065', '90.265')
+            upazila = reverse_geocode(24.07, 90.21)
+            district = reverse_geocode(24.0, 90.5)
+            far = reverse_geocode(22.33, 91.83)
+        self.assertEqual(
+            union, (self.dhaka.pk, self.gazipur.pk, self.kaliakair.pk, self.mouchak.pk, 'union', union.distance_km)
+        )
+        self.assertEqual((upazila.level, upazila.upazila_id, upazila.union_id), ('upazila', self.kaliakair.pk, None))
+        self.assertEqual((district.level, district.district_id, district.upazila_id), ('district', self.gazipur.pk, None))
+        self.assertIsNone(far)
+
+    def test_missing_index_geocodes_nothing(self):
+        from apps.locations.geocoder import reverse_geocode
+
+        with self.assertLogs('apps.locations.geocoder', level='WARNING') as logs:
+            self.assertIsNone(reverse_geocode(24.065, 90.265))
+            self.assertIsNone(reverse_geocode(24.07, 90.21))
+        self.assertEqual(len(logs.records), 1)
+
+    def test_rebuilt_index_is_picked_up(self):
+        import os
+        from apps.locations.geocoder import build_geocoder_file, get_geocoder_path, reverse_geocode
+
+        self._build()
+        self.assertEqual(reverse_geocode(24.065, 90.265).level, 'union')
+        self.mouchak.delete()
+        self.assertEqual(build_geocoder_file(), 2)
+        # Same-tick rebuilds must still be told apart
+        stat = os.stat(get_geocoder_path())
+        os.utime(get_geocoder_path(), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertEqual(reverse_geocode(24.065, 90.265).level, 'upazila')
+
+    def test_provider_and_anonymous_ai_request_are_placed_by_coordinates(self):
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import AnonymousUser
+        from rest_framework.test import APIRequestFactory
+        from apps.ai_assistant.views import _request_location
+        from apps.providers.models import ServiceProvider
+
+        self._build()
+        user = get_user_model().objects.create_user(
+            email='geo@test.com', password='ProviderPass123!', full_name='Geo Vet', role='provider'
+        )
+        provider = ServiceProvider.objects.create(
+            user=user, business_name='Geo Vet', provider_type='vet', phone='01700000000',
+            latitude='24.065000', longitude='90.265000',
+        )
+        self.assertEqual(
+            (provider.division_id, provider.district_id, provider.upazila_id, provider.union_id),
+            (self.dhaka.pk, self.gazipur.pk, self.kaliakair.pk, self.mouchak.pk),
+        )
+
+        request = APIRequestFactory().post('/')
+        request.user = AnonymousUser()
+        location = _request_location(request, {'user_latitude': '24.07', 'user_longitude': '90.21'})
+        self.assertEqual(
+            (location.division_id, location.district_id, location.upazila_id),
+            (self.dhaka.pk, self.gazipur.pk, self.kaliakair.pk),
+        )
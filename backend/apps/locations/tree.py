@@ -0,0 +1,59 @@
+"""
+PetCarePlus v2 — Location Tree Payload
+
+The whole Division → District → Upazila → Union hierarchy as one compact,
+columnar JSON document for GET /api/v1/locations/tree/:
+
+    {"version": 1718000000000,
+     "divisions": {"id": [...], "name_en": [...], "name_bn": [...]},
+     "districts": {"id": [...], "parent_id": [...], "name_en": [...], "name_bn": [...]},
+     "upazilas": {...}, "unions": {...}}
+
+Each level holds parallel arrays (row i of every array is one location),
+so repeated keys are not sent once per row. The encoded bytes are cached
+per dataset version (see ancestry.get_location_version); a new version is
+simply a new key.
+"""
+
+import json
+
+from django.core.cache import cache
+
+from apps.locations.models import Division, District, Upazila, Union
+
+
+TREE_CACHE_KEY = 'locations:tree:{}'
+TREE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# (payload key, model, parent field)
+TREE_LEVELS = (
+    ('divisions', Division, None),
+    ('districts', District, 'division_id'),
+    ('upazilas', Upazila, 'district_id'),
+    ('unions', Union, 'upazila_id'),
+)
+
+
+def build_location_tree(version):
+    """The columnar tree of the current dataset, as a dict."""
+    tree = {'version': version}
+    for key, model, parent_field in TREE_LEVELS:
+        fields = ['pk', 'name_en', 'name_bn']
+        if parent_field:
+            fields.insert(1, parent_field)
+        rows = list(model.objects.order_by('pk').values_list(*fields))
+        columns = list(zip(*rows)) if rows else [()] * len(fields)
+        names = ['id', 'parent_id', 'name_en', 'name_bn'] if parent_field else ['id', 'name_en', 'name_bn']
+        tree[key] = {name: list(column) for name, column in zip(names, columns)}
+    return tree
+
+
+def get_location_tree_json(version):
+    """UTF-8 JSON of the tree for a dataset version, built once per version."""
+    key = TREE_CACHE_KEY.format(version)
+    content = cache.get(key)
+    if content is None:
+        tree = build_location_tree(version)
+        content = json.dumps(tree, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        cache.set(key, content, TREE_CACHE_TIMEOUT)
+    return content
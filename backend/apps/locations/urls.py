@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import DivisionViewSet, DistrictViewSet, UpazilaViewSet, UnionViewSet
+from .views import DivisionViewSet, DistrictViewSet, UpazilaViewSet, UnionViewSet, LocationTreeView
 
 router = DefaultRouter()
 router.register(r'divisions', DivisionViewSet, basename='division')
@@ -9,5 +9,6 @@ router.register(r'upazilas', UpazilaViewSet, basename='upazila')
 router.register(r'unions', UnionViewSet, basename='union')
 
 urlpatterns = [
+    path('tree/', LocationTreeView.as_view(), name='location_tree'),
     path('', include(router.urls)),
 ]
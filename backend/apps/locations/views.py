@@ -1,37 +1,128 @@
-from rest_framework import viewsets
+"""
+PetCarePlus v2 — Locations Views
+
+Read-only Bangladesh location hierarchy. Every response is keyed by the
+location dataset version (see ancestry), which seed_bd_locations and admin
+edits bump:
+
+- Responses carry a strong ETag of the version; a matching If-None-Match
+  is answered 304 before authentication, with no database query.
+- Rendered payloads are cached per version, so a new version never serves
+  stale rows and nothing has to be purged.
+- GET tree/?version=<current> is immutable and may be cached by clients
+  and CDNs indefinitely; other URLs must revalidate.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import permissions, viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.fieldsets import SparseFieldsetsViewMixin
+from .ancestry import get_location_version
 from .models import Division, District, Upazila, Union
 from .serializers import DivisionSerializer, DistrictSerializer, UpazilaSerializer, UnionSerializer
+from .tree import get_location_tree_json
+
+
+LOCATION_CACHE_TIMEOUT = 60 * 60 * 24
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+def version_etag(version):
+    return f'"{version}"'
 
-@method_decorator(cache_page(None), name='list')
-@method_decorator(cache_page(None), name='retrieve')
-class DivisionViewSet(viewsets.ReadOnlyModelViewSet):
+
+class LocationVersionMixin:
+    """
+    Conditional GETs on the dataset version for public location views.
+    Authentication is skipped: the data is public, and a 304 must not pay
+    for loading a user.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get_cache_control(self, request):
+        return REVALIDATE_CACHE_CONTROL
+
+    def dispatch(self, request, *args, **kwargs):
+        self.location_version = get_location_version()
+        etag = version_etag(self.location_version)
+
+        response = None
+        if request.method in ('GET', 'HEAD'):
+            response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Cache-Control'] = self.get_cache_control(request)
+        return response
+
+
+class CachedLocationViewSet(LocationVersionMixin, SparseFieldsetsViewMixin, viewsets.ReadOnlyModelViewSet):
+    """Location viewset whose rendered data is cached per dataset version and URL."""
+    pagination_class = None
+
+    def _cached(self, request, handler, *args, **kwargs):
+        digest = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+        key = f'locations:api:{self.location_version}:{digest}'
+        data = cache.get(key)
+        if data is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            data = response.data
+            cache.set(key, data, LOCATION_CACHE_TIMEOUT)
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(request, super().retrieve, *args, **kwargs)
+
+
+class DivisionViewSet(CachedLocationViewSet):
     queryset = Division.objects.all()
     serializer_class = DivisionSerializer
-    pagination_class = None
 
-@method_decorator(cache_page(None), name='list')
-@method_decorator(cache_page(None), name='retrieve')
-class DistrictViewSet(viewsets.ReadOnlyModelViewSet):
+class DistrictViewSet(CachedLocationViewSet):
     queryset = District.objects.all()
     serializer_class = DistrictSerializer
     filterset_fields = ['division']
-    pagination_class = None
 
-@method_decorator(cache_page(None), name='list')
-@method_decorator(cache_page(None), name='retrieve')
-class UpazilaViewSet(viewsets.ReadOnlyModelViewSet):
+class UpazilaViewSet(CachedLocationViewSet):
     queryset = Upazila.objects.all()
     serializer_class = UpazilaSerializer
     filterset_fields = ['district']
-    pagination_class = None
 
-@method_decorator(cache_page(None), name='list')
-@method_decorator(cache_page(None), name='retrieve')
-class UnionViewSet(viewsets.ReadOnlyModelViewSet):
+class UnionViewSet(CachedLocationViewSet):
     queryset = Union.objects.all()
     serializer_class = UnionSerializer
     filterset_fields = ['upazila']
-    pagination_class = None
+
+
+class LocationTreeView(LocationVersionMixin, APIView):
+    """
+    GET /api/v1/locations/tree/?version=
+
+    The whole hierarchy in one columnar document (see tree), replacing the
+    per-level round trips. The plain URL revalidates (a 304 while the
+    dataset is unchanged); `?version=` with the version from the body names
+    one dataset for good and is served as immutable. A stale version gets
+    the current tree, which must revalidate.
+    """
+
+    def get_cache_control(self, request):
+        if request.GET.get('version') == str(self.location_version):
+            return IMMUTABLE_CACHE_CONTROL
+        return REVALIDATE_CACHE_CONTROL
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(get_location_tree_json(self.location_version), content_type='application/json')
@@ -5,11 +5,12 @@ Bilingual serializer for Notification model using BilingualMixin.
 """
 
 from rest_framework import serializers
+from common.fieldsets import SparseFieldsetsMixin
 from common.mixins import BilingualMixin
 from apps.notifications.models import Notification
 
 
-class NotificationSerializer(BilingualMixin, serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetsMixin, BilingualMixin, serializers.ModelSerializer):
     """
     Serializer for Notification.
     Dynamically maps bilingual title and message fields.
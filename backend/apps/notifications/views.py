@@ -8,12 +8,13 @@ Includes custom detail and list actions to mark notifications as read.
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from common.fieldsets import SparseFieldsetsViewMixin
 
 from apps.notifications.models import Notification
 from apps.notifications.serializers import NotificationSerializer
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Notification models.
     Scopes access to the active authenticated user.
@@ -5,3 +5,6 @@ class ProvidersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.providers'
     verbose_name = 'Service Providers'
+
+    def ready(self):
+        import apps.providers.signals  # noqa: F401
@@ -0,0 +1,338 @@
+"""
+PetCarePlus v2 — In-Process Provider Geo Index
+
+Per-worker, in-memory index of verified, active providers for the hot
+"providers near me" path. Coordinates live in contiguous `array('d')`
+buffers, provider type and animal types are packed as a type code and an
+animal-type bitmap per row, and rows are bucketed by the same grid cells as
+ServiceProvider.grid_cell (see common.geo). A k-nearest query walks grid
+rings outward from the query point and stops as soon as no unvisited cell
+can hold a closer provider, so the only database work left to a caller is
+fetching the final page of IDs.
+
+Keeping workers in step:
+- Signals call `mark_provider_changed(provider_id)` on commit; it bumps a
+  version counter in the shared cache and logs the changed ID under that
+  version.
+- Before answering, each worker compares its version with the shared one
+  and re-reads only the logged providers. If the log is incomplete (evicted,
+  or too far behind) it rebuilds from scratch.
+- Either way the new rows are built on the side and swapped in with one
+  assignment; a query reads one generation throughout, never a half-built
+  one.
+"""
+
+import heapq
+import math
+import threading
+from array import array
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from apps.providers.models import ProviderAnimalType, ServiceProvider
+from common.cache_versions import bump_cache_version, get_cache_version
+from common.geo import (
+    GRID_CELL_DEGREES, GRID_COLUMNS, KM_PER_DEGREE,
+    covering_cell_ranges, grid_col, grid_row, haversine_km,
+)
+
+
+VERSION_CACHE_KEY = 'providers:geo_index:version'
+CHANGE_CACHE_KEY = 'providers:geo_index:change:{}'
+CHANGE_LOG_TTL = 60 * 60 * 24
+MAX_INCREMENTAL_CHANGES = 500
+
+# Fields whose change can move a provider in or out of the index
+INDEXED_FIELDS = frozenset({
+    'latitude', 'longitude', 'grid_cell', 'provider_type', 'is_verified', 'is_active',
+})
+
+PROVIDER_TYPE_CODES = {value: code for code, value in enumerate(ServiceProvider.ProviderType.values)}
+
+
+def mark_provider_changed(provider_id):
+    """Publish a provider change to every worker's index."""
+    version = bump_cache_version(VERSION_CACHE_KEY)
+    cache.set(CHANGE_CACHE_KEY.format(version), provider_id, CHANGE_LOG_TTL)
+
+
+class _GeoRows:
+    """
+    One generation of the index: row buffers, grid buckets and animal-type
+    bits. A published generation is never changed; updates go to a `copy()`
+    that is swapped in whole.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.lats = array('d')
+        self.lngs = array('d')
+        self.types = array('b')
+        self.animals = []  # Python ints used as bitmaps
+        self.positions = {}  # provider id -> row
+        self.cells = defaultdict(list)  # grid cell -> rows
+        self.animal_bits = {}  # animal type id -> bit
+        self.dead = 0
+        self.row_span = self.col_span = None
+        self.owned = None  # cells whose row lists a copy has made its own; None: all
+
+    def copy(self):
+        rows = _GeoRows()
+        rows.ids, rows.lats, rows.lngs = array('q', self.ids), array('d', self.lats), array('d', self.lngs)
+        rows.types = array('b', self.types)
+        rows.animals = list(self.animals)
+        rows.positions = dict(self.positions)
+        rows.cells = defaultdict(list, self.cells)  # Row lists are copied on first write
+        rows.owned = set()
+        rows.animal_bits = dict(self.animal_bits)
+        rows.dead = self.dead
+        rows.row_span, rows.col_span = self.row_span, self.col_span
+        return rows
+
+    def animal_mask(self, animal_type_ids):
+        mask = 0
+        for animal_type_id in animal_type_ids:
+            bit = self.animal_bits.setdefault(animal_type_id, len(self.animal_bits))
+            mask |= 1 << bit
+        return mask
+
+    def cell_of(self, row):
+        return grid_row(self.lats[row]) * GRID_COLUMNS + grid_col(self.lngs[row])
+
+    def cell_rows(self, row):
+        """The row list of the cell `row` is in, safe to change in this generation."""
+        cell = self.cell_of(row)
+        if self.owned is not None and cell not in self.owned:
+            self.cells[cell] = list(self.cells.get(cell, ()))
+            self.owned.add(cell)
+        return self.cells[cell]
+
+    def extend_span(self, lat, lng):
+        row, col = grid_row(lat), grid_col(lng)
+        if self.row_span is None:
+            self.row_span, self.col_span = (row, row), (col, col)
+            return
+        self.row_span = (min(self.row_span[0], row), max(self.row_span[1], row))
+        self.col_span = (min(self.col_span[0], col), max(self.col_span[1], col))
+
+    def upsert(self, provider_id, lat, lng, provider_type, animal_type_ids):
+        type_code = PROVIDER_TYPE_CODES.get(provider_type, -1)
+        mask = self.animal_mask(animal_type_ids)
+        row = self.positions.get(provider_id)
+        if row is None:
+            row = len(self.ids)
+            self.ids.append(provider_id)
+            self.lats.append(lat)
+            self.lngs.append(lng)
+            self.types.append(type_code)
+            self.animals.append(mask)
+            self.positions[provider_id] = row
+        else:
+            self.cell_rows(row).remove(row)
+            self.lats[row], self.lngs[row] = lat, lng
+            self.types[row] = type_code
+            self.animals[row] = mask
+        self.cell_rows(row).append(row)
+        self.extend_span(lat, lng)
+
+    def remove(self, provider_id):
+        row = self.positions.pop(provider_id, None)
+        if row is None:
+            return
+        self.cell_rows(row).remove(row)
+        self.ids[row] = 0
+        self.dead += 1
+
+    def live(self):
+        """(id, lat, lng, provider_type, [animal_type_id, ...]) of every live row."""
+        bits = {bit: animal_type_id for animal_type_id, bit in self.animal_bits.items()}
+        return [
+            (self.ids[row], self.lats[row], self.lngs[row],
+             ServiceProvider.ProviderType.values[self.types[row]] if self.types[row] >= 0 else None,
+             [bits[bit] for bit in range(len(bits)) if self.animals[row] >> bit & 1])
+            for row in sorted(self.positions.values())
+        ]
+
+
+class ProviderGeoIndex:
+    """
+    Grid-bucketed nearest-provider index. Use `get_provider_geo_index()` for
+    the process-wide, cache-synchronised instance.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self._rows = _GeoRows()
+
+    def __len__(self):
+        return len(self._rows.positions)
+
+    # ── Loading ──────────────────────────────────────────────────
+
+    @staticmethod
+    def _fetch(provider_ids=None):
+        """Current rows as (id, lat, lng, provider_type, [animal_type_id, ...])."""
+        qs = ServiceProvider.objects.filter(
+            is_verified=True, is_active=True,
+            latitude__isnull=False, longitude__isnull=False,
+        )
+        links = ProviderAnimalType.objects.all()
+        if provider_ids is not None:
+            qs = qs.filter(pk__in=provider_ids)
+            links = links.filter(provider_id__in=provider_ids)
+
+        animals = defaultdict(list)
+        for provider_id, animal_type_id in links.values_list('provider_id', 'animal_type_id'):
+            animals[provider_id].append(animal_type_id)
+        return [
+            (pk, float(lat), float(lng), provider_type, animals.get(pk, ()))
+            for pk, lat, lng, provider_type in qs.order_by().values_list(
+                'pk', 'latitude', 'longitude', 'provider_type'
+            )
+        ]
+
+    def rebuild(self, rows=None):
+        """Load the index from `rows` (default: the database) from scratch."""
+        built = _GeoRows()
+        for row in self._fetch() if rows is None else rows:
+            built.upsert(*row)
+        self._rows = built
+
+    def refresh(self, provider_ids):
+        """Re-read the given providers, adding, moving or dropping them."""
+        provider_ids = set(provider_ids)
+        fetched = self._fetch(provider_ids)
+        updated = self._rows.copy()
+        for row in fetched:
+            provider_ids.discard(row[0])
+            updated.upsert(*row)
+        for provider_id in provider_ids:
+            updated.remove(provider_id)
+
+        # Tombstoned rows only cost memory; compact once they pile up
+        if updated.dead > max(1000, len(updated.ids) // 4):
+            self.rebuild(updated.live())
+        else:
+            self._rows = updated
+
+    def sync(self):
+        """Catch up with the shared cache version, incrementally when possible."""
+        current = get_cache_version(VERSION_CACHE_KEY)
+        if current == self.version:
+            return
+
+        with self._lock:
+            if current == self.version:
+                return
+            behind = None if self.version is None else current - self.version
+            if behind is not None and 0 < behind <= MAX_INCREMENTAL_CHANGES:
+                keys = [CHANGE_CACHE_KEY.format(v) for v in range(self.version + 1, current + 1)]
+                changes = cache.get_many(keys)
+                if len(changes) == len(keys):
+                    self.refresh(changes.values())
+                    self.version = current
+                    return
+            self.rebuild()
+            self.version = current
+
+    # ── Queries ──────────────────────────────────────────────────
+
+    @staticmethod
+    def _matcher(rows, provider_type, animal_type_id):
+        type_code = PROVIDER_TYPE_CODES.get(provider_type, -2) if provider_type else None
+        if animal_type_id in (None, ''):
+            animal_bit = None
+        else:
+            try:
+                bit = rows.animal_bits.get(int(animal_type_id))
+            except (TypeError, ValueError):
+                return None
+            if bit is None:
+                return None
+            animal_bit = 1 << bit
+        types, animals = rows.types, rows.animals
+
+        def matches(row):
+            if type_code is not None and types[row] != type_code:
+                return False
+            return animal_bit is None or animals[row] & animal_bit
+
+        return matches
+
+    def nearest(self, lat, lng, k, radius_km=None, provider_type=None, animal_type_id=None):
+        """
+        Up to `k` (provider_id, distance_km) pairs, nearest first, optionally
+        limited to `radius_km`.
+        """
+        lat, lng = float(lat), float(lng)
+        rows = self._rows  # One generation for the whole query
+        matches = self._matcher(rows, provider_type, animal_type_id)
+        if k <= 0 or matches is None or rows.row_span is None:
+            return []
+
+        row0, col0 = grid_row(lat), grid_col(lng)
+        max_ring = max(
+            row0 - rows.row_span[0], rows.row_span[1] - row0,
+            col0 - rows.col_span[0], rows.col_span[1] - col0,
+        )
+        lats, lngs, ids, cells = rows.lats, rows.lngs, rows.ids, rows.cells
+        heap = []  # (-distance, provider_id), the k best so far
+
+        for ring in range(max(max_ring, 0) + 1):
+            for grid_r in range(row0 - ring, row0 + ring + 1):
+                edge_row = grid_r in (row0 - ring, row0 + ring)
+                cols = range(col0 - ring, col0 + ring + 1) if edge_row else (col0 - ring, col0 + ring)
+                for grid_c in dict.fromkeys(cols):
+                    for row in cells.get(grid_r * GRID_COLUMNS + grid_c, ()):
+                        if not matches(row):
+                            continue
+                        distance = haversine_km(lat, lng, lats[row], lngs[row])
+                        if radius_km is not None and distance > radius_km:
+                            continue
+                        if len(heap) < k:
+                            heapq.heappush(heap, (-distance, ids[row]))
+                        elif distance < -heap[0][0]:
+                            heapq.heapreplace(heap, (-distance, ids[row]))
+
+            # Every unvisited cell is at least `ring` whole cells away; use the
+            # narrowest cell width the next ring can reach
+            edge_lat = min(abs(lat) + (ring + 1) * GRID_CELL_DEGREES, 89.9)
+            bound = ring * GRID_CELL_DEGREES * KM_PER_DEGREE * math.cos(math.radians(edge_lat))
+            if len(heap) == k and -heap[0][0] <= bound:
+                break
+            if radius_km is not None and bound >= radius_km:
+                break
+
+        return sorted(((provider_id, -neg) for neg, provider_id in heap), key=lambda item: item[1])
+
+    def within(self, lat, lng, radius_km, provider_type=None, animal_type_id=None):
+        """All (provider_id, distance_km) pairs within `radius_km`, nearest first."""
+        lat, lng = float(lat), float(lng)
+        rows = self._rows
+        matches = self._matcher(rows, provider_type, animal_type_id)
+        if matches is None:
+            return []
+
+        lats, lngs, ids, cells = rows.lats, rows.lngs, rows.ids, rows.cells
+        found = []
+        for first_cell, last_cell in covering_cell_ranges(lat, lng, radius_km):
+            for cell in range(first_cell, last_cell + 1):
+                for row in cells.get(cell, ()):
+                    if not matches(row):
+                        continue
+                    distance = haversine_km(lat, lng, lats[row], lngs[row])
+                    if distance <= radius_km:
+                        found.append((ids[row], distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+
+_index = ProviderGeoIndex()
+
+
+def get_provider_geo_index():
+    """The process-wide index, synchronised with the shared cache version."""
+    _index.sync()
+    return _index
@@ -0,0 +1,57 @@
+"""
+PetCarePlus v2 — Provider List Response Cache
+
+Shared, user-independent cache of /api/v1/providers/ list payloads.
+
+- Keys are built from the normalized query (sorted params, lat/lng snapped
+  to COORDINATE_SNAP_DECIMALS, profile location for implicit searches,
+  language, host) under the current list version.
+- Any ServiceProvider, ProviderService or ProviderAnimalType change bumps the
+  version (see signals); reviews reach it through the provider rating save.
+  Old entries simply become unreachable and expire.
+- Payloads are stored with is_favorite=False; the view layers the user's
+  favorites on top after reading the cache.
+- GPS searches run from the snapped point, so every caller in a cell gets
+  the same providers in the same order; the view re-measures each
+  `distance` from the caller's own coordinates.
+"""
+
+import hashlib
+import json
+
+from common.cache_versions import bump_cache_version, get_cache_version
+
+
+LIST_CACHE_VERSION_KEY = 'providers:list:version'
+LIST_CACHE_TIMEOUT = 60 * 15
+COORDINATE_SNAP_DECIMALS = 2  # ~1 km cells
+
+# Profile attributes an implicit (no query location) search depends on
+PROFILE_LOCATION_FIELDS = ('latitude', 'longitude', 'upazila_id', 'district_id')
+
+
+def snap_coordinate(value):
+    """Round a coordinate to the cache grid; unparsable values pass through."""
+    try:
+        return round(float(value), COORDINATE_SNAP_DECIMALS)
+    except (TypeError, ValueError):
+        return value
+
+
+def bump_list_cache_version():
+    """Invalidate every cached provider list payload."""
+    return bump_cache_version(LIST_CACHE_VERSION_KEY)
+
+
+def list_cache_key(query_params, language, host, profile_location=None):
+    """Versioned cache key for a normalized provider list query."""
+    params = {
+        name: [str(snap_coordinate(v)) if name in ('lat', 'lng') else v for v in values]
+        for name, values in query_params.lists()
+    }
+    normalized = json.dumps(
+        {'params': params, 'language': language, 'host': host, 'profile': profile_location},
+        sort_keys=True, default=str,
+    )
+    digest = hashlib.md5(normalized.encode('utf-8')).hexdigest()
+    return f'providers:list:{get_cache_version(LIST_CACHE_VERSION_KEY)}:{digest}'
@@ -0,0 +1,53 @@
+"""
+Management command to (re)compute the spatial grid cell of service providers.
+Migration 0004 fills the rows that existed then and build.sh reruns it on
+deploy; run it after any bulk coordinate import that bypassed
+ServiceProvider.save() (bulk_create, queryset.update).
+Run: python manage.py backfill_provider_grid_cells [--all] [--batch-size 1000]
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.providers.models import ServiceProvider
+from common.geo import grid_cell
+
+
+class Command(BaseCommand):
+    help = 'Backfills ServiceProvider.grid_cell from latitude/longitude'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute every provider, not only those with a missing cell',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        qs = ServiceProvider.objects.order_by('pk')
+        if not options['all']:
+            qs = qs.filter(grid_cell__isnull=True, latitude__isnull=False, longitude__isnull=False)
+
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                qs.filter(pk__gt=last_pk).only('pk', 'latitude', 'longitude', 'grid_cell')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            changed = []
+            for provider in batch:
+                cell = grid_cell(provider.latitude, provider.longitude)
+                if cell != provider.grid_cell:
+                    provider.grid_cell = cell
+                    changed.append(provider)
+
+            with transaction.atomic():
+                ServiceProvider.objects.bulk_update(changed, ['grid_cell'])
+            updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f'Updated grid cells for {updated} providers.'))
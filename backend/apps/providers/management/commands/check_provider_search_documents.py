@@ -0,0 +1,42 @@
+"""
+Management command to verify ProviderSearchDocument rows against their
+providers. Exits non-zero when drift is found, so it can run from cron/CI.
+Run: python manage.py check_provider_search_documents [--fix]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.providers.list_cache import bump_list_cache_version
+from apps.providers.models import ProviderSearchDocument
+from apps.providers.search_documents import check_search_documents, refresh_search_document
+
+
+class Command(BaseCommand):
+    help = 'Reports (and optionally repairs) stale provider search documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Re-render every inconsistent document')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        report = check_search_documents(batch_size=options['batch_size'])
+        problems = sum(len(ids) for ids in report.values())
+
+        for kind, ids in report.items():
+            if ids:
+                preview = ', '.join(str(pk) for pk in ids[:20]) + (' …' if len(ids) > 20 else '')
+                self.stdout.write(self.style.WARNING(f'{kind}: {len(ids)} ({preview})'))
+
+        if not problems:
+            self.stdout.write(self.style.SUCCESS('All provider search documents are consistent.'))
+            return
+
+        if options['fix']:
+            for provider_id in report['missing'] + report['stale']:
+                refresh_search_document(provider_id)
+            ProviderSearchDocument.objects.filter(pk__in=report['orphaned']).delete()
+            bump_list_cache_version()
+            self.stdout.write(self.style.SUCCESS(f'Repaired {problems} documents.'))
+            return
+
+        raise CommandError(f'{problems} inconsistent provider search documents (run with --fix).')
@@ -0,0 +1,29 @@
+"""
+Management command to (re)build ProviderSearchDocument rows.
+Needed after the table is created and after bulk writes that bypass signals
+(bulk_create, queryset.update, raw SQL).
+Run: python manage.py rebuild_provider_search_documents [--missing] [--batch-size 500]
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.providers.list_cache import bump_list_cache_version
+from apps.providers.search_documents import rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the denormalized provider search documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing', action='store_true',
+            help='Only build documents for providers that have none',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        written = rebuild_search_documents(
+            batch_size=options['batch_size'], missing_only=options['missing']
+        )
+        bump_list_cache_version()
+        self.stdout.write(self.style.SUCCESS(f'Built search documents for {written} providers.'))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:35
+
+from django.db import migrations, models
+
+from common.geo import grid_cell
+
+
+def backfill_grid_cells(apps, schema_editor):
+    # Radius and list searches filter on the cell, so located rows need one
+    ServiceProvider = apps.get_model('providers', 'ServiceProvider')
+    located = ServiceProvider.objects.filter(latitude__isnull=False, longitude__isnull=False).order_by('pk')
+    batch = []
+    for provider in located.only('pk', 'latitude', 'longitude').iterator(chunk_size=1000):
+        provider.grid_cell = grid_cell(provider.latitude, provider.longitude)
+        batch.append(provider)
+        if len(batch) == 1000:
+            ServiceProvider.objects.bulk_update(batch, ['grid_cell'])
+            batch = []
+    ServiceProvider.objects.bulk_update(batch, ['grid_cell'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('providers', '0003_rename_providers_s_divisio_05d3f2_idx_providers_s_divisio_cac7df_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='serviceprovider',
+            name='grid_cell',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, help_text='Spatial grid cell derived from latitude/longitude (see common.geo)', null=True),
+        ),
+        migrations.RunPython(backfill_grid_cells, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('providers', '0004_serviceprovider_grid_cell'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderSearchDocument',
+            fields=[
+                ('provider', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='providers.serviceprovider')),
+                ('business_name', models.CharField(max_length=100)),
+                ('description_en', models.TextField(blank=True)),
+                ('description_bn', models.TextField(blank=True)),
+                ('provider_type', models.CharField(choices=[('vet', 'Veterinarian / পশু চিকিৎসক'), ('groomer', 'Groomer / গ্রুমার'), ('sitter', 'Pet Sitter / পেট সিটার'), ('trainer', 'Trainer / প্রশিক্ষক'), ('pharmacy', 'Pharmacy / ফার্মেসি')], max_length=10)),
+                ('is_verified', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('division_id', models.IntegerField(blank=True, null=True)),
+                ('district_id', models.IntegerField(blank=True, null=True)),
+                ('upazila_id', models.IntegerField(blank=True, null=True)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('grid_cell', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('avg_rating', models.DecimalField(decimal_places=2, default=0, max_digits=3)),
+                ('total_reviews', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('animal_type_ids', models.CharField(blank=True, help_text='Comma-wrapped animal type IDs, e.g. ",1,4," (matched with contains)', max_length=255)),
+                ('service_names', models.TextField(blank=True, help_text='Service names in both languages, for search')),
+                ('price_min', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('price_max', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('card_en', models.JSONField(default=dict)),
+                ('card_bn', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Provider Search Document',
+                'verbose_name_plural': 'Provider Search Documents',
+                'ordering': ['-avg_rating', '-created_at'],
+                'indexes': [models.Index(fields=['is_verified', 'is_active', 'provider_type'], name='providers_p_is_veri_8e8f00_idx'), models.Index(fields=['division_id', 'district_id', 'upazila_id'], name='providers_p_divisio_25cbe7_idx'), models.Index(fields=['upazila_id'], name='providers_p_upazila_c17912_idx'), models.Index(fields=['district_id'], name='providers_p_distric_27b77d_idx'), models.Index(fields=['avg_rating'], name='providers_p_avg_rat_f68efd_idx')],
+            },
+        ),
+    ]
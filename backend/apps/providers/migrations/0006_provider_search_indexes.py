@@ -0,0 +1,48 @@
+# PostgreSQL-only full-text and trigram indexes for provider search
+# (see apps.providers.search); a no-op on other databases.
+
+from django.db import migrations
+
+
+# Frozen copy of apps.providers.search.search_index_statements() as of this
+# migration; the index expression must match what the search filter queries
+CREATE_STATEMENTS = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS providers_search_en_tsv ON "providers_providersearchdocument" '
+    "USING GIN ((to_tsvector('english'::regconfig, coalesce(\"business_name\", '') || ' ' || "
+    "coalesce(\"description_en\", '') || ' ' || coalesce(\"service_names\", ''))))",
+    'CREATE INDEX IF NOT EXISTS providers_search_business_name_trgm ON "providers_providersearchdocument" '
+    'USING GIN ("business_name" gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS providers_search_description_bn_trgm ON "providers_providersearchdocument" '
+    'USING GIN ("description_bn" gin_trgm_ops)',
+]
+DROP_STATEMENTS = [
+    'DROP INDEX IF EXISTS providers_search_en_tsv',
+    'DROP INDEX IF EXISTS providers_search_business_name_trgm',
+    'DROP INDEX IF EXISTS providers_search_description_bn_trgm',
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in CREATE_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in DROP_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('providers', '0005_providersearchdocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
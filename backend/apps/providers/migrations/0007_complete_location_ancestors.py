@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:40
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def complete_location_ancestors(apps, schema_editor):
+    """Fill district/division of providers that only set a lower level."""
+    ServiceProvider = apps.get_model('providers', 'ServiceProvider')
+    ProviderSearchDocument = apps.get_model('providers', 'ProviderSearchDocument')
+    Upazila = apps.get_model('locations', 'Upazila')
+    District = apps.get_model('locations', 'District')
+
+    ServiceProvider.objects.filter(district__isnull=True, upazila__isnull=False).update(district_id=Subquery(
+        Upazila.objects.filter(pk=OuterRef('upazila_id')).values('district_id')[:1]
+    ))
+    ServiceProvider.objects.filter(division__isnull=True, district__isnull=False).update(division_id=Subquery(
+        District.objects.filter(pk=OuterRef('district_id')).values('division_id')[:1]
+    ))
+
+    providers = ServiceProvider.objects.filter(pk=OuterRef('provider_id'))
+    ProviderSearchDocument.objects.update(
+        division_id=Subquery(providers.values('division_id')[:1]),
+        district_id=Subquery(providers.values('district_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_location_ancestors'),
+        ('providers', '0006_provider_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(complete_location_ancestors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0001_initial'),
+        ('providers', '0007_complete_location_ancestors'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='providersearchdocument',
+            name='animal_type_ids',
+        ),
+        migrations.AddIndex(
+            model_name='provideranimaltype',
+            index=models.Index(fields=['animal_type', 'provider'], name='providers_p_animal__910d04_idx'),
+        ),
+    ]
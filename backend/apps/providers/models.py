@@ -8,6 +8,9 @@ to a flat provider model with type field, plus individual services and animal ty
 from django.db import models
 from django.conf import settings
 from apps.accounts.models import DIVISION_CHOICES
+from apps.locations.ancestry import get_location_ancestry
+from apps.locations.geocoder import reverse_geocode
+from common.geo import grid_cell
 
 
 class ServiceProvider(models.Model):
@@ -55,6 +58,13 @@ class ServiceProvider(models.Model):
     union = models.ForeignKey('locations.Union', on_delete=models.SET_NULL, null=True, blank=True, related_name='providers')
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    grid_cell = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text='Spatial grid cell derived from latitude/longitude (see common.geo)'
+    )
 
     # Contact
     phone = models.CharField(max_length=15)
@@ -95,6 +105,35 @@ class ServiceProvider(models.Model):
     def __str__(self):
         return f'{self.business_name} ({self.provider_type})'
 
+    def save(self, *args, **kwargs):
+        # Keep the spatial key in step with the coordinates
+        self.grid_cell = grid_cell(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            update_fields = kwargs['update_fields'] = {*update_fields, 'grid_cell'}
+
+        # A provider placed only by coordinates gets its region from them
+        if not (self.upazila_id or self.district_id):
+            place = reverse_geocode(self.latitude, self.longitude)
+            if place:
+                self.division_id, self.district_id = place.division_id, place.district_id
+                self.upazila_id = self.upazila_id or place.upazila_id
+                self.union_id = self.union_id or place.union_id
+                if update_fields is not None:
+                    update_fields = kwargs['update_fields'] = {
+                        *update_fields, 'division', 'district', 'upazila', 'union',
+                    }
+
+        # Fill in missing ancestors of the location, so every hierarchy
+        # level is filterable on this row's own columns
+        if self.upazila_id or self.district_id:
+            self.division_id, self.district_id, _ = get_location_ancestry().ancestors(
+                self.division_id, self.district_id, self.upazila_id
+            )
+            if update_fields is not None and {'district', 'upazila'} & set(update_fields):
+                kwargs['update_fields'] = {*update_fields, 'division', 'district'}
+        super().save(*args, **kwargs)
+
 
 class ProviderService(models.Model):
     """
@@ -159,8 +198,74 @@ class ProviderAnimalType(models.Model):
         verbose_name = 'Provider Animal Type'
         verbose_name_plural = 'Provider Animal Types'
         unique_together = ('provider', 'animal_type')
+        indexes = [
+            # The provider list's animal filter: providers of an animal type
+            models.Index(fields=['animal_type', 'provider']),
+        ]
 
     def __str__(self):
         return f'{self.provider.business_name} → {self.animal_type.name_en}'
 
 
+
+
+class ProviderSearchDocument(models.Model):
+    """
+    Denormalized, single-table copy of a provider's list card.
+
+    Holds the filter/sort columns of the public provider list plus the fully
+    rendered card (ServiceProviderSerializer output) per language, so a list
+    page is read from this one table. Kept in step transactionally by
+    apps.providers.search_documents; see the rebuild/check management commands.
+    """
+
+    provider = models.OneToOneField(
+        ServiceProvider,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+
+    # Filter / sort / search columns (mirrors of ServiceProvider)
+    business_name = models.CharField(max_length=100)
+    description_en = models.TextField(blank=True)
+    description_bn = models.TextField(blank=True)
+    provider_type = models.CharField(max_length=10, choices=ServiceProvider.ProviderType.choices)
+    is_verified = models.BooleanField(default=False)
+    is_active = models.BooleanField(default=True)
+    division_id = models.IntegerField(null=True, blank=True)
+    district_id = models.IntegerField(null=True, blank=True)
+    upazila_id = models.IntegerField(null=True, blank=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    grid_cell = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    avg_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    total_reviews = models.IntegerField(default=0)
+    created_at = models.DateTimeField()
+
+    # Flattened relations (animal types are filtered through the indexed
+    # ProviderAnimalType table)
+    service_names = models.TextField(blank=True, help_text='Service names in both languages, for search')
+    price_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    price_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+
+    # Rendered cards (without per-request distance / is_favorite)
+    card_en = models.JSONField(default=dict)
+    card_bn = models.JSONField(default=dict)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Provider Search Document'
+        verbose_name_plural = 'Provider Search Documents'
+        ordering = ['-avg_rating', '-created_at']
+        indexes = [
+            models.Index(fields=['is_verified', 'is_active', 'provider_type']),
+            models.Index(fields=['division_id', 'district_id', 'upazila_id']),
+            models.Index(fields=['upazila_id']),
+            models.Index(fields=['district_id']),
+            models.Index(fields=['avg_rating']),
+        ]
+
+    def __str__(self):
+        return f'Search document: {self.business_name}'
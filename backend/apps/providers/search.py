@@ -0,0 +1,105 @@
+"""
+PetCarePlus v2 — Provider Text Search
+
+Indexed search for the public provider list (ProviderSearchDocument rows).
+
+On PostgreSQL:
+- English: `to_tsvector('english', …)` over business name, English
+  description and service names, backed by a GIN expression index
+- Bangla and business names: `ILIKE '%term%'`, backed by pg_trgm GIN indexes
+- Results are ordered by relevance (ts_rank + name similarity) blended with
+  avg_rating
+
+Other databases (SQLite in dev/tests) fall back to DRF's SearchFilter over
+the view's `search_fields`. The indexes are created by migration
+0006_provider_search_indexes on PostgreSQL only.
+"""
+
+from django.db import connections
+from django.db.models import BooleanField, ExpressionWrapper, F, FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+from rest_framework import filters
+
+from apps.providers.models import ProviderSearchDocument
+
+
+SEARCH_TABLE = ProviderSearchDocument._meta.db_table
+TRIGRAM_COLUMNS = ('business_name', 'description_bn')
+RATING_WEIGHT = 0.3  # Share of the score a 5-star rating is worth
+
+
+def english_tsvector_sql(table=None):
+    """The tsvector expression; must stay identical to the GIN index's."""
+    prefix = f'"{table}".' if table else ''
+    document = " || ' ' || ".join(
+        f"coalesce({prefix}\"{column}\", '')"
+        for column in ('business_name', 'description_en', 'service_names')
+    )
+    return f"to_tsvector('english'::regconfig, {document})"
+
+
+def search_index_statements():
+    """
+    (create, drop) SQL for the PostgreSQL search indexes. Migration 0006
+    holds a frozen copy; changing the expression needs a new migration.
+    """
+    create = [
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        f'CREATE INDEX IF NOT EXISTS providers_search_en_tsv ON "{SEARCH_TABLE}" '
+        f'USING GIN (({english_tsvector_sql()}))',
+    ] + [
+        f'CREATE INDEX IF NOT EXISTS providers_search_{column}_trgm ON "{SEARCH_TABLE}" '
+        f'USING GIN ("{column}" gin_trgm_ops)'
+        for column in TRIGRAM_COLUMNS
+    ]
+    drop = ['DROP INDEX IF EXISTS providers_search_en_tsv'] + [
+        f'DROP INDEX IF EXISTS providers_search_{column}_trgm' for column in TRIGRAM_COLUMNS
+    ]
+    return create, drop
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class ProviderSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter that uses the full-text/trigram indexes of the provider
+    search documents on PostgreSQL and the plain ILIKE scan elsewhere.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        indexed = (
+            queryset.model is ProviderSearchDocument
+            and connections[queryset.db].vendor == 'postgresql'
+        )
+        if not terms or not indexed:
+            return super().filter_queryset(request, queryset, view)
+
+        term = ' '.join(terms)
+        like = f'%{_escape_like(term)}%'
+        tsvector = english_tsvector_sql(SEARCH_TABLE)
+        tsquery = "plainto_tsquery('english'::regconfig, %s)"
+        columns = {column: f'"{SEARCH_TABLE}"."{column}"' for column in TRIGRAM_COLUMNS}
+
+        matches = RawSQL(
+            f"({tsvector} @@ {tsquery} OR "
+            + ' OR '.join(f'{sql} ILIKE %s' for sql in columns.values()) + ')',
+            [term] + [like] * len(columns),
+            output_field=BooleanField(),
+        )
+        relevance = RawSQL(
+            f"(ts_rank({tsvector}, {tsquery}) + similarity({columns['business_name']}, %s))",
+            [term, term],
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(
+            search_relevance=relevance,
+        ).annotate(
+            search_score=ExpressionWrapper(
+                F('search_relevance') + Cast('avg_rating', FloatField()) * (RATING_WEIGHT / 5),
+                output_field=FloatField(),
+            ),
+        ).order_by('-search_score', '-avg_rating')
@@ -0,0 +1,175 @@
+"""
+PetCarePlus v2 — Provider Search Documents
+
+Builds and maintains ProviderSearchDocument rows: the flattened list card of
+a provider (location names, animal types, services and price range, rating)
+rendered once per language by ServiceProviderSerializer, plus the columns the
+public list filters and sorts on. The animal filter joins no document column:
+it is a semi-join on the (animal_type, provider) index of ProviderAnimalType.
+
+Signals collect the providers a transaction touched and re-render each of
+their documents once, in one batch, when it commits (see
+`refresh_search_documents`). The `rebuild_provider_search_documents` and
+`check_provider_search_documents` commands cover bulk loads and drift,
+including a batch that failed after its commit.
+"""
+
+from django.db import transaction
+
+from apps.providers.models import ProviderSearchDocument, ServiceProvider
+
+
+LANGUAGES = ('en', 'bn')
+
+# Per-request fields layered on at read time
+REQUEST_FIELDS = ('distance', 'is_favorite')
+
+DOCUMENT_FIELDS = [
+    field.name for field in ProviderSearchDocument._meta.concrete_fields
+    if field.name not in ('provider', 'updated_at')
+]
+
+
+def provider_queryset():
+    """Providers with every relation a card needs."""
+    return ServiceProvider.objects.select_related(
+        'user', 'division', 'district', 'upazila', 'union'
+    ).prefetch_related('services', 'animal_types__animal_type')
+
+
+def render_card(provider, language):
+    """ServiceProviderSerializer output for one language, minus request fields."""
+    from apps.providers.serializers import ServiceProviderSerializer
+
+    card = dict(ServiceProviderSerializer(provider, context={'language': language}).data)
+    for name in REQUEST_FIELDS:
+        card.pop(name, None)
+    return card
+
+
+def document_values(provider):
+    """Column values of a provider's search document."""
+    services = list(provider.services.all())
+    prices = [service.price for service in services if service.price is not None]
+    cards = {language: render_card(provider, language) for language in LANGUAGES}
+
+    return {
+        'business_name': provider.business_name,
+        'description_en': provider.description_en,
+        'description_bn': provider.description_bn,
+        'provider_type': provider.provider_type,
+        'is_verified': provider.is_verified,
+        'is_active': provider.is_active,
+        'division_id': provider.division_id,
+        'district_id': provider.district_id,
+        'upazila_id': provider.upazila_id,
+        'latitude': provider.latitude,
+        'longitude': provider.longitude,
+        'grid_cell': provider.grid_cell,
+        'avg_rating': provider.avg_rating,
+        'total_reviews': provider.total_reviews,
+        'created_at': provider.created_at,
+        'service_names': ' '.join(
+            name for service in services for name in (service.name_en, service.name_bn) if name
+        ),
+        'price_min': min(prices) if prices else None,
+        'price_max': max(prices) if prices else None,
+        'card_en': cards['en'],
+        'card_bn': cards['bn'],
+    }
+
+
+def refresh_search_document(provider_id):
+    """Re-render one provider's document (or drop it if the provider is gone)."""
+    provider = provider_queryset().filter(pk=provider_id).first()
+    if provider is None:
+        ProviderSearchDocument.objects.filter(pk=provider_id).delete()
+        return None
+    document, _ = ProviderSearchDocument.objects.update_or_create(
+        provider=provider, defaults=document_values(provider)
+    )
+    return document
+
+
+def refresh_search_documents(provider_ids):
+    """Re-render several providers' documents (dropping those of deleted providers)."""
+    provider_ids = set(provider_ids)
+    with transaction.atomic():
+        providers = list(provider_queryset().filter(pk__in=provider_ids))
+        ProviderSearchDocument.objects.filter(
+            pk__in=provider_ids - {provider.pk for provider in providers}
+        ).delete()
+        for provider in providers:
+            ProviderSearchDocument.objects.update_or_create(
+                provider=provider, defaults=document_values(provider)
+            )
+
+
+def rebuild_search_documents(batch_size=500, missing_only=False):
+    """(Re)build documents in keyset batches; returns the number written."""
+    qs = provider_queryset().order_by('pk')
+    if missing_only:
+        qs = qs.filter(search_document__isnull=True)
+
+    written = 0
+    last_pk = 0
+    while True:
+        batch = list(qs.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return written
+        last_pk = batch[-1].pk
+        with transaction.atomic():
+            existing = set(
+                ProviderSearchDocument.objects.filter(provider__in=batch).values_list('pk', flat=True)
+            )
+            ProviderSearchDocument.objects.filter(pk__in=existing).delete()
+            ProviderSearchDocument.objects.bulk_create([
+                ProviderSearchDocument(provider=provider, **document_values(provider))
+                for provider in batch
+            ])
+        written += len(batch)
+
+
+def _normalized(values):
+    """Compare documents the way they round-trip through the database."""
+    field_map = {field.name: field for field in ProviderSearchDocument._meta.concrete_fields}
+    return {
+        name: field_map[name].to_python(value) if value is not None else None
+        for name, value in values.items()
+    }
+
+
+def check_search_documents(batch_size=500):
+    """
+    Compare stored documents with freshly rendered ones.
+
+    Returns a dict of provider ID lists: 'missing' (no document), 'stale'
+    (document differs from its provider) and 'orphaned' (document without a
+    provider, e.g. after raw SQL deletes).
+    """
+    report = {'missing': [], 'stale': [], 'orphaned': []}
+    seen = set()
+    last_pk = 0
+    while True:
+        batch = list(provider_queryset().filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        stored = {
+            doc['provider_id']: doc
+            for doc in ProviderSearchDocument.objects.filter(provider__in=batch).values('provider_id', *DOCUMENT_FIELDS)
+        }
+        for provider in batch:
+            seen.add(provider.pk)
+            document = stored.get(provider.pk)
+            if document is None:
+                report['missing'].append(provider.pk)
+                continue
+            document.pop('provider_id')
+            if _normalized(document) != _normalized(document_values(provider)):
+                report['stale'].append(provider.pk)
+
+    report['orphaned'] = [
+        pk for pk in ProviderSearchDocument.objects.values_list('pk', flat=True) if pk not in seen
+    ]
+    return report
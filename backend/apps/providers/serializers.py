@@ -5,14 +5,16 @@ Bilingual serializers for ServiceProvider and ProviderService.
 Handles relation linking for supported animal types and services.
 """
 
+from django.db import transaction
 from rest_framework import serializers
-from common.mixins import BilingualMixin
+from common.fieldsets import SparseFieldsetsMixin
+from common.mixins import BilingualMixin, get_request_language
 from apps.animals.models import AnimalType
 from apps.animals.serializers import AnimalTypeSerializer
 from apps.providers.models import ServiceProvider, ProviderService, ProviderAnimalType
 
 
-class ProviderServiceSerializer(BilingualMixin, serializers.ModelSerializer):
+class ProviderServiceSerializer(SparseFieldsetsMixin, BilingualMixin, serializers.ModelSerializer):
     """
     Serializer for individual services offered by a provider.
     """
@@ -36,7 +38,7 @@ class ProviderServiceSerializer(BilingualMixin, serializers.ModelSerializer):
         return self.get_bilingual_field(obj, 'description')
 
 
-class ServiceProviderSerializer(BilingualMixin, serializers.ModelSerializer):
+class ServiceProviderSerializer(SparseFieldsetsMixin, BilingualMixin, serializers.ModelSerializer):
     """
     Serializer for the ServiceProvider profile.
     Dynamically maps bilingual description and handles updates for linked animal types.
@@ -85,6 +87,9 @@ class ServiceProviderSerializer(BilingualMixin, serializers.ModelSerializer):
         return self.get_bilingual_field(obj, 'description')
 
     def get_is_favorite(self, obj):
+        saved_items = self.context.get('saved_items')
+        if saved_items is not None:
+            return saved_items.is_saved(obj)
         return getattr(obj, 'is_saved', False)
 
     def get_supported_animal_types(self, obj):
@@ -105,6 +110,8 @@ class ServiceProviderSerializer(BilingualMixin, serializers.ModelSerializer):
                 raise serializers.ValidationError(f"Animal type with ID {at_id} does not exist.")
         return value
 
+    # Atomic, so the provider's derived data is refreshed once for all its rows
+    @transaction.atomic
     def create(self, validated_data):
         animal_type_ids = validated_data.pop('animal_type_ids', [])
         provider = ServiceProvider.objects.create(**validated_data)
@@ -116,6 +123,7 @@ class ServiceProviderSerializer(BilingualMixin, serializers.ModelSerializer):
             
         return provider
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         animal_type_ids = validated_data.pop('animal_type_ids', None)
         instance = super().update(instance, validated_data)
@@ -128,3 +136,19 @@ class ServiceProviderSerializer(BilingualMixin, serializers.ModelSerializer):
                 ProviderAnimalType.objects.create(provider=instance, animal_type=animal_type)
                 
         return instance
+
+
+class ProviderSearchDocumentSerializer(SparseFieldsetsMixin, serializers.BaseSerializer):
+    """
+    Read-only serializer for list pages served from ProviderSearchDocument.
+    Emits the pre-rendered ServiceProviderSerializer card for the request
+    language, with the per-request distance and is_favorite layered on.
+    """
+
+    def to_representation(self, document):
+        language = get_request_language(self.context.get('request'))
+        data = dict(document.card_en if language == 'en' else document.card_bn)
+        if hasattr(document, 'distance'):
+            data['distance'] = None if document.distance is None else float(document.distance)
+        data['is_favorite'] = False  # Layered on per user by the view
+        return self.sparse_representation(data)
@@ -0,0 +1,116 @@
+"""
+PetCarePlus v2 — Service Providers Signals
+
+Keep derived provider data in step, once per transaction however many rows
+it wrote (see common.transactions):
+- on commit, the search documents of the touched providers are re-rendered
+  in one batch, and the shared list response cache is versioned out
+- the in-process geo index of every worker is told which providers moved
+  (location or visibility changes)
+
+Reviews reach all three through the provider rating save they trigger.
+Verification changes also version out the owner's cached user and JWT
+claims (see accounts.tokens).
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.accounts.user_cache import invalidate_cached_user
+from apps.providers.geo_index import INDEXED_FIELDS, mark_provider_changed
+from apps.providers.list_cache import bump_list_cache_version
+from apps.providers.models import ServiceProvider, ProviderService, ProviderAnimalType, ProviderSearchDocument
+from apps.providers.search_documents import refresh_search_documents
+from common.transactions import on_commit_batch, on_commit_once
+
+# Owner fields shown on the provider card
+CARD_USER_FIELDS = frozenset({'full_name', 'email'})
+
+
+def _refresh_documents(provider_ids):
+    try:
+        refresh_search_documents(provider_ids)
+    finally:
+        # After the new documents are in, so no page is cached from old ones
+        bump_list_cache_version()
+
+
+def refresh_provider_document(provider_id):
+    """Re-render the provider's search document (and lists) once the transaction commits."""
+    # Robust: the writes are committed either way; the checker repairs a failed render
+    on_commit_batch('providers:search_documents', provider_id, _refresh_documents, robust=True)
+
+
+def publish_provider_change(provider_id):
+    """Bump the geo index version once the surrounding transaction commits."""
+    on_commit_batch(
+        'providers:geo_index', provider_id,
+        lambda provider_ids: [mark_provider_changed(pk) for pk in provider_ids],
+    )
+
+
+def invalidate_provider_lists():
+    """Bump the list cache version once the surrounding transaction commits."""
+    on_commit_once('providers:list_cache', bump_list_cache_version)
+
+
+def invalidate_provider_claims(user_id):
+    """Version out the owner's cached user/claims, now and on commit."""
+    invalidate_cached_user(user_id)
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
+
+
+@receiver(post_save, sender=ServiceProvider)
+def on_provider_saved(sender, instance, update_fields=None, **kwargs):
+    refresh_provider_document(instance.pk)
+    if update_fields is None or 'is_verified' in update_fields:
+        invalidate_provider_claims(instance.user_id)
+    # Rating/profile-only saves (e.g. review aggregation) cannot move a row
+    if update_fields is not None and not INDEXED_FIELDS & set(update_fields):
+        return
+    publish_provider_change(instance.pk)
+
+
+@receiver(post_delete, sender=ServiceProvider)
+def on_provider_deleted(sender, instance, **kwargs):
+    invalidate_provider_lists()
+    invalidate_provider_claims(instance.user_id)
+    publish_provider_change(instance.pk)
+
+
+def deleted_with_provider(origin):
+    """True when a child row is removed by deleting its provider (or user)."""
+    model = getattr(origin, 'model', type(origin))
+    return model in (ServiceProvider, ServiceProvider.user.field.related_model)
+
+
+@receiver(post_save, sender=ProviderAnimalType)
+@receiver(post_delete, sender=ProviderAnimalType)
+def on_provider_animal_type_changed(sender, instance, origin=None, **kwargs):
+    if deleted_with_provider(origin):
+        return
+    refresh_provider_document(instance.provider_id)
+    publish_provider_change(instance.provider_id)
+
+
+@receiver(post_save, sender=ProviderService)
+@receiver(post_delete, sender=ProviderService)
+def on_provider_service_changed(sender, instance, origin=None, **kwargs):
+    if deleted_with_provider(origin):
+        return
+    refresh_provider_document(instance.provider_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def on_provider_user_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    # Only provider accounts have cards, and only their name and email are on it
+    if created or instance.role != 'provider':
+        return
+    if update_fields is not None and not CARD_USER_FIELDS & set(update_fields):
+        return
+    cards = ProviderSearchDocument.objects.filter(provider__user_id=instance.pk).values_list('pk', 'card_en')
+    for provider_id, card in cards:
+        if (card.get('user_name'), card.get('user_email')) != (instance.full_name, instance.email):
+            refresh_provider_document(provider_id)
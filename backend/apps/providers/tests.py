@@ -160,3 +160,619 @@ class ProvidersAPITests(APITestCase):
         # Verify in database
         service = ProviderService.objects.get(id=service_id)
         self.assertFalse(service.is_active)
+
+
+class ProviderCascadeTests(APITestCase):
+    """
+    Tests for the single-query location cascade behind the provider list.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.locations.models import Division, District, Upazila
+
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.division = Division.objects.create(name_en='Dhaka', name_bn='ঢাকা')
+            self.district = District.objects.create(division=self.division, name_en='Dhaka', name_bn='ঢাকা')
+            self.other_district = District.objects.create(division=self.division, name_en='Gazipur', name_bn='গাজীপুর')
+            self.upazila = Upazila.objects.create(district=self.district, name_en='Gulshan', name_bn='গুলশান')
+            self.other_upazila = Upazila.objects.create(district=self.other_district, name_en='Kaliakair', name_bn='কালিয়াকৈর')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.near = self._provider('near', self.upazila, lat=23.7925, lng=90.4078, rating=3.0)
+            self.same_upazila = self._provider('same-upazila', self.upazila, lat=None, lng=None, rating=4.5)
+            self.far = self._provider('far', self.other_upazila, lat=24.0900, lng=90.2000, rating=5.0)
+
+        self.list_url = reverse('serviceprovider-list')
+
+    def _provider(self, slug, upazila, lat, lng, rating):
+        user = User.objects.create_user(
+            email=f'{slug}@test.com', password='password123',
+            full_name=slug, role='provider'
+        )
+        return ServiceProvider.objects.create(
+            user=user, business_name=slug, provider_type='vet', phone='01700000000',
+            division=upazila.district.division, district=upazila.district, upazila=upazila,
+            latitude=lat, longitude=lng, is_verified=True, avg_rating=rating
+        )
+
+    def test_radius_search_returns_nearby_providers_only(self):
+        response = self.client.get(self.list_url, {'lat': '23.7930', 'lng': '90.4080'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [p['id'] for p in response.data['results']]
+        self.assertEqual(ids, [self.near.id])
+        self.assertIs(response.data['exact_match_found'], True)
+        self.assertEqual(response.data['resolved_level'], 'exact')
+
+    def test_radius_search_falls_back_to_upazila(self):
+        response = self.client.get(self.list_url, {
+            'lat': '22.3569', 'lng': '91.7832', 'upazila_id': self.upazila.id
+        })
+        ids = [p['id'] for p in response.data['results']]
+        self.assertEqual(ids, [self.same_upazila.id, self.near.id])  # Ordered by rating
+        self.assertIs(response.data['exact_match_found'], False)
+        self.assertEqual(response.data['resolved_level'], 'fallback')
+
+    def test_radius_search_without_matches_is_empty_fallback(self):
+        response = self.client.get(self.list_url, {'lat': '22.3569', 'lng': '91.7832'})
+        self.assertEqual(response.data['count'], 0)
+        self.assertFalse(response.data['exact_match_found'])
+
+    def test_region_search_is_strict(self):
+        response = self.client.get(self.list_url, {'district_id': self.other_district.id})
+        ids = [p['id'] for p in response.data['results']]
+        self.assertEqual(ids, [self.far.id])
+        self.assertTrue(response.data['exact_match_found'])
+
+    def test_profile_cascade_resolves_in_single_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from common.utils import get_local_providers, cascade_metadata
+
+        profile = type('Profile', (), {'upazila_id': None, 'district_id': self.other_district.id})()
+        with CaptureQueriesContext(connection) as ctx:
+            rows = list(get_local_providers(user=profile).prefetch_related(None))
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual([p.id for p in rows], [self.far.id])
+        self.assertEqual(cascade_metadata(rows), (True, 'exact'))
+
+        profile.district_id = 999999
+        rows = list(get_local_providers(user=profile))
+        self.assertEqual(len(rows), 3)  # Global fallback
+        self.assertEqual(cascade_metadata(rows), (False, 'fallback'))
+
+    def test_upazila_fills_in_location_ancestors(self):
+        from apps.locations.models import Upazila
+        from common.utils import get_local_providers, cascade_metadata
+
+        user = User.objects.create_user(email='partial@test.com', password='password123', full_name='partial')
+        partial = ServiceProvider.objects.create(
+            user=user, business_name='partial', provider_type='vet', phone='01700000000',
+            upazila=self.other_upazila, is_verified=True, avg_rating=1.0
+        )
+        self.assertEqual((partial.district_id, partial.division_id), (self.other_district.id, self.division.id))
+
+        # A profile with only an upazila falls back to that upazila's district
+        with self.captureOnCommitCallbacks(execute=True):
+            sreepur = Upazila.objects.create(district=self.other_district, name_en='Sreepur', name_bn='শ্রীপুর')
+        profile = type('Profile', (), {'upazila_id': sreepur.id, 'district_id': None})()
+        rows = list(get_local_providers(user=profile))
+        self.assertEqual([p.id for p in rows], [self.far.id, partial.id])
+        self.assertEqual(rows[0].cascade_level, 2)  # District level
+        self.assertEqual(cascade_metadata(rows), (True, 'exact'))
+
+    def test_grid_cell_follows_coordinates(self):
+        from common.geo import grid_cell
+
+        self.assertEqual(self.near.grid_cell, grid_cell(23.7925, 90.4078))
+        self.assertIsNone(self.same_upazila.grid_cell)
+
+        self.near.latitude, self.near.longitude = 22.3569, 91.7832
+        self.near.save(update_fields=['latitude', 'longitude'])
+        self.near.refresh_from_db()
+        self.assertEqual(self.near.grid_cell, grid_cell(22.3569, 91.7832))
+
+    def test_radius_search_spans_neighbouring_cells(self):
+        from common.geo import grid_cell
+
+        # 23.80 is a row boundary: the point and the provider sit in different cells
+        with self.captureOnCommitCallbacks(execute=True):
+            edge = self._provider('edge', self.other_upazila, lat=23.8050, lng=90.4078, rating=1.0)
+        self.assertNotEqual(edge.grid_cell, grid_cell(23.7990, 90.4078))
+
+        response = self.client.get(self.list_url, {'lat': '23.7990', 'lng': '90.4078'})
+        ids = {p['id'] for p in response.data['results']}
+        self.assertEqual(ids, {self.near.id, edge.id})
+
+    def test_backfill_command_fills_missing_cells(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        ServiceProvider.objects.update(grid_cell=None)
+        call_command('backfill_provider_grid_cells', stdout=StringIO())
+
+        self.near.refresh_from_db()
+        self.far.refresh_from_db()
+        self.assertIsNotNone(self.near.grid_cell)
+        self.assertIsNotNone(self.far.grid_cell)
+        self.assertFalse(ServiceProvider.objects.filter(pk=self.same_upazila.pk, grid_cell__isnull=False).exists())
+
+
+class ProviderGeoIndexTests(APITestCase):
+    """
+    Tests for the in-process nearest-provider index and its cache-driven refresh.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.cat_type = AnimalType.objects.create(
+            name_en='Cat', name_bn='বিড়াল', slug='cat',
+            category='companion', icon='cat',
+            supports_rehoming=True, supports_services=True
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.gulshan = self._provider('gulshan', 23.7925, 90.4078, 'vet')
+            self.mirpur = self._provider('mirpur', 23.8223, 90.3654, 'groomer')
+            self.gazipur = self._provider('gazipur', 23.9999, 90.4203, 'vet')
+            self.chattogram = self._provider('chattogram', 22.3569, 91.7832, 'vet')
+            ProviderAnimalType.objects.create(provider=self.mirpur, animal_type=self.cat_type)
+
+    def _provider(self, slug, lat, lng, provider_type):
+        user = User.objects.create_user(
+            email=f'{slug}@test.com', password='password123',
+            full_name=slug, role='provider'
+        )
+        return ServiceProvider.objects.create(
+            user=user, business_name=slug, provider_type=provider_type, phone='01700000000',
+            latitude=lat, longitude=lng, is_verified=True
+        )
+
+    def _index(self):
+        from apps.providers.geo_index import ProviderGeoIndex
+
+        index = ProviderGeoIndex()
+        index.sync()
+        return index
+
+    def test_nearest_orders_by_distance_across_rings(self):
+        ids = [pk for pk, _ in self._index().nearest(23.7930, 90.4080, k=3)]
+        self.assertEqual(ids, [self.gulshan.id, self.mirpur.id, self.gazipur.id])
+
+    def test_nearest_applies_type_animal_and_radius_filters(self):
+        index = self._index()
+        self.assertEqual(
+            [pk for pk, _ in index.nearest(23.7930, 90.4080, k=5, provider_type='vet')],
+            [self.gulshan.id, self.gazipur.id, self.chattogram.id],
+        )
+        self.assertEqual(
+            [pk for pk, _ in index.nearest(23.7930, 90.4080, k=5, animal_type_id=self.cat_type.id)],
+            [self.mirpur.id],
+        )
+        self.assertEqual(
+            [pk for pk, _ in index.within(23.7930, 90.4080, radius_km=10)],
+            [self.gulshan.id, self.mirpur.id],
+        )
+
+    def test_index_refreshes_incrementally_on_provider_change(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        index = self._index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.gulshan.is_active = False
+            self.gulshan.save()
+
+        with CaptureQueriesContext(connection) as ctx:
+            index.sync()
+        # Only the changed provider and its animal links are re-read
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertTrue(all('IN (' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.nearest(23.7930, 90.4080, k=1)[0][0], self.mirpur.id)
+
+    def test_queries_during_a_refresh_see_the_previous_generation(self):
+        from unittest import mock
+        from apps.providers.geo_index import _GeoRows
+
+        index = self._index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.gulshan.latitude, self.gulshan.longitude = 21.4272, 92.0058
+            self.gulshan.save()
+
+        seen = []
+        upsert = _GeoRows.upsert
+
+        def upsert_and_query(rows, *args):
+            upsert(rows, *args)
+            seen.append([pk for pk, _ in index.nearest(23.7930, 90.4080, k=4)])
+
+        with mock.patch.object(_GeoRows, 'upsert', upsert_and_query):
+            index.sync()
+        self.assertEqual(seen, [[self.gulshan.id, self.mirpur.id, self.gazipur.id, self.chattogram.id]])
+        self.assertEqual(
+            [pk for pk, _ in index.nearest(23.7930, 90.4080, k=4)],
+            [self.mirpur.id, self.gazipur.id, self.chattogram.id, self.gulshan.id],
+        )
+
+    def test_rating_updates_do_not_bump_the_version(self):
+        from django.core.cache import cache
+        from apps.providers.geo_index import VERSION_CACHE_KEY
+
+        self._index()
+        version = cache.get(VERSION_CACHE_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.gazipur.avg_rating = 4
+            self.gazipur.save(update_fields=['avg_rating'])
+        self.assertEqual(cache.get(VERSION_CACHE_KEY), version)
+
+    def test_list_nearest_mode_reports_final_radius(self):
+        url = reverse('serviceprovider-list')
+        response = self.client.get(url, {'lat': '23.7930', 'lng': '90.4080', 'nearest': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([p['id'] for p in response.data['results']], [self.gulshan.id, self.mirpur.id])
+        self.assertEqual(response.data['search_radius_km'], 8.0)
+        self.assertIs(response.data['exact_match_found'], True)
+
+        # Chattogram is beyond the maximum radius: stop there and say so
+        response = self.client.get(url, {'lat': '23.7930', 'lng': '90.4080', 'nearest': 10})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['search_radius_km'], 128.0)
+        self.assertIs(response.data['exact_match_found'], False)
+
+    def test_nearest_expands_in_radius_steps_until_enough_are_found(self):
+        from unittest import mock
+        from apps.providers.geo_index import get_provider_geo_index
+        from common.utils import get_nearest_providers
+
+        index = get_provider_geo_index()
+        with mock.patch.object(index, 'nearest', wraps=index.nearest) as nearest:
+            qs, radius, satisfied = get_nearest_providers(23.7930, 90.4080, 2)
+        self.assertEqual([call.kwargs['radius_km'] for call in nearest.call_args_list], [2.0, 4.0, 8.0])
+        self.assertEqual((radius, satisfied), (8.0, True))
+        self.assertEqual([p.id for p in qs], [self.gulshan.id, self.mirpur.id])
+
+    def test_list_nearest_mode_validates_input(self):
+        url = reverse('serviceprovider-list')
+        self.assertEqual(self.client.get(url, {'nearest': 3}).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'lat': '23.79', 'lng': '90.40', 'nearest': 500})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProviderListCacheTests(APITestCase):
+    """
+    Tests for the shared, versioned provider list response cache.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider = self._provider('clinic', 23.7925, 90.4078)
+            self.other = self._provider('other', 23.7930, 90.4090)
+        self.customer = User.objects.create_user(
+            email='customer@test.com', password='password123', full_name='Customer'
+        )
+        self.list_url = reverse('serviceprovider-list')
+
+    def _provider(self, slug, lat, lng):
+        user = User.objects.create_user(
+            email=f'{slug}@test.com', password='password123',
+            full_name=slug, role='provider'
+        )
+        return ServiceProvider.objects.create(
+            user=user, business_name=slug, provider_type='vet', phone='01700000000',
+            latitude=lat, longitude=lng, is_verified=True
+        )
+
+    def test_repeated_query_is_served_from_cache(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        first = self.client.get(self.list_url, {'lat': '23.79301', 'lng': '90.40802'})
+        # Same ~1 km cell, different raw coordinates: same cached payload
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(self.list_url, {'lat': '23.79298', 'lng': '90.40799'})
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual([p['id'] for p in first.data['results']], [p['id'] for p in second.data['results']])
+
+        # Distances are measured from each caller's own point
+        from common.geo import haversine_km
+        for response, (lat, lng) in ((first, (23.79301, 90.40802)), (second, (23.79298, 90.40799))):
+            item = response.data['results'][0]
+            expected = haversine_km(lat, lng, float(item['latitude']), float(item['longitude']))
+            self.assertAlmostEqual(item['distance'], expected, places=3)
+
+    def test_provider_change_invalidates_cached_lists(self):
+        self.assertEqual(self.client.get(self.list_url).data['count'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.is_active = False
+            self.other.save()
+        self.assertEqual(self.client.get(self.list_url).data['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProviderService.objects.create(provider=self.provider, name_en='Checkup', price=500)
+        results = self.client.get(self.list_url).data['results']
+        self.assertEqual([s['name_en'] for s in results[0]['services']], ['Checkup'])
+
+    def test_favorites_are_layered_on_the_shared_payload(self):
+        from django.contrib.contenttypes.models import ContentType
+        from apps.accounts.models import SavedItem
+
+        anonymous = self.client.get(self.list_url).data['results']
+        self.assertFalse(any(item['is_favorite'] for item in anonymous))
+
+        SavedItem.objects.create(
+            user=self.customer, object_id=self.provider.id,
+            content_type=ContentType.objects.get_for_model(ServiceProvider),
+        )
+        self.client.force_authenticate(self.customer)
+        results = self.client.get(self.list_url).data['results']
+        favorites = {item['id']: item['is_favorite'] for item in results}
+        self.assertEqual(favorites, {self.provider.id: True, self.other.id: False})
+
+        # The shared entry itself stays user-independent
+        self.client.force_authenticate(None)
+        self.assertFalse(any(item['is_favorite'] for item in self.client.get(self.list_url).data['results']))
+
+
+class ProviderSearchDocumentTests(APITestCase):
+    """
+    Tests for the denormalized provider search documents behind the list.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.cat_type = AnimalType.objects.create(
+            name_en='Cat', name_bn='বিড়াল', slug='cat',
+            category='companion', icon='cat',
+            supports_rehoming=True, supports_services=True
+        )
+        user = User.objects.create_user(
+            email='clinic@test.com', password='password123',
+            full_name='Clinic Owner', role='provider'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider = ServiceProvider.objects.create(
+                user=user, business_name='Clinic', provider_type='vet', phone='01700000000',
+                description_en='Cats welcome', description_bn='বিড়াল স্বাগতম', is_verified=True
+            )
+            ProviderAnimalType.objects.create(provider=self.provider, animal_type=self.cat_type)
+            ProviderService.objects.create(provider=self.provider, name_en='Checkup', name_bn='চেকআপ', price=500)
+            ProviderService.objects.create(provider=self.provider, name_en='Surgery', price=3000)
+        self.list_url = reverse('serviceprovider-list')
+
+    def test_document_tracks_provider_and_related_rows(self):
+        from apps.providers.models import ProviderSearchDocument
+        from apps.providers.serializers import ServiceProviderSerializer
+
+        document = ProviderSearchDocument.objects.get(pk=self.provider.pk)
+        self.assertEqual((document.price_min, document.price_max), (500, 3000))
+        self.assertIn('চেকআপ', document.service_names)
+
+        expected = dict(ServiceProviderSerializer(self.provider, context={'language': 'en'}).data)
+        expected.pop('distance', None)
+        expected.pop('is_favorite')
+        self.assertEqual(document.card_en, expected)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider.user.full_name = 'Renamed Owner'
+            self.provider.user.save()
+        document.refresh_from_db()
+        self.assertEqual(document.card_bn['user_name'], 'Renamed Owner')
+
+    def test_a_transaction_renders_each_document_once(self):
+        from unittest import mock
+        from django.db import transaction
+        from apps.providers import search_documents
+
+        dog = AnimalType.objects.create(
+            name_en='Dog', name_bn='কুকুর', slug='dog', category='companion', icon='dog', supports_services=True
+        )
+        with mock.patch.object(search_documents, 'document_values', wraps=search_documents.document_values) as render:
+            with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+                self.provider.animal_types.all().delete()
+                for animal_type in (self.cat_type, dog):
+                    ProviderAnimalType.objects.create(provider=self.provider, animal_type=animal_type)
+                ProviderService.objects.create(provider=self.provider, name_en='Bath', price=300)
+        self.assertEqual(render.call_count, 1)
+        card = self.client.get(self.list_url, HTTP_ACCEPT_LANGUAGE='en').data['results'][0]
+        self.assertEqual({a['name'] for a in card['supported_animal_types']}, {'Cat', 'Dog'})
+
+    def test_owner_saves_off_the_card_skip_the_document(self):
+        owner = self.provider.user
+        with self.assertNumQueries(1):  # The UPDATE alone
+            owner.last_login = owner.date_joined
+            owner.save(update_fields=['last_login'])
+        customer = User.objects.create_user(email='customer@test.com', password='password123', full_name='Customer')
+        with self.assertNumQueries(1):
+            customer.full_name = 'Renamed Customer'
+            customer.save(update_fields=['full_name'])
+
+    def test_list_is_a_single_table_read(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, {'animal_type': self.cat_type.id}, HTTP_ACCEPT_LANGUAGE='en')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        card = response.data['results'][0]
+        self.assertEqual(card['description'], 'Cats welcome')
+        self.assertEqual([s['name'] for s in card['services']], ['Checkup', 'Surgery'])
+        self.assertEqual(card['supported_animal_types'][0]['name'], 'Cat')
+        self.assertIs(card['is_favorite'], False)
+
+        self.assertEqual(len(ctx.captured_queries), 2)  # COUNT + page
+        for query in ctx.captured_queries:
+            self.assertNotIn('JOIN', query['sql'])
+
+        # The animal filter is an indexed semi-join, not a LIKE scan
+        self.assertIn('"animal_type_id" =', ctx.captured_queries[-1]['sql'])
+        self.assertNotIn('LIKE', ctx.captured_queries[-1]['sql'])
+        response = self.client.get(self.list_url, {'animal_type': self.cat_type.id + 1})
+        self.assertEqual(response.data['count'], 0)
+
+    def test_checker_reports_and_repairs_drift(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        call_command('check_provider_search_documents', stdout=StringIO())
+
+        # Bulk updates bypass signals
+        ServiceProvider.objects.filter(pk=self.provider.pk).update(business_name='Renamed Clinic')
+        with self.assertRaises(CommandError):
+            call_command('check_provider_search_documents', stdout=StringIO())
+
+        call_command('check_provider_search_documents', '--fix', stdout=StringIO())
+        call_command('check_provider_search_documents', stdout=StringIO())
+        self.assertEqual(self.client.get(self.list_url).data['results'][0]['business_name'], 'Renamed Clinic')
+
+    def test_rebuild_and_provider_delete(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from apps.providers.models import ProviderSearchDocument
+
+        ProviderSearchDocument.objects.all().delete()
+        call_command('rebuild_provider_search_documents', '--missing', stdout=StringIO())
+        self.assertTrue(ProviderSearchDocument.objects.filter(pk=self.provider.pk).exists())
+
+        self.provider.delete()
+        self.assertFalse(ProviderSearchDocument.objects.exists())
+
+    def test_search_falls_back_to_ilike_on_sqlite(self):
+        response = self.client.get(self.list_url, {'search': 'স্বাগতম'})
+        self.assertEqual([p['id'] for p in response.data['results']], [self.provider.id])
+        response = self.client.get(self.list_url, {'search': 'parrot'})
+        self.assertEqual(response.data['count'], 0)
+
+    def test_migrated_indexes_match_the_search_expression(self):
+        import importlib
+        from apps.providers.search import search_index_statements
+
+        migration = importlib.import_module('apps.providers.migrations.0006_provider_search_indexes')
+        self.assertEqual(
+            (migration.CREATE_STATEMENTS, migration.DROP_STATEMENTS),
+            search_index_statements(),
+        )
+
+
+class ProviderCursorPaginationTests(APITestCase):
+    """
+    Tests for opt-in keyset pagination of the provider list.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            ratings = [4.5, 3.0, 4.5, 5.0, 3.0, 4.5]
+            self.providers = [
+                self._provider(f'p{index}', 23.79 + index * 0.01, 90.40, rating)
+                for index, rating in enumerate(ratings)
+            ]
+        self.list_url = reverse('serviceprovider-list')
+
+    def _provider(self, slug, lat, lng, rating):
+        user = User.objects.create_user(
+            email=f'{slug}@test.com', password='password123',
+            full_name=slug, role='provider'
+        )
+        return ServiceProvider.objects.create(
+            user=user, business_name=slug, provider_type='vet', phone='01700000000',
+            latitude=lat, longitude=lng, is_verified=True, avg_rating=rating
+        )
+
+    def _walk(self, params):
+        ids, pages = [], 0
+        response = self.client.get(self.list_url, {**params, 'pagination': 'cursor', 'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [p['id'] for p in response.data['results']]
+            pages += 1
+            if not response.data['next']:
+                return ids, pages, response
+            response = self.client.get(response.data['next'])
+
+    def test_cursor_pages_match_page_number_order(self):
+        expected = [p['id'] for p in self.client.get(self.list_url, {'page_size': 100}).data['results']]
+        ids, pages, response = self._walk({})
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+        self.assertEqual(response.data['count'], 6)
+        self.assertTrue(response.data['count_is_estimate'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_cursor_pages_follow_distance_order(self):
+        ids, _, _ = self._walk({'lat': '23.7900', 'lng': '90.4000', 'nearest': '5'})
+        self.assertEqual(ids, [p.id for p in self.providers[:5]])
+
+        ids, _, _ = self._walk({'lat': '23.7900', 'lng': '90.4000'})
+        self.assertEqual(sorted(ids), sorted(p.id for p in self.providers))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.list_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_is_unchanged(self):
+        response = self.client.get(self.list_url, {'page_size': 2, 'page': 2})
+        self.assertEqual(response.data['count'], 6)
+        self.assertNotIn('count_is_estimate', response.data)
+
+
+class ProviderSparseFieldsetTests(APITestCase):
+    """
+    Tests for ?fields= / ?omit= on provider endpoints.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        user = User.objects.create_user(
+            email='sparse@test.com', password='password123',
+            full_name='Sparse', role='provider'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider = ServiceProvider.objects.create(
+                user=user, business_name='Sparse Vet', provider_type='vet', phone='01700000000',
+                is_verified=True, avg_rating=4.0
+            )
+            ProviderService.objects.create(provider=self.provider, name_en='Checkup', price=500)
+        self.list_url = reverse('serviceprovider-list')
+        self.detail_url = reverse('serviceprovider-detail', args=[self.provider.id])
+
+    def test_list_fields_selects_card_keys(self):
+        response = self.client.get(self.list_url, {'fields': 'id,business_name,services.name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        card = response.data['results'][0]
+        self.assertEqual(set(card), {'id', 'business_name', 'services'})
+        self.assertEqual(card['services'], [{'name': 'Checkup'}])
+
+    def test_omit_skips_nested_serializers_and_prefetches(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as full:
+            response = self.client.get(self.detail_url)
+        self.assertIn('services', response.data)
+
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get(self.detail_url, {'omit': 'services,supported_animal_types'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('services', response.data)
+        self.assertNotIn('supported_animal_types', response.data)
+        self.assertEqual(response.data['business_name'], 'Sparse Vet')
+        self.assertEqual(len(sparse.captured_queries), len(full.captured_queries) - 2)
+
+    def test_nested_fields_on_detail(self):
+        response = self.client.get(self.detail_url, {'fields': 'id,services.price'})
+        self.assertEqual(set(response.data), {'id', 'services'})
+        self.assertEqual(list(response.data['services'][0]), ['price'])
@@ -5,24 +5,33 @@ API views for ServiceProvider profiles and their nested ProviderServices.
 Implements local network cascade scoping, owner permissions, and soft-deletes.
 """
 
-from rest_framework import viewsets, permissions, filters, status
+from rest_framework import viewsets, permissions, status
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils.decorators import method_decorator
 from django.views.decorators.vary import vary_on_headers
 
-from django.db.models import Exists, OuterRef
-from django.contrib.contenttypes.models import ContentType
-from apps.accounts.models import SavedItem
+from django.core.cache import cache
+from apps.accounts.saved_items import SavedItemLookup, get_saved_ids
 
+from common.fieldsets import SparseFieldsetsViewMixin
+from common.geo import haversine_km
+from common.mixins import get_request_language
 from common.pagination import StandardPagination
 from common.permissions import IsOwnerOrAdmin
-from common.utils import get_local_providers
-from apps.providers.models import ServiceProvider, ProviderService
+from common.utils import (
+    MAX_NEAREST, cascade_metadata, get_local_providers, get_nearest_providers, is_region_search,
+)
+from apps.providers.list_cache import (
+    LIST_CACHE_TIMEOUT, PROFILE_LOCATION_FIELDS, list_cache_key, snap_coordinate,
+)
+from apps.providers.models import ServiceProvider, ProviderService, ProviderAnimalType, ProviderSearchDocument
+from apps.providers.search import ProviderSearchFilter
 from apps.providers.serializers import (
     ServiceProviderSerializer,
     ProviderServiceSerializer,
+    ProviderSearchDocumentSerializer,
 )
 
 
@@ -31,7 +40,7 @@ class ServiceProviderPagination(StandardPagination):
 
 
 
-class ServiceProviderViewSet(viewsets.ModelViewSet):
+class ServiceProviderViewSet(SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for ServiceProvider.
     Includes cascade regional location search (district -> division -> all)
@@ -39,8 +48,12 @@ class ServiceProviderViewSet(viewsets.ModelViewSet):
     """
     serializer_class = ServiceProviderSerializer
     pagination_class = ServiceProviderPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, ProviderSearchFilter]
     search_fields = ['business_name', 'description_en', 'description_bn']
+    sparse_prefetches = {
+        'services': ['services'],
+        'supported_animal_types': ['animal_types__animal_type'],
+    }
 
     def get_queryset(self):
         user = self.request.user
@@ -54,80 +67,180 @@ class ServiceProviderViewSet(viewsets.ModelViewSet):
 
         # For detail views (retrieve, toggle_favorite), don't restrict by location cascade
         if getattr(self, 'action', None) != 'list':
-            qs = base_qs
-            if user and user.is_authenticated:
-                ct = ContentType.objects.get_for_model(ServiceProvider)
-                saved_subquery = SavedItem.objects.filter(
-                    user=user,
-                    content_type=ct,
-                    object_id=OuterRef('pk')
-                )
-                qs = qs.annotate(is_saved=Exists(saved_subquery))
-            return qs
+            return base_qs
+
+        # Public list pages are a single-table read of the search documents
+        base_qs = ProviderSearchDocument.objects.filter(is_verified=True, is_active=True)
 
         provider_type = self.request.query_params.get('provider_type')
         animal_type_id = self.request.query_params.get('animal_type')
+        if animal_type_id:
+            try:
+                providers = ProviderAnimalType.objects.filter(animal_type_id=int(animal_type_id))
+            except ValueError:
+                base_qs = base_qs.none()
+            else:
+                base_qs = base_qs.filter(provider_id__in=providers.values('provider_id'))
 
         division_id = self.request.query_params.get('division_id')
         district_id = self.request.query_params.get('district_id')
         upazila_id = self.request.query_params.get('upazila_id')
-        lat = self.request.query_params.get('lat')
-        lng = self.request.query_params.get('lng')
-        
+        # Snapped to the response cache grid so a cached page matches its key:
+        # which providers a page holds, and their order, are those of the
+        # ~1 km cell's snapped point (approximate by design). The reported
+        # distances are re-measured from the caller's own point (see
+        # _with_request_distances).
+        lat = snap_coordinate(self.request.query_params.get('lat') or None)
+        lng = snap_coordinate(self.request.query_params.get('lng') or None)
+
         has_location_params = division_id or district_id or upazila_id or (lat and lng)
         has_profile_location = user and user.is_authenticated and (getattr(user, 'district_id', None) or getattr(user, 'latitude', None))
 
-        self._exact_match_found = True
-        self._resolved_level = 'exact'
-
+        # Metadata reported when the page is empty; non-empty pages carry
+        # their cascade level on every row (see cascade_metadata)
+        self._empty_metadata = (True, 'exact')
+        self._nearest = None
+
+        nearest = self.request.query_params.get('nearest')
+        if nearest:
+            try:
+                count = int(nearest)
+            except ValueError:
+                count = 0
+            if not 1 <= count <= MAX_NEAREST:
+                raise ValidationError({'nearest': f'Must be an integer between 1 and {MAX_NEAREST}.'})
+            if not (lat and lng) and user and user.is_authenticated:
+                lat, lng = getattr(user, 'latitude', None), getattr(user, 'longitude', None)
+            try:
+                lat, lng = float(lat), float(lng)
+            except (TypeError, ValueError):
+                raise ValidationError({'nearest': 'Requires valid lat and lng (or a saved profile location).'})
+
+            qs, radius, satisfied = get_nearest_providers(
+                lat, lng, count,
+                provider_type=provider_type,
+                animal_type_id=animal_type_id,
+                base_qs=base_qs,
+            )
+            self._nearest = (radius, satisfied)
         # Apply cascade logic if location context is available
-        if has_location_params or has_profile_location:
-            qs, exact, level = get_local_providers(
+        elif has_location_params or has_profile_location:
+            qs = get_local_providers(
                 user=user if not has_location_params else None,
                 provider_type=provider_type,
-                animal_type_id=animal_type_id,
                 lat=lat, lng=lng,
                 division_id=division_id, district_id=district_id, upazila_id=upazila_id,
                 base_qs=base_qs,
-                return_metadata=True
             )
-            self._exact_match_found = exact
-            self._resolved_level = level
+            if not is_region_search(lat, lng, division_id, district_id, upazila_id):
+                self._empty_metadata = (False, 'fallback')
         else:
             qs = base_qs
             if provider_type:
                 qs = qs.filter(provider_type=provider_type)
-            if animal_type_id:
-                qs = qs.filter(animal_types__animal_type_id=animal_type_id)
-
-        if user and user.is_authenticated:
-            ct = ContentType.objects.get_for_model(ServiceProvider)
-            saved_subquery = SavedItem.objects.filter(
-                user=user,
-                content_type=ct,
-                object_id=OuterRef('pk')
-            )
-            qs = qs.annotate(is_saved=Exists(saved_subquery))
-            
+
+        # Identical for every user; favorites are layered on by _with_favorites
         return qs
 
-    def list(self, request, *args, **kwargs):
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['saved_items'] = SavedItemLookup(self.request.user)
+        return context
+
+    def get_serializer_class(self):
+        user = self.request.user
+        is_admin = user and user.is_authenticated and user.role == 'admin'
+        if self.action == 'list' and not is_admin:
+            return ProviderSearchDocumentSerializer
+        return super().get_serializer_class()
+
+    def _search_metadata(self, rows):
+        """exact_match_found/resolved_level (+ search_radius_km in nearest mode)."""
+        nearest = getattr(self, '_nearest', None)
+        if nearest:
+            radius, satisfied = nearest
+            return {
+                'exact_match_found': satisfied,
+                'resolved_level': 'nearest',
+                'search_radius_km': radius,
+            }
+        exact, level = cascade_metadata(rows, default=getattr(self, '_empty_metadata', (True, 'exact')))
+        return {'exact_match_found': exact, 'resolved_level': level}
+
+    def _list_data(self):
         queryset = self.filter_queryset(self.get_queryset())
-        
+
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-            response.data['exact_match_found'] = getattr(self, '_exact_match_found', True)
-            response.data['resolved_level'] = getattr(self, '_resolved_level', 'exact')
-            return response
+            data = self.get_paginated_response(serializer.data).data
+            data.update(self._search_metadata(page))
+            return data
 
         serializer = self.get_serializer(queryset, many=True)
-        return Response({
+        return {
             'results': serializer.data,
-            'exact_match_found': getattr(self, '_exact_match_found', True),
-            'resolved_level': getattr(self, '_resolved_level', 'exact')
-        })
+            **self._search_metadata(queryset),
+        }
+
+    def _list_cache_key(self):
+        """Cache key of the shared list payload, or None if uncacheable."""
+        request = self.request
+        user = request.user
+        if user and user.is_authenticated and user.role == 'admin':
+            return None
+
+        params = request.query_params
+        profile_location = None
+        has_location_params = any(params.get(name) for name in ('division_id', 'district_id', 'upazila_id', 'lat', 'lng'))
+        if user and user.is_authenticated and not has_location_params:
+            profile_location = {name: getattr(user, name, None) for name in PROFILE_LOCATION_FIELDS}
+        return list_cache_key(params, get_request_language(request), request.get_host(), profile_location)
+
+    def _with_request_distances(self, data):
+        """Copy of a shared payload with distances measured from the caller's unsnapped lat/lng."""
+        params = self.request.query_params
+        try:
+            lat, lng = float(params['lat']), float(params['lng'])
+        except (KeyError, TypeError, ValueError):
+            return data
+        results = data.get('results') or []
+        if not results or not {'distance', 'latitude', 'longitude'} <= results[0].keys():
+            return data  # No distances, or trimmed away by ?fields= / ?omit=
+
+        def measured(item):
+            if item['distance'] is None or item['latitude'] is None or item['longitude'] is None:
+                return item
+            distance = haversine_km(lat, lng, float(item['latitude']), float(item['longitude']))
+            return {**item, 'distance': round(distance, 3)}
+
+        return {**data, 'results': [measured(item) for item in results]}
+
+    def _with_favorites(self, data):
+        """Copy of a shared payload with the requesting user's favorites applied."""
+        user = self.request.user
+        results = data.get('results') or []
+        if not (user and user.is_authenticated and results):
+            return data
+        if 'id' not in results[0] or 'is_favorite' not in results[0]:
+            return data  # Trimmed away by ?fields= / ?omit=
+
+        saved = get_saved_ids(user, ServiceProvider)
+        return {
+            **data,
+            'results': [{**item, 'is_favorite': item['id'] in saved} for item in results],
+        }
+
+    def list(self, request, *args, **kwargs):
+        cache_key = self._list_cache_key()
+        if cache_key is None:
+            return Response(self._list_data())
+
+        data = cache.get(cache_key)
+        if data is None:
+            data = self._list_data()
+            cache.set(cache_key, data, LIST_CACHE_TIMEOUT)
+        return Response(self._with_favorites(self._with_request_distances(data)))
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -167,7 +280,7 @@ class ServiceProviderViewSet(viewsets.ModelViewSet):
 
 
 
-class ProviderServiceViewSet(viewsets.ModelViewSet):
+class ProviderServiceViewSet(SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for ProviderServices nested under a specific ServiceProvider.
     Ensures that only the owner of the provider profile can add or modify services.
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0001_initial'),
+        ('rehoming', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rehominglisting',
+            index=models.Index(fields=['status', 'latitude', 'longitude'], name='rehoming_re_status_51c609_idx'),
+        ),
+    ]
@@ -112,6 +112,9 @@ class RehomingListing(models.Model):
         verbose_name = 'Rehoming Listing'
         verbose_name_plural = 'Rehoming Listings'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'latitude', 'longitude']),
+        ]
 
     def __str__(self):
         return f'Rehoming: {self.pet_name} ({self.status})'
@@ -6,10 +6,20 @@ Validates rehoming capability (cat/dog only) and ownership logic.
 """
 
 from rest_framework import serializers
+from common.fieldsets import SparseFieldsetsMixin
+from apps.locations.geocoder import reverse_geocode
+from apps.locations.models import District
 from apps.rehoming.models import RehomingListing, RehomingApplication
 
 
-class RehomingListingSerializer(serializers.ModelSerializer):
+def _geocoded_district_name(latitude, longitude):
+    place = reverse_geocode(latitude, longitude)
+    if not place or not place.district_id:
+        return ''
+    return District.objects.filter(pk=place.district_id).values_list('name_en', flat=True).first() or ''
+
+
+class RehomingListingSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer for RehomingListing.
     Validates pet ownership and rehoming support flags (cat/dog only).
@@ -17,13 +27,14 @@ class RehomingListingSerializer(serializers.ModelSerializer):
     animal_type_details = serializers.SerializerMethodField()
     owner_name = serializers.CharField(source='owner.full_name', read_only=True)
     owner_email = serializers.EmailField(source='owner.email', read_only=True)
+    distance_km = serializers.FloatField(read_only=True, required=False)
 
     class Meta:
         model = RehomingListing
         fields = [
             'id', 'animal_type', 'animal_type_details', 'pet_name', 'breed', 'gender',
             'age', 'description', 'weight_kg', 'spayed_neutered', 'vaccinated', 'photo_url',
-            'district', 'latitude', 'longitude', 'adopter_requirements',
+            'district', 'latitude', 'longitude', 'distance_km', 'adopter_requirements',
             'owner', 'owner_name', 'owner_email', 'reason', 'status', 'policy_accepted', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'owner', 'status', 'created_at', 'updated_at']
@@ -32,12 +43,17 @@ class RehomingListingSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if request and request.user:
             # Auto-populate location from user if not provided
-            if not validated_data.get('district'):
-                validated_data['district'] = request.user.district
+            sent_coordinates = validated_data.get('latitude') is not None and validated_data.get('longitude') is not None
             if validated_data.get('latitude') is None:
                 validated_data['latitude'] = request.user.latitude
             if validated_data.get('longitude') is None:
                 validated_data['longitude'] = request.user.longitude
+            if not validated_data.get('district'):
+                # The listing's own coordinates say more than the owner's profile
+                district = request.user.district
+                if sent_coordinates or not district:
+                    district = _geocoded_district_name(validated_data['latitude'], validated_data['longitude']) or district
+                validated_data['district'] = district
         return super().create(validated_data)
 
     def get_animal_type_details(self, obj):
@@ -56,7 +72,7 @@ class RehomingListingSerializer(serializers.ModelSerializer):
         return value
 
 
-class RehomingApplicationSerializer(serializers.ModelSerializer):
+class RehomingApplicationSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer for RehomingApplication.
     Prevents duplicate applications and listing owners from adopting their own pets.
@@ -1,5 +1,5 @@
 from apps.rehoming.models import RehomingApplication
-from apps.ai_assistant.gemini import analyze_adoption_application
+from apps.ai_assistant.gemini import aanalyze_adoption_application, analyze_adoption_application
 
 def calculate_ai_score_task(application_id, listing_details, message):
     """
@@ -22,3 +22,24 @@ def calculate_ai_score_task(application_id, listing_details, message):
         return f"Application {application_id} not found."
     except Exception as e:
         return f"Error scoring application {application_id}: {str(e)}"
+
+
+async def acalculate_ai_score_task(application_id, listing_details, message):
+    """
+    calculate_ai_score_task for async views: the model call is awaited and
+    the score saved through the async ORM.
+    """
+    try:
+        application = await RehomingApplication.objects.aget(id=application_id)
+
+        score = await aanalyze_adoption_application(listing_details, message)
+
+        application.ai_score = score
+        await application.asave(update_fields=['ai_score'])
+
+        return f"Application {application_id} scored: {score}/10"
+
+    except RehomingApplication.DoesNotExist:
+        return f"Application {application_id} not found."
+    except Exception as e:
+        return f"Error scoring application {application_id}: {str(e)}"
@@ -0,0 +1,118 @@
+"""
+PetCarePlus v2 — Rehoming App Unit Tests
+
+Tests covering database-side distance search for rehoming listings and
+AI-scored adoption applications.
+"""
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.animals.models import AnimalType
+from apps.rehoming.models import RehomingApplication, RehomingListing
+
+User = get_user_model()
+
+
+class RehomingDistanceSearchTests(APITestCase):
+    """
+    Tests for ?lat=&lng=&radius= filtering and distance ordering.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            email='owner@test.com', password='password123', full_name='Owner'
+        )
+        self.cat_type = AnimalType.objects.create(
+            name_en='Cat', name_bn='বিড়াল', slug='cat',
+            category='companion', icon='cat',
+            supports_rehoming=True, supports_services=True
+        )
+        self.mirpur = self._listing('Mirpur', 23.8223, 90.3654)
+        self.gulshan = self._listing('Gulshan', 23.7925, 90.4078)
+        self.gazipur = self._listing('Gazipur', 23.9999, 90.4203)
+        self.adopted = self._listing('Adopted', 23.7930, 90.4080, status=RehomingListing.Status.ADOPTED)
+        self.list_url = reverse('rehominglisting-list')
+
+    def _listing(self, name, lat, lng, status=RehomingListing.Status.ACTIVE):
+        return RehomingListing.objects.create(
+            owner=self.owner, animal_type=self.cat_type, pet_name=name,
+            district='Dhaka', latitude=lat, longitude=lng,
+            reason='Moving abroad', status=status
+        )
+
+    def test_radius_search_filters_and_orders_by_distance(self):
+        response = self.client.get(self.list_url, {'lat': '23.7930', 'lng': '90.4080', 'radius': '10'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([r['id'] for r in results], [self.gulshan.id, self.mirpur.id])
+        self.assertLess(results[0]['distance_km'], 0.1)
+        self.assertAlmostEqual(results[1]['distance_km'], 5.4, delta=0.2)
+
+    def test_default_radius_and_plain_listing(self):
+        response = self.client.get(self.list_url, {'lat': '23.7930', 'lng': '90.4080'})
+        self.assertEqual(response.data['count'], 2)
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data['count'], 3)
+        self.assertNotIn('distance_km', response.data['results'][0])
+
+    def test_listings_page_by_number_unless_keyset_is_asked_for(self):
+        params = {'lat': '23.7930', 'lng': '90.4080', 'radius': '50', 'page_size': 1}
+        response = self.client.get(self.list_url, {**params, 'page': 2})
+        self.assertEqual(response.data['count'], 3)
+        self.assertNotIn('count_is_estimate', response.data)
+        self.assertEqual([r['id'] for r in response.data['results']], [self.mirpur.id])
+
+        response = self.client.get(self.list_url, {**params, 'pagination': 'cursor'})
+        self.assertIs(response.data['count_is_estimate'], True)
+        self.assertIsNone(response.data['previous'])
+
+        ids = [r['id'] for r in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            ids.extend(r['id'] for r in response.data['results'])
+        self.assertEqual(ids, [self.gulshan.id, self.mirpur.id, self.gazipur.id])
+
+
+class RehomingApplicationScoringTests(APITestCase):
+    """
+    Tests for the async application create, which awaits the AI score.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            email='owner@test.com', password='password123', full_name='Owner'
+        )
+        self.adopter = User.objects.create_user(
+            email='adopter@test.com', password='password123', full_name='Adopter'
+        )
+        cat_type = AnimalType.objects.create(
+            name_en='Cat', name_bn='বিড়াল', slug='cat',
+            category='companion', icon='cat', supports_rehoming=True
+        )
+        self.listing = RehomingListing.objects.create(
+            owner=self.owner, animal_type=cat_type, pet_name='Mini',
+            district='Dhaka', reason='Moving abroad'
+        )
+        self.url = reverse('rehomingapplication-list')
+
+    def test_created_application_is_scored(self):
+        self.client.force_authenticate(user=self.adopter)
+        response = self.client.post(self.url, {
+            'listing': self.listing.id, 'message': 'We have a quiet home and a garden.'
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        application = RehomingApplication.objects.get(pk=response.data['id'])
+        self.assertEqual(application.applicant, self.adopter)
+        self.assertEqual(application.ai_score, 7)  # Mock score
+
+    def test_invalid_application_is_rejected_before_scoring(self):
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.post(self.url, {'listing': self.listing.id, 'message': 'Mine'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(RehomingApplication.objects.exists())
@@ -5,6 +5,7 @@ API views for managing RehomingListings and RehomingApplications.
 Includes cascade regional scoping for active listings and adoption transfer transactions.
 """
 
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied, ValidationError
@@ -13,21 +14,25 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.utils.decorators import method_decorator
 from django.views.decorators.vary import vary_on_headers
 
+from common.async_views import AsyncViewMixin
+from common.fieldsets import SparseFieldsetsViewMixin
 from common.permissions import IsOwnerOrAdmin
-from common.utils import get_local_queryset
+from common.utils import distance_expression, get_local_queryset, radius_filter
 from apps.rehoming.models import RehomingListing, RehomingApplication
 from apps.rehoming.serializers import (
     RehomingListingSerializer,
     RehomingApplicationSerializer,
 )
 
-from apps.rehoming.tasks import calculate_ai_score_task
+from apps.rehoming.tasks import acalculate_ai_score_task
 
 
-class RehomingListingViewSet(viewsets.ModelViewSet):
+class RehomingListingViewSet(SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for RehomingListings.
     Active listings are filtered using a regional cascade scoping (district -> division -> all).
+    Lists page by number; infinite-scroll clients can page by keyset with
+    ?pagination=cursor, so deep pages cost no more than the first.
     """
     serializer_class = RehomingListingSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -58,28 +63,17 @@ class RehomingListingViewSet(viewsets.ModelViewSet):
                 lat_val = float(lat)
                 lng_val = float(lng)
                 radius_val = float(radius)
-
-                import math
-                valid_ids = []
-                for listing in qs:
-                    if listing.latitude and listing.longitude:
-                        l_lat = float(listing.latitude)
-                        l_lng = float(listing.longitude)
-                        # Haversine distance
-                        R = 6371
-                        dlat = math.radians(l_lat - lat_val)
-                        dlon = math.radians(l_lng - lng_val)
-                        a = math.sin(dlat/2)**2 + math.cos(math.radians(lat_val)) * math.cos(math.radians(l_lat)) * math.sin(dlon/2)**2
-                        c = 2 * math.asin(math.sqrt(a))
-                        distance = R * c
-                        if distance <= radius_val:
-                            valid_ids.append(listing.id)
-                qs = qs.filter(id__in=valid_ids)
             except (ValueError, TypeError):
                 pass
+            else:
+                # Bounding box on the (status, latitude, longitude) index
+                # first, exact distance only for the rows inside it
+                qs = qs.filter(radius_filter(lat_val, lng_val, radius_val, cell_field=None)).annotate(
+                    distance_km=distance_expression(lat_val, lng_val)
+                ).filter(distance_km__lte=radius_val).order_by('distance_km', '-created_at')
 
         # 3. Scoped cascade logic for local network match (fallback)
-        if not district and not (lat and lng) and user and user.is_authenticated and user.district:
+        if not district and not (lat and lng) and user and user.is_authenticated and user.district_id:
             # We use 'owner__' so we can query both district and division securely via the User model
             return get_local_queryset(qs, user, location_field_prefix='owner__')
 
@@ -103,7 +97,7 @@ class RehomingListingViewSet(viewsets.ModelViewSet):
 
 
 
-class RehomingApplicationViewSet(viewsets.ModelViewSet):
+class RehomingApplicationViewSet(AsyncViewMixin, SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for RehomingApplications.
     Customers see applications they submitted or received for their own pets.
@@ -132,34 +126,38 @@ class RehomingApplicationViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         return [permissions.IsAuthenticated()]
 
-    def perform_create(self, serializer):
+    async def create(self, request, *args, **kwargs):
+        """
+        CreateModelMixin.create, then the AI score of the new application,
+        awaited so the worker serves other requests during the model call.
+        """
+        serializer = self.get_serializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        await sync_to_async(self.perform_create)(serializer)
+        application = serializer.instance
 
-        
         # Build context for AI evaluation
-        listing = serializer.validated_data.get('listing')
-        message = serializer.validated_data.get('message', '')
-        
+        listing = application.listing
         listing_details = (
             f"Pet Name: {listing.pet_name}\n"
             f"Breed: {listing.breed}\n"
             f"Description: {listing.description}\n"
             f"Adopter Requirements: {listing.adopter_requirements}\n"
         )
-        
-        # Save without AI score initially to prevent blocking the HTTP response
-        application = serializer.save(
-            applicant=self.request.user, 
+        await acalculate_ai_score_task(application.id, listing_details, application.message)
+
+        data = await sync_to_async(lambda: serializer.data)()
+        headers = self.get_success_headers(data)
+        return Response(data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def perform_create(self, serializer):
+        # Save without AI score; create() scores it
+        serializer.save(
+            applicant=self.request.user,
             status=RehomingApplication.Status.PENDING,
             ai_score=None
         )
 
-        # Trigger AI analysis synchronously
-        calculate_ai_score_task(
-            application.id,
-            listing_details,
-            message
-        )
-
     def perform_update(self, serializer):
         instance = self.get_object()
         user = self.request.user
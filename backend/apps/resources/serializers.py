@@ -5,11 +5,12 @@ Bilingual serializer for Resource model using BilingualMixin.
 """
 
 from rest_framework import serializers
+from common.fieldsets import SparseFieldsetsMixin
 from common.mixins import BilingualMixin
 from apps.resources.models import Resource
 
 
-class ResourceSerializer(BilingualMixin, serializers.ModelSerializer):
+class ResourceSerializer(SparseFieldsetsMixin, BilingualMixin, serializers.ModelSerializer):
     """
     Serializer for Resource model.
     Dynamically returns translated 'title' and 'description' based on user language context.
@@ -39,6 +40,9 @@ class ResourceSerializer(BilingualMixin, serializers.ModelSerializer):
         ]
 
     def get_is_saved(self, obj):
+        saved_items = self.context.get('saved_items')
+        if saved_items is not None:
+            return saved_items.is_saved(obj)
         return getattr(obj, 'is_saved', False)
 
     def get_title(self, obj):
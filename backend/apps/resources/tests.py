@@ -76,3 +76,32 @@ class ResourcesAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         results = response.data['results']
         self.assertEqual(len(results), 1)
+
+
+
+class ResourceCursorPaginationTests(APITestCase):
+    """
+    Tests for opt-in keyset pagination of the resource list.
+    """
+
+    def setUp(self):
+        self.older = Resource.objects.create(
+            title_en='General Dog Care', title_bn='কুকুরের সাধারণ যত্ন',
+            resource_type='information', is_active=True
+        )
+        self.newer = Resource.objects.create(
+            title_en='Rabies Vaccine info', title_bn='রেবিস ভ্যাকসিনের তথ্য',
+            resource_type='vaccination', is_active=True
+        )
+        self.list_url = reverse('resource-list')
+
+    def test_cursor_pagination_newest_first(self):
+        """Test opt-in keyset pagination over -created_at."""
+        response = self.client.get(self.list_url, {'pagination': 'cursor', 'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['id'] for r in response.data['results']], [self.newer.id])
+        self.assertEqual(response.data['count'], 2)
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([r['id'] for r in response.data['results']], [self.older.id])
+        self.assertIsNone(response.data['next'])
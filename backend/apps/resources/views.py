@@ -6,29 +6,26 @@ Allows public read-only access with search, filter, and ordering capabilities.
 """
 
 from rest_framework import viewsets, permissions, filters
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 
 from django.utils.decorators import method_decorator
 from django.views.decorators.vary import vary_on_headers
 
-from django.db.models import Exists, OuterRef
-from django.contrib.contenttypes.models import ContentType
-from apps.accounts.models import SavedItem
+from apps.accounts.saved_items import SavedItemLookup, get_saved_ids
 
+from common.fieldsets import SparseFieldsetsViewMixin
+from common.pagination import StandardPagination
 from common.permissions import IsAdminUser
 from apps.resources.models import Resource
 from apps.resources.serializers import ResourceSerializer
 
 
-class ResourcePagination(PageNumberPagination):
+class ResourcePagination(StandardPagination):
     page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
 
 
 @method_decorator(vary_on_headers('Authorization', 'Cookie'), name='retrieve')
-class ResourceViewSet(viewsets.ReadOnlyModelViewSet):
+class ResourceViewSet(SparseFieldsetsViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Resource.
     Enables public view with pagination, filtering, ordering, and full-text search.
@@ -49,6 +46,7 @@ class ResourceViewSet(viewsets.ReadOnlyModelViewSet):
     # Ordering
     ordering_fields = ['created_at', 'updated_at', 'title_en', 'title_bn']
     ordering = ['-created_at']
+    sparse_prefetches = {'animal_types': ['animal_types']}
 
     def get_queryset(self):
         user = self.request.user
@@ -59,17 +57,23 @@ class ResourceViewSet(viewsets.ReadOnlyModelViewSet):
         else:
             qs = qs.filter(is_active=True)
             
-        if user and user.is_authenticated:
-            ct = ContentType.objects.get_for_model(Resource)
-            saved_subquery = SavedItem.objects.filter(
-                user=user,
-                content_type=ct,
-                object_id=OuterRef('pk')
-            )
-            qs = qs.annotate(is_saved=Exists(saved_subquery))
-            
         return qs
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Shared (cached) pages get is_saved layered on by _with_saved
+        if not getattr(self, '_shared_payload', False):
+            context['saved_items'] = SavedItemLookup(self.request.user)
+        return context
+
+    def _with_saved(self, data):
+        """Copy of a shared page with the requesting user's saved state applied."""
+        saved = get_saved_ids(self.request.user, Resource)
+        return {
+            **data,
+            'results': [{**item, 'is_saved': item['id'] in saved} for item in data.get('results') or []],
+        }
+
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [permissions.AllowAny()]
@@ -90,11 +94,10 @@ class ResourceViewSet(viewsets.ReadOnlyModelViewSet):
             cache_key = f"resources_page_1_{user_role}"
             cached_data = cache.get(cache_key)
             
-            if cached_data:
-                return Response(cached_data)
-                
-            response = super().list(request, *args, **kwargs)
-            cache.set(cache_key, response.data, timeout=None) # Permanent cache
-            return response
+            if not cached_data:
+                self._shared_payload = True
+                cached_data = super().list(request, *args, **kwargs).data
+                cache.set(cache_key, cached_data, timeout=None) # Permanent cache
+            return Response(self._with_saved(cached_data))
             
         return super().list(request, *args, **kwargs)
@@ -6,11 +6,12 @@ Validates booking completion status, ownership, and uniqueness.
 """
 
 from rest_framework import serializers
+from common.fieldsets import SparseFieldsetsMixin
 from apps.reviews.models import Review
 from apps.bookings.models import Booking
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer for the Review model.
     Enforces rigorous API validation constraints on booking status and ownership.
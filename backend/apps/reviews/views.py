@@ -8,6 +8,7 @@ Exposes list and detail endpoints publicly, and restricts modifications to the o
 from rest_framework import viewsets, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
 
+from common.fieldsets import SparseFieldsetsViewMixin
 from common.permissions import IsOwnerOrAdmin
 from apps.reviews.models import Review
 from apps.reviews.serializers import ReviewSerializer
@@ -19,7 +20,7 @@ class ReviewPagination(PageNumberPagination):
     max_page_size = 50
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Review management.
     Allows anyone to view reviews for service providers, but
@@ -0,0 +1,35 @@
+"""
+PetCarePlus v2 — Search Signals
+
+Log a provider in the suggestion index (see suggest) when its suggestion
+can change, once per transaction, on commit, so every worker re-reads just
+that provider. Location changes are logged by the locations signals.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.providers.models import ServiceProvider
+from apps.search.suggest import SUGGESTED_PROVIDER_FIELDS, mark_suggested_provider_changed
+from common.transactions import on_commit_batch
+
+
+def publish_suggestion_change(provider_id):
+    """Log the provider in the suggestion index once the surrounding transaction commits."""
+    on_commit_batch(
+        'search:suggest', provider_id,
+        lambda provider_ids: [mark_suggested_provider_changed(pk) for pk in provider_ids],
+    )
+
+
+@receiver(post_save, sender=ServiceProvider)
+def on_provider_saved(sender, instance, update_fields=None, **kwargs):
+    # Rating and profile-only saves leave the suggestion as it was
+    if update_fields is not None and not SUGGESTED_PROVIDER_FIELDS & set(update_fields):
+        return
+    publish_suggestion_change(instance.pk)
+
+
+@receiver(post_delete, sender=ServiceProvider)
+def on_provider_deleted(sender, instance, **kwargs):
+    publish_suggestion_change(instance.pk)
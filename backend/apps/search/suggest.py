@@ -0,0 +1,245 @@
+"""
+PetCarePlus v2 — Search Suggestions Index
+
+In-process prefix index behind GET /api/v1/search/suggest/: Division,
+District, Upazila and Union names (English and Bangla) plus the business
+names of verified providers.
+
+- Every name is normalized (`common.text.normalize_text`: case, accents,
+  punctuation and Bangla spelling variants folded) and indexed once per
+  word start ("dhaka sadar", "sadar"), in one sorted list of keys per kind
+  with a parallel array of rows. A keystroke is a bisect to the first key at or
+  after the prefix and a scan while keys still start with it, stopping as
+  soon as enough rows are found; no query touches the database.
+- Kinds are answered coarsest first (divisions before unions, locations
+  before providers); within a kind, shorter and alphabetically earlier
+  names come first, so an exact name leads its prefix.
+
+Keeping workers in step: location changes move the location dataset
+version (see apps.locations.ancestry) and provider changes the suggested
+provider version (`mark_suggested_provider_changed`, called by signals on
+commit); each bump logs the rows that changed under the new version. Before
+answering, a worker whose versions moved re-reads only the logged rows and
+patches its keys in place. It rebuilds from scratch only on first use or
+when a log is incomplete (evicted, too far behind, or a bulk reseed).
+"""
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+from django.core.cache import cache
+
+from apps.locations.ancestry import CHANGE_CACHE_KEY as LOCATION_CHANGE_CACHE_KEY, get_location_version
+from apps.locations.models import Division, District, Upazila, Union
+from apps.providers.models import ServiceProvider
+from common.cache_versions import bump_cache_version, get_cache_version
+from common.text import normalize_text
+
+
+PROVIDER_VERSION_CACHE_KEY = 'search:suggest:providers:version'
+PROVIDER_CHANGE_CACHE_KEY = 'search:suggest:providers:change:{}'
+CHANGE_LOG_TTL = 60 * 60 * 24
+MAX_INCREMENTAL_CHANGES = 500
+
+# Ranking order
+SUGGESTION_KINDS = ('division', 'district', 'upazila', 'union', 'provider')
+
+# Provider fields a suggestion depends on (see signals)
+SUGGESTED_PROVIDER_FIELDS = frozenset({'business_name', 'district', 'is_verified', 'is_active'})
+
+# kind -> (model, parent field)
+LOCATION_LEVELS = {
+    'division': (Division, None),
+    'district': (District, 'division_id'),
+    'upazila': (Upazila, 'district_id'),
+    'union': (Union, 'upazila_id'),
+}
+
+def get_suggest_version():
+    """Version of the data behind the suggestions."""
+    return (get_location_version(), get_cache_version(PROVIDER_VERSION_CACHE_KEY))
+
+
+def mark_suggested_provider_changed(provider_id):
+    """Publish a provider change to every worker's index."""
+    version = bump_cache_version(PROVIDER_VERSION_CACHE_KEY)
+    cache.set(PROVIDER_CHANGE_CACHE_KEY.format(version), provider_id, CHANGE_LOG_TTL)
+
+
+def suggestion_rows(kind=None, ids=None):
+    """(kind, id, name_en, name_bn, parent_id) of everything suggested, or of one kind's `ids`."""
+    rows = []
+    for level, (model, parent_field) in LOCATION_LEVELS.items():
+        if kind not in (None, level):
+            continue
+        qs = model.objects.all() if ids is None else model.objects.filter(pk__in=ids)
+        if parent_field is None:
+            rows.extend((level, pk, en, bn, None) for pk, en, bn in qs.values_list('pk', 'name_en', 'name_bn'))
+        else:
+            rows.extend(
+                (level, pk, en, bn, parent_id)
+                for pk, en, bn, parent_id in qs.values_list('pk', 'name_en', 'name_bn', parent_field)
+            )
+    if kind in (None, 'provider'):
+        providers = ServiceProvider.objects.filter(is_verified=True, is_active=True)
+        if ids is not None:
+            providers = providers.filter(pk__in=ids)
+        rows.extend(
+            ('provider', pk, name, name, district_id)
+            for pk, name, district_id in providers.values_list('pk', 'business_name', 'district_id')
+        )
+    return rows
+
+
+def logged_changes(since, current):
+    """
+    {kind: {id, ...}} of the rows changed between two suggest versions, or
+    None if the change logs do not cover them all.
+    """
+    changes = {}
+    (location_since, provider_since), (location_current, provider_current) = since, current
+    # Location logs hold (kind, id) pairs, provider logs a provider id
+    for key_format, kind, first, last in (
+        (LOCATION_CHANGE_CACHE_KEY, None, location_since, location_current),
+        (PROVIDER_CHANGE_CACHE_KEY, 'provider', provider_since, provider_current),
+    ):
+        if first == last:
+            continue
+        if not 0 < last - first <= MAX_INCREMENTAL_CHANGES:
+            return None
+        keys = [key_format.format(version) for version in range(first + 1, last + 1)]
+        logged = cache.get_many(keys)
+        if len(logged) != len(keys):
+            return None
+        for logged_change in logged.values():
+            for changed_kind, pk in ([(kind, logged_change)] if kind else logged_change):
+                changes.setdefault(changed_kind, set()).add(pk)
+    return changes
+
+
+def index_keys(*names):
+    """Normalized keys a name is found under: the name from each word on."""
+    keys = set()
+    for name in names:
+        words = normalize_text(name).split(' ')
+        keys.update(' '.join(words[i:]) for i in range(len(words)))
+    keys.discard('')
+    return keys
+
+
+class SuggestIndex:
+    """
+    Sorted-key prefix index of suggestion rows. Use `get_suggest_index()`
+    for the process-wide, version-synchronised instance.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self.load(rows=())
+
+    def __len__(self):
+        return len(self._positions)
+
+    def load(self, rows=None):
+        """(Re)build from (kind, id, name_en, name_bn, parent_id) rows."""
+        rows = suggestion_rows() if rows is None else rows
+        entries, positions = [], {}
+        pairs = {kind: [] for kind in SUGGESTION_KINDS}
+        for kind, pk, name_en, name_bn, parent_id in rows:
+            entry = len(entries)
+            entries.append({'type': kind, 'id': pk, 'name_en': name_en, 'name_bn': name_bn, 'parent_id': parent_id})
+            positions[(kind, pk)] = entry
+            pairs[kind].extend((key, entry) for key in index_keys(name_en, name_bn))
+
+        keys, entry_rows = {}, {}
+        for kind, kind_pairs in pairs.items():
+            kind_pairs.sort()
+            keys[kind] = [key for key, _ in kind_pairs]
+            entry_rows[kind] = array('I', (entry for _, entry in kind_pairs))
+        self._entries, self._positions, self._keys, self._rows = entries, positions, keys, entry_rows
+
+    def refresh(self, changes):
+        """Re-read the rows in {kind: {id, ...}}, adding, renaming or dropping them."""
+        entries, positions = self._entries, dict(self._positions)
+        keys, entry_rows = dict(self._keys), dict(self._rows)
+        for kind, ids in changes.items():
+            # Patch copies, so a concurrent keystroke sees the old or the new keys
+            kind_keys, kind_rows = list(keys[kind]), array('I', entry_rows[kind])
+            for pk in ids:
+                entry = positions.pop((kind, pk), None)
+                if entry is None:
+                    continue
+                old = entries[entry]
+                for key in index_keys(old['name_en'], old['name_bn']):
+                    lo, hi = bisect_left(kind_keys, key), bisect_right(kind_keys, key)
+                    i = bisect_left(kind_rows, entry, lo, hi)
+                    del kind_keys[i], kind_rows[i]
+            for _, pk, name_en, name_bn, parent_id in suggestion_rows(kind, ids):
+                # New entries number past every existing one, so each pair
+                # goes after the equal keys
+                entry = len(entries)
+                entries.append({'type': kind, 'id': pk, 'name_en': name_en, 'name_bn': name_bn, 'parent_id': parent_id})
+                positions[(kind, pk)] = entry
+                for key in index_keys(name_en, name_bn):
+                    i = bisect_right(kind_keys, key)
+                    kind_keys.insert(i, key)
+                    kind_rows.insert(i, entry)
+            keys[kind], entry_rows[kind] = kind_keys, kind_rows
+        self._positions, self._keys, self._rows = positions, keys, entry_rows
+
+        # Replaced entries only cost memory; compact once they pile up
+        if len(entries) - len(positions) > max(1000, len(positions) // 4):
+            self.load([
+                (entry['type'], entry['id'], entry['name_en'], entry['name_bn'], entry['parent_id'])
+                for entry in (entries[i] for i in sorted(positions.values()))
+            ])
+
+    def sync(self):
+        """Catch up with the shared data version, incrementally when possible."""
+        current = get_suggest_version()
+        if current == self.version:
+            return
+        with self._lock:
+            if current == self.version:
+                return
+            changes = None if self.version is None else logged_changes(self.version, current)
+            if changes is None:
+                self.load()
+            else:
+                self.refresh(changes)
+            self.version = current
+
+    def suggest(self, query, limit=10, kinds=SUGGESTION_KINDS):
+        """Up to `limit` entries whose name has a word starting with `query`, ranked."""
+        prefix = normalize_text(query)
+        if not prefix or limit < 1:
+            return []
+
+        entries, all_keys, all_rows = self._entries, self._keys, self._rows
+        found = []
+        for kind in SUGGESTION_KINDS:
+            if kind not in kinds:
+                continue
+            keys, rows = all_keys[kind], all_rows[kind]
+            seen = set()
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and keys[i].startswith(prefix):
+                entry = rows[i]
+                if entry not in seen:
+                    seen.add(entry)
+                    found.append(entries[entry])
+                    if len(found) == limit:
+                        return found
+                i += 1
+        return found
+
+
+_index = SuggestIndex()
+
+
+def get_suggest_index():
+    """The process-wide suggestion index, synchronised with the data version."""
+    _index.sync()
+    return _index
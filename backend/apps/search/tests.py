@@ -0,0 +1,115 @@
+"""
+PetCarePlus v2 — Search App Unit Tests
+
+Tests covering the bilingual prefix suggestion index and endpoint.
+"""
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.locations.models import Division, District, Upazila, Union
+from apps.providers.models import ServiceProvider
+
+User = get_user_model()
+
+
+class SuggestTests(APITestCase):
+    """
+    Tests for GET /api/v1/search/suggest/.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dhaka = Division.objects.create(name_en='Dhaka', name_bn='ঢাকা')
+            self.gazipur = District.objects.create(division=self.dhaka, name_en='Gazipur', name_bn='গাজীপুর')
+            # Precomposed য় (U+09DF), as most keyboards produce it
+            self.kaliakair = Upazila.objects.create(district=self.gazipur, name_en='Kaliakair', name_bn='কালিয়াকৈর')
+            self.sadar = Upazila.objects.create(district=self.gazipur, name_en='Gazipur Sadar', name_bn='গাজীপুর সদর')
+            self.kashimpur = Union.objects.create(upazila=self.sadar, name_en='Kashimpur', name_bn='কাশিমপুর')
+            provider_user = User.objects.create_user(
+                email='vet@test.com', password='ProviderPass123!', full_name='Vet', role='provider'
+            )
+            self.provider = ServiceProvider.objects.create(
+                user=provider_user, business_name='Gazi Pet Care', provider_type='vet', phone='01700000000',
+                district=self.gazipur, is_verified=True,
+            )
+        self.url = reverse('search_suggest')
+
+    def suggest(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(r['type'], r['id']) for r in response.data['results']]
+
+    def test_prefix_matches_word_starts_coarsest_level_first(self):
+        self.assertEqual(self.suggest('gaz'), [
+            ('district', self.gazipur.pk),
+            ('upazila', self.sadar.pk),
+            ('provider', self.provider.pk),
+        ])
+        self.assertEqual(self.suggest('SAD'), [('upazila', self.sadar.pk)])
+        self.assertEqual(self.suggest('gaz', types='provider'), [('provider', self.provider.pk)])
+        self.assertEqual(self.suggest('gaz', limit=1), [('district', self.gazipur.pk)])
+        self.assertEqual(self.suggest(''), [])
+
+    def test_bangla_prefixes_fold_nukta_and_hasanta_variants(self):
+        from common.text import normalize_text
+
+        # Decomposed য + ় and the bare য (nukta not typed yet)
+        self.assertEqual(self.suggest('কালিয়া'), [('upazila', self.kaliakair.pk)])
+        self.assertEqual(self.suggest('কালিয'), [('upazila', self.kaliakair.pk)])
+        self.assertEqual(self.suggest('সদ'), [('upazila', self.sadar.pk)])
+        self.assertEqual(normalize_text('লক্ষ্মী'), normalize_text('লকষমী'))
+        self.assertEqual(normalize_text('সৎ'), normalize_text('সত্'))
+        self.assertTrue(normalize_text('লক্ষ্মীপুর').startswith(normalize_text('লক্')))
+
+    def test_keystrokes_are_answered_without_queries(self):
+        self.suggest('gaz')
+        with self.assertNumQueries(0):
+            self.suggest('gazi')
+            self.suggest('কাশি')
+
+    def test_data_changes_reach_the_index(self):
+        self.suggest('gaz')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider.business_name = 'Tongi Pet Care'
+            self.provider.save(update_fields=['business_name'])
+            Union.objects.create(upazila=self.sadar, name_en='Gazaria', name_bn='গজারিয়া')
+        self.assertEqual(self.suggest('gaz'), [
+            ('district', self.gazipur.pk),
+            ('upazila', self.sadar.pk),
+            ('union', Union.objects.get(name_en='Gazaria').pk),
+        ])
+        self.assertEqual(self.suggest('tongi'), [('provider', self.provider.pk)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider.is_verified = False
+            self.provider.save()
+        self.assertEqual(self.suggest('tongi'), [])
+
+    def test_logged_changes_patch_the_index_without_a_rebuild(self):
+        from unittest import mock
+        from apps.search.suggest import SuggestIndex
+
+        self.suggest('gaz')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider.business_name = 'Tongi Pet Care'
+            self.provider.save(update_fields=['business_name'])
+            self.kashimpur.delete()
+            self.kaliakair.name_en = 'Kaliganj'
+            self.kaliakair.save()
+
+        with mock.patch.object(SuggestIndex, 'load', side_effect=AssertionError('rebuilt')):
+            self.assertEqual(self.suggest('gaz'), [('district', self.gazipur.pk), ('upazila', self.sadar.pk)])
+            self.assertEqual(self.suggest('tongi'), [('provider', self.provider.pk)])
+            self.assertEqual(self.suggest('kali'), [('upazila', self.kaliakair.pk)])
+            self.assertEqual(self.suggest('kaliak'), [])
+            self.assertEqual(self.suggest('kashim'), [])
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'q': 'a', 'types': 'pets'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': 'a', 'limit': 'ten'}).status_code, status.HTTP_400_BAD_REQUEST)
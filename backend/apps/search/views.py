@@ -0,0 +1,49 @@
+"""
+PetCarePlus v2 — Search Views
+
+Autocomplete over locations and provider names (see suggest).
+"""
+
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.search.suggest import SUGGESTION_KINDS, get_suggest_index
+
+
+DEFAULT_SUGGESTION_LIMIT = 10
+MAX_SUGGESTION_LIMIT = 25
+
+
+class SuggestView(APIView):
+    """
+    GET /api/v1/search/suggest/?q=<prefix>&types=district,provider&limit=10
+
+    Locations and verified providers with a name (English or Bangla) that
+    has a word starting with `q`, coarsest location level first. Each result
+    is {type, id, name_en, name_bn, parent_id}; a location's parent_id is
+    the level above, a provider's its district. Public and served from the
+    in-process index, so authentication is skipped.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '')
+
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_SUGGESTION_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        limit = max(1, min(limit, MAX_SUGGESTION_LIMIT))
+
+        kinds = SUGGESTION_KINDS
+        if request.query_params.get('types'):
+            kinds = {kind.strip() for kind in request.query_params['types'].split(',')}
+            unknown = kinds - set(SUGGESTION_KINDS)
+            if unknown:
+                raise ValidationError({'types': f'Unknown types: {", ".join(sorted(unknown))}.'})
+
+        results = get_suggest_index().suggest(query, limit=limit, kinds=kinds)
+        return Response({'query': query, 'results': results})
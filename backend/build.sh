@@ -6,4 +6,7 @@ pip install -r requirements.txt
 
 python manage.py collectstatic --noinput
 python manage.py migrate
+python manage.py build_reverse_geocoder
+python manage.py backfill_provider_grid_cells
+python manage.py rebuild_provider_search_documents --missing
 python manage.py createcachetable || true
@@ -0,0 +1,55 @@
+"""
+PetCarePlus v2 — Async DRF Views
+
+DRF's dispatch is synchronous, so a view whose handlers await a slow call
+(the Gemini model) would still hold a worker for the whole call. Mixing
+AsyncViewMixin into an APIView or viewset makes dispatch a coroutine:
+
+- Coroutine handlers are awaited on the event loop. They must not touch
+  the ORM directly: use the async ORM (aget, acreate, asave, ...) or wrap
+  sync helpers in `sync_to_async`.
+- Authentication, permissions, throttling and sync handlers (e.g. the
+  inherited actions of a viewset) run through `sync_to_async`, as they
+  query the database.
+
+Under ASGI (config.asgi) the worker serves other requests while a handler
+awaits; under WSGI Django runs the view in its own event loop, as before.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+
+class AsyncViewMixin:
+    """Async dispatch for DRF views; see the module docstring."""
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        # Viewsets build their own view function, which Django would take for sync
+        return markcoroutinefunction(super().as_view(*args, **initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        """APIView.dispatch, awaiting the handler."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
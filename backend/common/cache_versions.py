@@ -0,0 +1,30 @@
+"""
+PetCarePlus v2 — Shared Cache Version Counters
+
+Monotonic counters kept in the shared cache so every worker can tell when
+derived data (response caches, in-process indexes) went stale. A missing
+counter is re-seeded from the clock rather than 0, so a flushed cache never
+hands out a version some worker already holds.
+"""
+
+import time
+
+from django.core.cache import cache
+
+
+def get_cache_version(key):
+    """Current value of a version counter, seeding it if missing."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    """Advance a version counter and return the new value."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        get_cache_version(key)
+        return cache.incr(key)
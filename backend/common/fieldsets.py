@@ -0,0 +1,162 @@
+"""
+PetCarePlus v2 — Sparse Fieldsets
+
+Lets read requests trim response payloads:
+
+    GET /api/v1/providers/?fields=id,business_name,avg_rating
+    GET /api/v1/bookings/?omit=provider_details.services,provider_details.supported_animal_types
+
+Dotted paths reach into nested serializers. Excluded fields are dropped from
+the serializer before it renders, so their nested serializers and method
+fields never run; views list which prefetches feed which fields in
+`sparse_prefetches`, and those prefetches are skipped as well.
+
+Only safe (GET/HEAD) requests are trimmed; writes always validate and
+respond with the full serializer.
+"""
+
+from rest_framework.permissions import SAFE_METHODS
+
+
+FIELDS_QUERY_PARAM = 'fields'
+OMIT_QUERY_PARAM = 'omit'
+
+
+def parse_fieldset(value):
+    """
+    'a,b.c,b.d' -> {'a': True, 'b': {'c': True, 'd': True}}.
+    True marks a whole field; a whole field wins over any of its sub-paths.
+    """
+    tree = {}
+    for path in (value or '').split(','):
+        parts = [part.strip() for part in path.split('.') if part.strip()]
+        if not parts:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if node is True:
+                break
+        else:
+            node[parts[-1]] = True
+    return tree
+
+
+def request_fieldset(request):
+    """(only, omit) trees of a request; only is None when all fields are wanted."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, {}
+    params = request.query_params
+    only = parse_fieldset(params.get(FIELDS_QUERY_PARAM)) or None
+    return only, parse_fieldset(params.get(OMIT_QUERY_PARAM))
+
+
+def descend(only, omit, name):
+    """The (only, omit) trees below field `name`."""
+    if isinstance(only, dict):
+        only = only.get(name)
+    only = only if isinstance(only, dict) else None
+    omit = omit.get(name) if isinstance(omit, dict) else None
+    return only, omit if isinstance(omit, dict) else {}
+
+
+def is_included(name, only, omit):
+    return (only is None or name in only) and omit.get(name) is not True
+
+
+def path_included(path, only, omit):
+    """Whether a dotted field path survives the (only, omit) trees."""
+    for name in path.split('.'):
+        if not is_included(name, only, omit):
+            return False
+        only, omit = descend(only, omit, name)
+    return True
+
+
+def trim_data(data, only, omit):
+    """Apply (only, omit) trees to already rendered data."""
+    if only is None and not omit:
+        return data
+    if isinstance(data, list):
+        return [trim_data(item, only, omit) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {
+        name: trim_data(value, *descend(only, omit, name))
+        for name, value in data.items()
+        if is_included(name, only, omit)
+    }
+
+
+class SparseFieldsetsMixin:
+    """
+    Mixin for DRF serializers honouring ?fields= / ?omit=.
+
+    The fieldset is attached to the top-level serializer by
+    SparseFieldsetsViewMixin; nested serializers find their part of it by
+    their field path. Serializers built ad hoc (e.g. inside a method field)
+    are never trimmed.
+    """
+
+    def get_sparse_fieldset(self):
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+
+        only, omit = getattr(node, 'sparse_fieldset', None) or (None, {})
+        for name in reversed(path):
+            only, omit = descend(only, omit, name)
+        return only, omit
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, omit = self.get_sparse_fieldset()
+        if only is None and not omit:
+            return fields
+        return {name: field for name, field in fields.items() if is_included(name, only, omit)}
+
+    def sparse_representation(self, data):
+        """Trim a representation built without get_fields (BaseSerializer)."""
+        return trim_data(data, *self.get_sparse_fieldset())
+
+
+class SparseFieldsetsViewMixin:
+    """
+    View mixin that binds the request's fieldset to its serializers and
+    drops prefetches whose fields were excluded.
+
+    sparse_prefetches maps dotted field paths to the prefetch lookups only
+    they need, e.g. {'services': ['services']}.
+    """
+    sparse_prefetches = {}
+
+    def get_sparse_fieldset(self):
+        return request_fieldset(self.request)
+
+    def apply_sparse_fieldset(self, serializer):
+        serializer.sparse_fieldset = self.get_sparse_fieldset()
+        return serializer
+
+    def get_serializer(self, *args, **kwargs):
+        return self.apply_sparse_fieldset(super().get_serializer(*args, **kwargs))
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        lookups = getattr(queryset, '_prefetch_related_lookups', ())
+        if not lookups or not self.sparse_prefetches:
+            return queryset
+
+        only, omit = self.get_sparse_fieldset()
+        dropped = {
+            lookup
+            for path, path_lookups in self.sparse_prefetches.items()
+            if not path_included(path, only, omit)
+            for lookup in path_lookups
+        }
+        kept = [lookup for lookup in lookups if getattr(lookup, 'prefetch_to', lookup) not in dropped]
+        if len(kept) == len(lookups):
+            return queryset
+        return queryset.prefetch_related(None).prefetch_related(*kept)
@@ -0,0 +1,71 @@
+"""
+PetCarePlus v2 — Spatial Grid Helpers
+
+Plain-integer grid cells used as an indexable spatial key on both PostgreSQL
+and SQLite (no PostGIS). The globe is cut into GRID_CELL_DEGREES squares,
+numbered row-major from (-90, -180):
+
+    cell = row * GRID_COLUMNS + col
+
+Cells of one row are contiguous integers, so the cells covering a bounding
+box collapse into one `BETWEEN` range per row — a handful of index range
+scans regardless of radius. Rows are then narrowed by the exact bounding box
+and distance filter.
+"""
+
+import math
+
+
+GRID_CELL_DEGREES = 0.1  # ~11 km north-south, ~10 km east-west in Bangladesh
+GRID_ROWS = int(round(180 / GRID_CELL_DEGREES))
+GRID_COLUMNS = int(round(360 / GRID_CELL_DEGREES))
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.0
+
+
+def bounding_box(lat, lng, radius_km):
+    """Return (min_lat, max_lat, min_lng, max_lng) enclosing a radius around a point."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return lat - lat_delta, lat + lat_delta, lng - lng_delta, lng + lng_delta
+
+
+def grid_row(lat):
+    """Grid row (latitude band) of a latitude."""
+    return min(max(int(math.floor((float(lat) + 90) / GRID_CELL_DEGREES)), 0), GRID_ROWS - 1)
+
+
+def grid_col(lng):
+    """Grid column (longitude band) of a longitude."""
+    return min(max(int(math.floor((float(lng) + 180) / GRID_CELL_DEGREES)), 0), GRID_COLUMNS - 1)
+
+
+def grid_cell(lat, lng):
+    """Grid cell number for a coordinate, or None if either part is missing."""
+    if lat is None or lng is None:
+        return None
+    return grid_row(lat) * GRID_COLUMNS + grid_col(lng)
+
+
+def covering_cell_ranges(lat, lng, radius_km):
+    """
+    Inclusive (first_cell, last_cell) ranges, one per grid row, covering the
+    bounding box of a radius around a point. Boxes crossing the antimeridian
+    are clamped rather than wrapped.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    first_col, last_col = grid_col(min_lng), grid_col(max_lng)
+    return [
+        (row * GRID_COLUMNS + first_col, row * GRID_COLUMNS + last_col)
+        for row in range(grid_row(min_lat), grid_row(max_lat) + 1)
+    ]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km between two coordinates given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
@@ -6,6 +6,21 @@ Fallback chain: user preferred language → Accept-Language header → Bangla (d
 """
 
 
+def get_request_language(request):
+    """Preferred language ('bn' or 'en') for a request; see BilingualMixin."""
+    if not request:
+        return 'bn'
+
+    # Authenticated user: use their stored preference
+    if request.user and request.user.is_authenticated:
+        return getattr(request.user, 'preferred_language', 'bn')
+
+    # Anonymous user: check Accept-Language header
+    accept_lang = request.headers.get('Accept-Language', 'bn')
+    lang = accept_lang[:2].lower()
+    return lang if lang in ('bn', 'en') else 'bn'
+
+
 class BilingualMixin:
     """
     Mixin for DRF serializers that have bilingual fields.
@@ -23,19 +38,9 @@ class BilingualMixin:
     """
 
     def get_language(self):
-        """Determine the preferred language from the request context."""
-        request = self.context.get('request')
-        if not request:
-            return 'bn'
-
-        # Authenticated user: use their stored preference
-        if request.user and request.user.is_authenticated:
-            return getattr(request.user, 'preferred_language', 'bn')
-
-        # Anonymous user: check Accept-Language header
-        accept_lang = request.headers.get('Accept-Language', 'bn')
-        lang = accept_lang[:2].lower()
-        return lang if lang in ('bn', 'en') else 'bn'
+        """Determine the preferred language from the serializer context."""
+        # An explicit 'language' (e.g. when pre-rendering cached cards) wins
+        return self.context.get('language') or get_request_language(self.context.get('request'))
 
     def get_bilingual_field(self, obj, field_name):
         """
@@ -1,8 +1,97 @@
 """
 PetCarePlus v2 — Pagination
+
+StandardPagination is page-number based by default. Infinite-scroll clients
+can opt in to keyset (cursor) pagination with `?pagination=cursor`; the
+response then carries a `next` link with an opaque `cursor` param, and no
+OFFSET or exact COUNT(*) is run:
+
+    {"count": <estimate>, "count_is_estimate": true,
+     "next": "...?pagination=cursor&cursor=...", "previous": null, "results": [...]}
+
+The keyset follows whatever ordering the queryset already has (model Meta
+ordering, `-avg_rating`, distance expressions, search score, ...), with the
+primary key appended as a tie-breaker.
 """
 
+import base64
+import datetime
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+COUNT_ESTIMATE_TIMEOUT = 60 * 5
+KEYSET_PREFIX = '_keyset_'
+
+
+def estimated_count(queryset):
+    """
+    Row count estimate for a queryset: the planner's estimate on PostgreSQL,
+    otherwise an exact COUNT(*) cached for COUNT_ESTIMATE_TIMEOUT.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        try:
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        except (ValueError, KeyError, IndexError, TypeError):
+            pass
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.md5(f'{sql}|{params!r}'.encode('utf-8')).hexdigest()
+    return cache.get_or_set(f'pagination:count:{digest}', queryset.count, COUNT_ESTIMATE_TIMEOUT)
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder keeping full microsecond precision for keyset values."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _is_nullable(model, name):
+    if name == 'pk':
+        return False
+    try:
+        return model._meta.get_field(name).null
+    except FieldDoesNotExist:
+        return True  # annotations and related lookups
+
+
+def keyset_ordering(queryset):
+    """
+    The queryset's ordering as [(expression, descending, nullable)], with
+    the primary key appended unless already present.
+    """
+    ordering = list(queryset.query.order_by) or list(queryset.query.get_meta().ordering)
+    keys = []
+    for item in ordering:
+        if isinstance(item, str):
+            if item == '?':
+                raise ValueError('Random ordering cannot be paginated by keyset.')
+            name = item.lstrip('-')
+            keys.append((F(name), item.startswith('-'), _is_nullable(queryset.model, name)))
+        elif isinstance(item, OrderBy):
+            keys.append((item.expression, item.descending, True))
+        else:
+            keys.append((item, False, True))
+
+    if not any(isinstance(expression, F) and expression.name in ('pk', queryset.model._meta.pk.name)
+               for expression, _, _ in keys):
+        keys.append((F('pk'), True, False))
+    return keys
 
 
 class StandardPagination(PageNumberPagination):
@@ -10,3 +99,108 @@ class StandardPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor_mode = (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_keyset(queryset, request)
+
+    # ── Keyset mode ──────────────────────────────────────────────
+
+    def paginate_keyset(self, queryset, request):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        keys = keyset_ordering(queryset)
+        names = [f'{KEYSET_PREFIX}{index}' for index in range(len(keys))]
+        self.count_estimate = estimated_count(queryset)
+
+        queryset = queryset.annotate(**{
+            name: expression for name, (expression, _, _) in zip(names, keys)
+        }).order_by(*[
+            OrderBy(F(name), descending=descending, nulls_last=True if nullable else None)
+            for name, (_, descending, nullable) in zip(names, keys)
+        ])
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            values = self.decode_cursor(encoded, queryset, names)
+            queryset = queryset.filter(self.after_cursor(names, keys, values))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page_rows = rows[:page_size]
+        self.next_values = [getattr(self.page_rows[-1], name) for name in names] if self.has_next else None
+        return self.page_rows
+
+    @staticmethod
+    def after_cursor(names, keys, values):
+        """Rows strictly after `values` in the keyset order (NULLs sort last)."""
+        after = Q(pk__in=[])
+        equal = Q()
+        for name, (_, descending, nullable), value in zip(names, keys, values):
+            if value is None:
+                # Only NULLs can follow a NULL, and none strictly
+                equal &= Q(**{f'{name}__isnull': True})
+                continue
+            strictly = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+            if nullable:
+                strictly |= Q(**{f'{name}__isnull': True})
+            after |= equal & strictly
+            equal &= Q(**{name: value})
+        return after
+
+    def encode_cursor(self, values):
+        payload = json.dumps(values, cls=CursorEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, encoded, queryset, names):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if not isinstance(values, list) or len(values) != len(names):
+                raise ValueError
+            annotations = queryset.query.annotations
+            return [
+                None if value is None else annotations[name].output_field.to_python(value)
+                for name, value in zip(names, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    # ── Responses ────────────────────────────────────────────────
+
+    def get_next_link(self):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        url = replace_query_param(url, self.mode_query_param, 'cursor')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_values))
+
+    def get_previous_link(self):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_previous_link()
+        return None
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_paginated_response(data)
+        return Response({
+            'count': self.count_estimate,
+            'count_is_estimate': True,
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
+
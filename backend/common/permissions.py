@@ -24,12 +24,13 @@ class IsVerifiedProvider(permissions.BasePermission):
     """Allows access only to verified service providers."""
 
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and request.user.role == 'provider'
-            and hasattr(request.user, 'service_provider')
-            and request.user.service_provider.is_verified
-        )
+        user = request.user
+        if not (user.is_authenticated and user.role == 'provider'):
+            return False
+        # Token-backed users carry verification as a claim
+        if getattr(user, 'token_backed', False):
+            return user.provider_verified
+        return hasattr(user, 'service_provider') and user.service_provider.is_verified
 
 
 class IsOwnerOrAdmin(permissions.BasePermission):
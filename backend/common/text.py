@@ -0,0 +1,33 @@
+"""
+PetCarePlus v2 — Text Normalization
+
+`normalize_text` folds a name or description to the form search keys and
+cache keys are built from (see apps.search.suggest and
+apps.ai_assistant.diagnosis_cache).
+
+Bangla normalization folds the variants a partly typed word goes through:
+nukta forms (য় / য + ় ) and the plain letter, hasanta conjuncts and their
+letters (ক্ষ / কষ), khanda ta (ৎ / ত্ ) and ZWJ/ZWNJ. English is case-folded
+and stripped of accents and punctuation.
+"""
+
+import re
+import unicodedata
+
+
+_BANGLA_FOLD = {
+    0x09BC: None,   # nukta (NFD splits য় ড় ঢ় into letter + nukta)
+    0x09CD: None,   # hasanta / virama
+    0x200C: None,   # zero width non-joiner
+    0x200D: None,   # zero width joiner
+    0x09CE: 0x09A4,  # khanda ta -> ta
+}
+_NON_WORD = re.compile(r'[^0-9a-z\u0980-\u09ff]+')
+_COMBINING_LATIN = re.compile(r'[\u0300-\u036f]')
+
+
+def normalize_text(text):
+    """Case-, accent- and Bangla-variant-folded words of `text`, space separated."""
+    text = unicodedata.normalize('NFD', (text or '').casefold()).translate(_BANGLA_FOLD)
+    text = _COMBINING_LATIN.sub('', text)
+    return ' '.join(_NON_WORD.sub(' ', text).split())
@@ -0,0 +1,63 @@
+"""
+PetCarePlus v2 — Per-Transaction Commit Hooks
+
+Signal handlers fire once per row, but derived data (search documents,
+version counters) only needs refreshing once per transaction:
+
+- `on_commit_batch(key, item, flush)` collects items under `key` and calls
+  `flush(items)` once when the transaction commits.
+- `on_commit_once(key, func)` calls `func()` once on commit, however often
+  it is scheduled.
+
+Outside a transaction both run at once, like `transaction.on_commit`. A
+batch whose transaction (or savepoint) rolled back is dropped with its
+callback, and the next call starts a new one.
+"""
+
+import threading
+
+from django.db import transaction
+
+
+_batches = threading.local()
+
+
+class _Batch:
+    """An on_commit callback that flushes a set of items once."""
+
+    def __init__(self, flush):
+        self.flush = flush
+        self.items = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.flush(self.items)
+
+
+def _pending(connection, batch):
+    return batch is not None and not batch.done and any(
+        func is batch for _, func, _ in connection.run_on_commit
+    )
+
+
+def on_commit_batch(key, item, flush, using=None, robust=False):
+    """Add `item` to this transaction's `key` batch; `flush(items)` runs once on commit."""
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        flush({item})
+        return
+
+    batches = getattr(_batches, 'pending', None)
+    if batches is None:
+        batches = _batches.pending = {}
+    batch = batches.get((connection.alias, key))
+    if not _pending(connection, batch):
+        batch = batches[(connection.alias, key)] = _Batch(flush)
+        transaction.on_commit(batch, using=using, robust=robust)
+    batch.items.add(item)
+
+
+def on_commit_once(key, func, using=None, robust=False):
+    """Call `func()` once when the current transaction commits."""
+    on_commit_batch(key, None, lambda items: func(), using=using, robust=robust)
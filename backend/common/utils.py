@@ -5,17 +5,143 @@ Implements the cascade query logic for location-scoped features:
 1. Match user's district
 2. If results < threshold, expand to division
 3. If still insufficient, return all verified results
+
+The provider cascade is resolved in a single SQL statement: one OR term per
+level (radius → upazila → district → global) where a fallback term only
+matches rows when no row of a better level exists. Every row is
+tagged with its level so callers can report the metadata without a COUNT.
 """
 
+from django.db import models
+from django.db.models import Case, Exists, F, Q, Value, When
+from django.db.models.functions import ACos, Cos, Least, Radians, Sin
+
+from apps.locations.ancestry import get_location_ancestry
 from apps.providers.models import ServiceProvider
+from apps.providers.geo_index import get_provider_geo_index
+from common.geo import EARTH_RADIUS_KM, bounding_box, covering_cell_ranges
 
 
 LOCAL_THRESHOLD = 3  # Minimum results before expanding scope
+RADIUS_KM = 15.0  # Default radius for GPS-based provider search
+NEAREST_START_RADIUS_KM = 2.0  # First ring of the nearest-N search, doubled per step
+NEAREST_MAX_RADIUS_KM = 128.0
+MAX_NEAREST = 50
 
+# Cascade level tags (lower is better)
+LEVEL_RADIUS = 0
+LEVEL_UPAZILA = 1
+LEVEL_DISTRICT = 2
+LEVEL_GLOBAL = 3
+
+
+def is_region_search(lat=None, lng=None, division_id=None, district_id=None, upazila_id=None):
+    """Explicit Region Search: region IDs were picked and no GPS was sent."""
+    return bool(not lat and not lng and (upazila_id or district_id or division_id))
+
+
+def distance_expression(lat, lng):
+    """
+    Haversine (spherical law of cosines) distance in km from a point to the
+    row's latitude/longitude, computed by the database.
+    """
+    lat_rad = Radians(lat)
+    lng_rad = Radians(lng)
+    return models.ExpressionWrapper(
+        EARTH_RADIUS_KM * ACos(Least(
+            Cos(lat_rad) * Cos(Radians(F('latitude'))) *
+            Cos(Radians(F('longitude')) - lng_rad) +
+            Sin(lat_rad) * Sin(Radians(F('latitude'))),
+            Value(1.0)
+        )),
+        output_field=models.FloatField()
+    )
+
+
+def radius_filter(lat, lng, radius_km, cell_field='grid_cell'):
+    """
+    Q object for the indexable grid cells and bounding box around a point.
+
+    The cell ranges hit the `cell_field` index; the bounding box trims the
+    cell edges before the exact distance filter runs. Models without a grid
+    cell pass cell_field=None and rely on a latitude index instead.
+    """
+    cells = Q()
+    if cell_field:
+        for first_cell, last_cell in covering_cell_ranges(lat, lng, radius_km):
+            cells |= Q(**{f'{cell_field}__range': (first_cell, last_cell)})
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    return cells & Q(
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lng, longitude__lte=max_lng,
+    )
+
+
+def resolve_cascade(qs, levels, order_by=('-avg_rating',)):
+    """
+    Resolve a fallback cascade in one query.
+
+    Every level becomes one OR term on the base table. Each term after the
+    first is gated on NOT EXISTS any row of a better level; the probes are
+    uncorrelated (evaluated once per statement) and the gate is expressed
+    as a primary-key bound, so a closed level costs nothing and an open one
+    keeps its own index. The database never counts or ranks the whole
+    candidate set just to pick a level.
+
+    Args:
+        qs: Base queryset
+        levels: Ordered list of (level_tag, Q, exact) tuples; the first level
+            with at least one matching row wins
+        order_by: Ordering applied to the surviving rows
+
+    Returns:
+        Queryset annotated with `cascade_level` and `cascade_exact`, holding
+        only the rows of the best matching level.
+    """
+    if not levels:
+        return qs.none()
+
+    candidates = qs.order_by()
+    probes = [Exists(candidates.filter(condition)) for _, condition, _ in levels]
+
+    terms = Q()
+    for index, (_, condition, _) in enumerate(levels):
+        if index:
+            # NULL bound (a better level matched) rejects every row
+            gate = Case(
+                When(Q(*[~probe for probe in probes[:index]]), then=Value(0)),
+                output_field=models.BigIntegerField(),
+            )
+            condition = Q(pk__gte=gate) & condition
+        terms |= condition
+
+    # Surviving rows all share one level, so tagging each row with its first
+    # matching condition yields the resolved level without another probe
+    return qs.filter(terms).annotate(
+        cascade_level=Case(
+            *[When(condition, then=Value(tag)) for tag, condition, _ in levels],
+            output_field=models.IntegerField(),
+        ),
+        cascade_exact=Case(
+            *[When(condition, then=Value(exact)) for _, condition, exact in levels],
+            output_field=models.BooleanField(),
+        ),
+    ).order_by(*order_by)
+
+
+def cascade_metadata(rows, default=(False, 'fallback')):
+    """
+    Derive (exact_match_found, resolved_level) from cascade-tagged rows.
+
+    Every row of a resolved cascade carries the same tag, so inspecting the
+    first row (e.g. of an already fetched page) needs no extra query.
+    `default` is returned when there are no rows.
+    """
+    for row in rows:
+        exact = getattr(row, 'cascade_exact', True)
+        return exact, 'exact' if exact else 'fallback'
+    return default
 
-from django.db import models
-from django.db.models.functions import ACos, Cos, Radians, Sin
-from django.db.models import F, ExpressionWrapper
 
 def get_local_providers(user=None, provider_type=None, animal_type_id=None,
                         lat=None, lng=None, division_id=None, district_id=None, upazila_id=None,
@@ -23,8 +149,13 @@ def get_local_providers(user=None, provider_type=None, animal_type_id=None,
     """
     Get locally-scoped providers.
     - If Region Search (IDs only, no lat/lng): Strict match, NO fallback.
-    - If Radius Search (lat/lng provided): Radius -> Upazila -> District fallback.
-    - If Implicit (User profile): Radius -> Upazila -> District fallback.
+    - If Radius Search (lat/lng provided): Radius -> Upazila fallback.
+    - If Implicit (User profile): Upazila -> District -> Global fallback.
+
+    Cascades are resolved in one statement (see `resolve_cascade`); rows are
+    tagged with `cascade_level`/`cascade_exact`. With return_metadata=True the
+    metadata is read from the first row (one LIMIT 1 query); list views should
+    prefer `cascade_metadata(page)` which needs no query at all.
     """
     if base_qs is None:
         base_qs = ServiceProvider.objects.select_related(
@@ -38,24 +169,20 @@ def get_local_providers(user=None, provider_type=None, animal_type_id=None,
     if animal_type_id:
         base_qs = base_qs.filter(animal_types__animal_type_id=animal_type_id)
 
-    # Determine if this is an explicit Region Search (IDs picked, no GPS)
-    is_region_search = not lat and not lng and (upazila_id or district_id or division_id)
-
-    if is_region_search:
+    if is_region_search(lat, lng, division_id, district_id, upazila_id):
         if upazila_id:
-            qs = base_qs.filter(upazila_id=upazila_id).order_by('-avg_rating')
-            return (qs, True, 'exact') if return_metadata else qs
-        if district_id:
-            qs = base_qs.filter(district_id=district_id).order_by('-avg_rating')
-            return (qs, True, 'exact') if return_metadata else qs
-        if division_id and division_id != 'all':
-            qs = base_qs.filter(division_id=division_id).order_by('-avg_rating')
-            return (qs, True, 'exact') if return_metadata else qs
-        qs = base_qs.order_by('-avg_rating')
+            qs = base_qs.filter(upazila_id=upazila_id)
+        elif district_id:
+            qs = base_qs.filter(district_id=district_id)
+        elif division_id and division_id != 'all':
+            qs = base_qs.filter(division_id=division_id)
+        else:
+            qs = base_qs
+        qs = qs.order_by('-avg_rating')
         return (qs, True, 'exact') if return_metadata else qs
 
     # --- Radius Search / Implicit Profile Search (with Fallback) ---
-    
+
     # Extract implicit coordinates/IDs from user if not passed directly
     if not lat and getattr(user, 'latitude', None):
         lat = user.latitude
@@ -65,93 +192,134 @@ def get_local_providers(user=None, provider_type=None, animal_type_id=None,
         upazila_id = user.upazila_id
     if not district_id and getattr(user, 'district_id', None):
         district_id = user.district_id
+    # An upazila alone still gets its district as the fallback level
+    _, district_id, upazila_id = get_location_ancestry().ancestors(
+        district_id=district_id, upazila_id=upazila_id
+    )
+
+    levels = []
+    order_by = ['-avg_rating']
 
-    # 1. Radial Haversine search (15km radius)
     if lat and lng:
+        # 1. Radial Haversine search, falling back to the upazila only
         try:
             lat_val = float(lat)
             lng_val = float(lng)
-            
-            import math
-            lat_delta = 15.0 / 111.0
-            lng_delta = 15.0 / (111.0 * math.cos(math.radians(lat_val)))
-            
-            radial_qs = base_qs.exclude(latitude__isnull=True).filter(
-                latitude__gte=lat_val - lat_delta,
-                latitude__lte=lat_val + lat_delta,
-                longitude__gte=lng_val - lng_delta,
-                longitude__lte=lng_val + lng_delta
-            )
-            
-            lat_rad = Radians(lat_val)
-            lng_rad = Radians(lng_val)
-            
-            distance_expr = ExpressionWrapper(
-                6371 * ACos(
-                    Cos(lat_rad) * Cos(Radians(F('latitude'))) *
-                    Cos(Radians(F('longitude')) - lng_rad) +
-                    Sin(lat_rad) * Sin(Radians(F('latitude')))
-                ),
-                output_field=models.FloatField()
-            )
-            
-            radial_qs = radial_qs.annotate(distance=distance_expr).filter(distance__lte=15.0).order_by('distance')
-            
-            if radial_qs.count() > 0:
-                return (radial_qs, True, 'exact') if return_metadata else radial_qs
         except (ValueError, TypeError):
-            pass
+            lat_val = lng_val = None
 
-        # Fallback to upazila if radius has 0 results
+        if lat_val is not None:
+            base_qs = base_qs.annotate(distance=distance_expression(lat_val, lng_val))
+            levels.append((
+                LEVEL_RADIUS,
+                radius_filter(lat_val, lng_val, RADIUS_KM) & Q(distance__lte=RADIUS_KM),
+                True,
+            ))
+            order_by = [
+                Case(When(cascade_level=LEVEL_RADIUS, then=F('distance'))).asc(nulls_last=True),
+                '-avg_rating',
+            ]
+        if upazila_id:
+            levels.append((LEVEL_UPAZILA, Q(upazila_id=upazila_id), False))
+    else:
+        # 2. User Profile fallback (No GPS provided, use explicitly saved IDs)
         if upazila_id:
-            upazila_qs = base_qs.filter(upazila_id=upazila_id).order_by('-avg_rating')
-            if upazila_qs.count() > 0:
-                return (upazila_qs, False, 'fallback') if return_metadata else upazila_qs
-        
-        # If NO one found (radius empty AND upazila empty/missing), return empty set!
-        empty_qs = base_qs.none()
-        return (empty_qs, False, 'fallback') if return_metadata else empty_qs
-
-    # 2. User Profile fallback (No GPS provided, fallback to explicitly saved user IDs)
-    if upazila_id:
-        local = base_qs.filter(upazila_id=upazila_id)
-        if local.count() > 0:
-            return (local.order_by('-avg_rating'), True, 'exact') if return_metadata else local.order_by('-avg_rating')
+            levels.append((LEVEL_UPAZILA, Q(upazila_id=upazila_id), True))
+        if district_id:
+            levels.append((LEVEL_DISTRICT, Q(district_id=district_id), True))
+        # 3. Global Fallback
+        levels.append((LEVEL_GLOBAL, Q(pk__isnull=False), False))
 
-    if district_id:
-        local = base_qs.filter(district_id=district_id)
-        if local.count() > 0:
-            return (local.order_by('-avg_rating'), True, 'exact') if return_metadata else local.order_by('-avg_rating')
+    qs = resolve_cascade(base_qs, levels, order_by=order_by)
+    if return_metadata:
+        exact, level = cascade_metadata(qs[:1])
+        return qs, exact, level
+    return qs
 
-    # 3. Global Fallback
-    qs = base_qs.order_by('-avg_rating')
-    return (qs, False, 'fallback') if return_metadata else qs
 
+def get_nearest_providers(lat, lng, count, provider_type=None, animal_type_id=None,
+                          base_qs=None, start_radius_km=NEAREST_START_RADIUS_KM,
+                          max_radius_km=NEAREST_MAX_RADIUS_KM):
+    """
+    Get the `count` providers nearest to a point, expanding the search ring
+    geometrically (start, 2×start, 4×start, …) from `start_radius_km` and
+    stopping at the first ring that holds `count` providers, or at
+    `max_radius_km`.
 
-def get_local_queryset(queryset, user, location_field_prefix=''):
+    Each step is a k-nearest query on the in-process geo index (see
+    apps.providers.geo_index), whose ring walk stops at the step's radius,
+    so the database is only asked for the final page of IDs.
+
+    Returns:
+        (queryset ordered by distance and annotated with `distance`,
+         radius of the last ring searched in km, whether `count` providers
+         were found)
+    """
+    if base_qs is None:
+        base_qs = ServiceProvider.objects.select_related(
+            'user', 'division', 'district', 'upazila', 'union'
+        ).prefetch_related(
+            'services', 'animal_types__animal_type'
+        ).filter(is_verified=True, is_active=True)
+
+    index = get_provider_geo_index()
+    radius = min(start_radius_km, max_radius_km)
+    while True:
+        hits = index.nearest(
+            lat, lng, k=count, radius_km=radius,
+            provider_type=provider_type, animal_type_id=animal_type_id,
+        )
+        if len(hits) >= count or radius >= max_radius_km:
+            break
+        radius = min(radius * 2, max_radius_km)
+    satisfied = len(hits) >= count
+
+    if not hits:
+        return base_qs.none(), radius, satisfied
+    qs = base_qs.filter(pk__in=[pk for pk, _ in hits]).annotate(
+        distance=Case(
+            *[When(pk=pk, then=Value(round(distance, 3))) for pk, distance in hits],
+            output_field=models.FloatField(),
+        )
+    ).order_by('distance')
+    return qs, radius, satisfied
+
+
+def get_local_queryset(queryset, user, location_field_prefix='',
+                       district_field='district_ref', division_field='division_ref'):
     """
     Generic local network scoping for any model with location fields.
 
-    Use for rehoming listings, govt resources, etc.
+    Use for rehoming listings, govt resources, etc. Matching is on location
+    IDs (the user's `district_id` / `division_id`, with missing ancestors
+    filled in from the location ancestry), so the filters hit the foreign
+    key indexes.
 
     Args:
         queryset: Base queryset to filter
         user: The requesting user
         location_field_prefix: Prefix for location fields (e.g., 'owner__' for related models)
+        district_field / division_field: Location FK names on the related
+            model (User's by default; 'district' / 'division' for providers)
 
     Returns:
         Filtered queryset with cascade scoping.
     """
-    district_field = f'{location_field_prefix}district'
-    division_field = f'{location_field_prefix}division'
+    district_field = f'{location_field_prefix}{district_field}_id'
+    division_field = f'{location_field_prefix}{division_field}_id'
 
-    if user.district:
-        local = queryset.filter(**{district_field: user.district})
+    division_id, district_id, _ = get_location_ancestry().ancestors(
+        getattr(user, 'division_id', None),
+        getattr(user, 'district_id', None),
+        getattr(user, 'upazila_id', None),
+    )
+    if district_id:
+        local = queryset.filter(**{district_field: district_id})
         if local.count() >= LOCAL_THRESHOLD:
             return local
 
-    if user.division:
-        regional = queryset.filter(**{division_field: user.division})
+    if division_id:
+        regional = queryset.filter(**{division_field: division_id})
         if regional.count() >= LOCAL_THRESHOLD:
             return regional
 
@@ -0,0 +1,13 @@
+"""
+PetCarePlus v2 — ASGI Configuration
+
+Served by uvicorn workers (see start.sh), so the async AI views await the
+model while the worker keeps serving other requests.
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+application = get_asgi_application()
@@ -71,6 +71,7 @@ INSTALLED_APPS = [
     'apps.rehoming',
     'apps.notifications',
     'apps.locations',
+    'apps.search',
 ]
 
 AUTH_USER_MODEL = 'accounts.User'
@@ -78,7 +79,7 @@ AUTH_USER_MODEL = 'accounts.User'
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'common.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise, async capable
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -106,6 +107,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 # ──────────────────────────────────────────────
 # REST Framework
@@ -138,7 +140,9 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(
         days=get_env('JWT_REFRESH_TOKEN_LIFETIME_DAYS', default=7, cast=int)
     ),
-    'ROTATE_REFRESH_TOKENS': False,
+    # Rotated/logged-out refresh tokens go to the cache blacklist
+    # (apps.accounts.token_blacklist), not simplejwt's token_blacklist tables
+    'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': False,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
@@ -150,6 +154,7 @@ SIMPLE_JWT = {
     'AUTH_COOKIE_PATH': '/',
     'AUTH_COOKIE_SAMESITE': 'Lax',
     'TOKEN_OBTAIN_SERIALIZER': 'apps.accounts.serializers.CustomTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.accounts.serializers.CustomTokenRefreshSerializer',
 }
 
 # ──────────────────────────────────────────────
@@ -183,6 +188,9 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Built by `manage.py build_reverse_geocoder` (see apps.locations.geocoder)
+REVERSE_GEOCODER_PATH = get_env('REVERSE_GEOCODER_PATH', default=str(BASE_DIR / 'var' / 'reverse_geocoder.bin'))
+
 # ──────────────────────────────────────────────
 # Miscellaneous
 # ──────────────────────────────────────────────
@@ -206,6 +214,33 @@ CORS_ALLOWED_ORIGINS = get_env(
 # ──────────────────────────────────────────────
 
 GEMINI_API_KEY = get_env('GEMINI_API_KEY', default='')
+# Empty: the SDK's endpoint. Point at a stand-in server for benchmarks.
+GEMINI_BASE_URL = get_env('GEMINI_BASE_URL', default='')
+
+# Shared client (see apps.ai_assistant.gemini_client). Deadlines are in
+# seconds; a whole call, retries included, must end well inside the
+# gunicorn worker timeout (start.sh).
+GEMINI_CONNECT_TIMEOUT = get_env('GEMINI_CONNECT_TIMEOUT', default=5, cast=float)
+GEMINI_READ_TIMEOUT = get_env('GEMINI_READ_TIMEOUT', default=40, cast=float)
+GEMINI_CALL_DEADLINE = get_env('GEMINI_CALL_DEADLINE', default=60, cast=float)
+GEMINI_MAX_ATTEMPTS = get_env('GEMINI_MAX_ATTEMPTS', default=3, cast=int)
+GEMINI_POOL_SIZE = get_env('GEMINI_POOL_SIZE', default=10, cast=int)
+
+# One-shot diagnosis cache (see apps.ai_assistant.diagnosis_cache), per
+# worker. TTL in seconds (0 disables the cache); SIMILARITY is the trigram
+# Jaccard a near-duplicate description needs to reuse an answer. The
+# near-duplicate tier is off (0) by default: a diagnosis reused for a
+# description one symptom away is wrong, so enable it only at 0.9 or above.
+AI_DIAGNOSIS_CACHE_TTL = get_env('AI_DIAGNOSIS_CACHE_TTL', default=3600, cast=int)
+AI_DIAGNOSIS_CACHE_MAX_ENTRIES = get_env('AI_DIAGNOSIS_CACHE_MAX_ENTRIES', default=2048, cast=int)
+AI_DIAGNOSIS_CACHE_SIMILARITY = get_env('AI_DIAGNOSIS_CACHE_SIMILARITY', default=0.0, cast=float)
+
+# Identical diagnose / polish requests in flight share one model call (see
+# apps.ai_assistant.single_flight). Seconds a duplicate waits for the first
+# caller's result before calling the model itself, and seconds a result
+# stays available to late duplicates.
+AI_SINGLE_FLIGHT_WAIT = get_env('AI_SINGLE_FLIGHT_WAIT', default=30, cast=float)
+AI_SINGLE_FLIGHT_RESULT_TTL = get_env('AI_SINGLE_FLIGHT_RESULT_TTL', default=10, cast=int)
 
 # ──────────────────────────────────────────────
 # Email (basic — can be overridden per environment)
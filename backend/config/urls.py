@@ -24,6 +24,7 @@ urlpatterns = [
     path('api/v1/rehoming/', include('apps.rehoming.urls')),
     path('api/v1/notifications/', include('apps.notifications.urls')),
     path('api/v1/locations/', include('apps.locations.urls')),
+    path('api/v1/search/', include('apps.search.urls')),
 
     # Health check
     path('', lambda request: JsonResponse({
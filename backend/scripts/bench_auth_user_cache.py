@@ -0,0 +1,96 @@
+"""
+Benchmark: requests/second on an authenticated, response-cached endpoint,
+with and without the CookieJWTAuthentication user cache.
+
+Seeds a throwaway test database with one user and a few providers, warms the
+provider list response cache, then replays authenticated GETs of
+/api/v1/providers/ through the full Django stack (middleware, JWT decoding,
+permissions). "uncached" resolves the user with simplejwt's stock per-request
+SELECT; "cached" uses the versioned user cache.
+
+Run: python scripts/bench_auth_user_cache.py [--requests 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest import mock
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.authentication import CookieJWTAuthentication
+from apps.accounts.models import User
+from apps.providers.models import ServiceProvider
+
+URL = '/api/v1/providers/'
+
+
+def seed():
+    user = User.objects.create_user(email='bench@test.com', password='password123', full_name='Bench')
+    for index in range(20):
+        owner = User.objects.create_user(
+            email=f'vet{index}@test.com', password='password123', full_name='Vet', role='provider'
+        )
+        ServiceProvider.objects.create(
+            user=owner, business_name=f'Vet {index}', provider_type='vet',
+            phone='01700000000', is_verified=True
+        )
+    return user
+
+
+def run(client, token, count):
+    headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+    client.get(URL, **headers)  # Warm response, saved-set and user caches
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        start = time.perf_counter()
+        for _ in range(count):
+            response = client.get(URL, **headers)
+            assert response.status_code == 200, response.status_code
+        elapsed = time.perf_counter() - start
+    return count / elapsed, len(queries) / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        cache.clear()
+        token = str(RefreshToken.for_user(seed()).access_token)
+        client = Client()
+
+        with mock.patch.object(CookieJWTAuthentication, 'get_user', JWTAuthentication.get_user):
+            uncached_rps, uncached_queries = run(client, token, args.requests)
+        cached_rps, cached_queries = run(client, token, args.requests)
+
+        print(f'{args.requests} authenticated GET {URL} ({connection.vendor})')
+        print(f'  uncached user: {uncached_rps:8.1f} req/s  {uncached_queries:.2f} queries/request')
+        print(f'  cached user:   {cached_rps:8.1f} req/s  {cached_queries:.2f} queries/request')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
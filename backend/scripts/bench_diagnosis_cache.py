@@ -0,0 +1,98 @@
+"""
+Benchmark: diagnosis cache lookups and hit rate on an outbreak-like stream.
+
+Fills a DiagnosisCache with --entries distinct descriptions, then times
+exact hits, near-duplicate hits and misses, and replays a synthetic
+outbreak: a few symptom sets, each sent with shuffled words, punctuation,
+case and plural/typo variants, as farmers would type them.
+
+Run: python scripts/bench_diagnosis_cache.py [--entries 2048] [--requests 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+from apps.ai_assistant.diagnosis_cache import DiagnosisCache, DiagnosisQuery
+
+SYMPTOMS = [
+    'fever', 'not eating', 'mouth sores', 'drooling', 'limping', 'swollen udder', 'diarrhea', 'coughing',
+    'nasal discharge', 'blisters on feet', 'weight loss', 'bloated belly', 'red eyes', 'skin lumps',
+]
+OUTBREAKS = [
+    ['fever', 'not eating', 'mouth sores', 'drooling'],
+    ['skin lumps', 'fever', 'nasal discharge'],
+    ['bloated belly', 'not eating', 'diarrhea'],
+]
+# How the same symptom gets typed
+SPELLINGS = {
+    'mouth sores': ['mouth sores', 'mouth sore', 'sores in mouth'],
+    'not eating': ['not eating', 'not eatin', 'no eating'],
+    'skin lumps': ['skin lumps', 'lumps on skin', 'skin lump'],
+    'nasal discharge': ['nasal discharge', 'nose discharge'],
+    'bloated belly': ['bloated belly', 'belly bloated', 'bloating belly'],
+}
+FILLERS = ['', ' since yesterday', ' please help', ' 2 days']
+
+
+def description(symptoms, rng):
+    words = [rng.choice(SPELLINGS.get(symptom, [symptom])) for symptom in symptoms]
+    rng.shuffle(words)
+    text = rng.choice(['cow ', 'my cow ', 'Cow: ']) + rng.choice([', ', ' ', '; ']).join(words) + rng.choice(FILLERS)
+    return text.upper() if rng.random() < 0.1 else text + rng.choice(['', '!', '.', '?'])
+
+
+def timed_us(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run(entries, requests):
+    rng = random.Random(7)
+    diagnoses = DiagnosisCache(max_entries=entries, ttl=3600, similarity=0.8)
+    stored = []
+    while len(stored) < entries:
+        text = 'cow ' + ', '.join(rng.sample(SYMPTOMS, rng.randint(2, 5))) + f' for {rng.randint(1, 400)} days'
+        query = DiagnosisQuery('Cow', 'livestock', 'en', text)
+        diagnoses.put(query, {'text': text})
+        stored.append(text)
+
+    exact = [DiagnosisQuery('Cow', 'livestock', 'en', text.upper() + '!') for text in rng.sample(stored, 500)]
+    near = [DiagnosisQuery('Cow', 'livestock', 'en', text.replace('sores', 'sore') + ' now') for text in rng.sample(stored, 500)]
+    miss = [DiagnosisQuery('Goat', 'livestock', 'en', text) for text in rng.sample(stored, 500)]
+    print(f'{entries} entries')
+    for label, queries in (('exact', exact), ('near', near), ('miss', miss)):
+        print(f'  {label:<6} {timed_us(diagnoses.get, queries):8.1f} us/lookup')
+
+    outbreak = DiagnosisCache(max_entries=entries, ttl=3600, similarity=0.8)
+    exact_only = DiagnosisCache(max_entries=entries, ttl=3600, similarity=0)
+    counts = {'exact_only': 0, 'with_near': 0}
+    for _ in range(requests):
+        query = DiagnosisQuery('Cow', 'livestock', 'en', description(rng.choice(OUTBREAKS), rng))
+        for name, cache in (('exact_only', exact_only), ('with_near', outbreak)):
+            kind, _ = cache.get(query)
+            if kind:
+                counts[name] += 1
+            else:
+                cache.put(query, {'ok': True})
+    print(f'outbreak stream of {requests} requests ({len(OUTBREAKS)} symptom sets)')
+    for name, hits in counts.items():
+        print(f'  {name:<10} hit rate {hits / requests:6.1%}  model calls {requests - hits}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=2048)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+    run(args.entries, args.requests)
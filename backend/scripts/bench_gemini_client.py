@@ -0,0 +1,132 @@
+"""
+Benchmark: shared, pooled Gemini client vs a new client per call.
+
+Starts a local stand-in for the Gemini API (HTTPS with a throwaway
+self-signed certificate made by the openssl CLI, HTTP/1.1 keep-alive, a
+fixed JSON completion after --latency-ms) and times sequential
+generateContent calls made:
+
+- fresh   the old way: genai.Client(...) per call (client setup + TCP + TLS
+          handshake every time)
+- pooled  gemini_client.generate_content (one client, warm connection)
+
+The model's own latency is the same for both; the difference is the per
+call overhead the shared client removes.
+
+Run: python scripts/bench_gemini_client.py [--calls 200] [--latency-ms 0] [--no-tls]
+"""
+
+import argparse
+import json
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+from django.conf import settings
+from google import genai
+from google.genai import types
+
+from apps.ai_assistant.gemini_client import GEMINI_MODEL, generate_content
+
+COMPLETION = json.dumps({
+    'candidates': [{'content': {'role': 'model', 'parts': [{'text': json.dumps({'reply': 'ok'})}]}}],
+}).encode()
+
+
+def stand_in_server(latency_ms, certificate=None):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+        connections = set()
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            Handler.connections.add(self.client_address)
+            time.sleep(latency_ms / 1000)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(COMPLETION)))
+            self.end_headers()
+            self.wfile.write(COMPLETION)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    if certificate:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*certificate)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, Handler.connections
+
+
+def self_signed_certificate(directory):
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=127.0.0.1',
+         '-addext', 'subjectAltName=IP:127.0.0.1', '-keyout', key, '-out', cert],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def timings_ms(fn, calls):
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def run(calls, latency_ms, tls):
+    with tempfile.TemporaryDirectory() as directory:
+        certificate = self_signed_certificate(directory) if tls else None
+        if certificate:
+            # Trusted by both the SDK's own client and the shared one
+            os.environ['SSL_CERT_FILE'] = certificate[0]
+        server, connections = stand_in_server(latency_ms, certificate)
+        scheme = 'https' if tls else 'http'
+        settings.GEMINI_API_KEY = 'stand-in-key'
+        settings.GEMINI_BASE_URL = f'{scheme}://127.0.0.1:{server.server_port}'
+        contents = [types.Content(role='user', parts=[types.Part.from_text(text='cow not eating, fever')])]
+        config = types.GenerateContentConfig(response_mime_type='application/json', temperature=0.2)
+
+        def fresh():
+            client = genai.Client(
+                api_key=settings.GEMINI_API_KEY, http_options=types.HttpOptions(base_url=settings.GEMINI_BASE_URL)
+            )
+            return client.models.generate_content(model=GEMINI_MODEL, contents=contents, config=config)
+
+        def pooled():
+            return generate_content(contents, config)
+
+        print(f'{calls} calls to a {scheme} stand-in, {latency_ms} ms model latency')
+        for label, fn in (('fresh', fresh), ('pooled', pooled)):
+            fn()  # warm imports / the shared client
+            connections.clear()
+            median, p95 = timings_ms(fn, calls)
+            print(f'  {label:<7} median={median:7.2f} ms  p95={p95:7.2f} ms  connections={len(connections)}')
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--no-tls', action='store_true')
+    args = parser.parse_args()
+    run(args.calls, args.latency_ms, not args.no_tls)
@@ -0,0 +1,153 @@
+"""
+Benchmark: provider location cascade (query count + latency).
+
+Seeds a throwaway test database with N verified providers spread over
+Bangladesh and compares the legacy count-then-fetch cascade with the
+single-statement cascade in common.utils.get_local_providers, both followed
+by the paginator COUNT + page fetch the list view performs.
+
+SQLite runs in-process, so round trips are free here; pass --rtt-ms to add a
+simulated network round trip per query (e.g. app server -> managed Postgres).
+
+Run: python scripts/bench_provider_cascade.py [--providers 50000] [--rtt-ms 2]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.locations.models import Division, District, Upazila
+from apps.providers.models import ServiceProvider
+from common.geo import grid_cell
+from common.utils import (
+    RADIUS_KM, distance_expression, get_local_providers, radius_filter,
+)
+
+User = get_user_model()
+PAGE_SIZE = 16
+
+
+def seed(count):
+    """Bulk-create `count` verified providers across 8 districts / 64 upazilas."""
+    division = Division.objects.create(name_en='Bench', name_bn='বেঞ্চ')
+    upazilas = []
+    for d in range(8):
+        district = District.objects.create(division=division, name_en=f'D{d}', name_bn=f'D{d}')
+        for u in range(8):
+            upazilas.append(Upazila.objects.create(district=district, name_en=f'U{d}-{u}', name_bn=f'U{d}-{u}'))
+
+    rng = random.Random(42)
+    users = User.objects.bulk_create(
+        [User(email=f'bench{i}@test.com', full_name=f'Bench {i}', role='provider') for i in range(count)],
+        batch_size=2000,
+    )
+    providers = []
+    for i, user in enumerate(users):
+        upazila = upazilas[i % len(upazilas)]
+        lat, lng = round(rng.uniform(20.6, 26.6), 6), round(rng.uniform(88.0, 92.7), 6)
+        providers.append(ServiceProvider(
+            user=user, business_name=f'Bench Clinic {i}', phone='01700000000',
+            division=division, district=upazila.district, upazila=upazila,
+            latitude=lat, longitude=lng, grid_cell=grid_cell(lat, lng),
+            is_verified=True, avg_rating=round(rng.uniform(0, 5), 2),
+        ))
+    ServiceProvider.objects.bulk_create(providers, batch_size=2000)
+    return upazilas
+
+
+def legacy_get_local_providers(lat=None, lng=None, upazila_id=None, district_id=None):
+    """The pre-cascade-engine implementation: COUNT each level, then fetch."""
+    base_qs = ServiceProvider.objects.filter(is_verified=True, is_active=True)
+    if lat and lng:
+        radial_qs = base_qs.filter(radius_filter(lat, lng, RADIUS_KM)).annotate(
+            distance=distance_expression(lat, lng)
+        ).filter(distance__lte=RADIUS_KM).order_by('distance')
+        if radial_qs.count() > 0:
+            return radial_qs
+        if upazila_id:
+            upazila_qs = base_qs.filter(upazila_id=upazila_id).order_by('-avg_rating')
+            if upazila_qs.count() > 0:
+                return upazila_qs
+        return base_qs.none()
+    if upazila_id:
+        local = base_qs.filter(upazila_id=upazila_id)
+        if local.count() > 0:
+            return local.order_by('-avg_rating')
+    if district_id:
+        local = base_qs.filter(district_id=district_id)
+        if local.count() > 0:
+            return local.order_by('-avg_rating')
+    return base_qs.order_by('-avg_rating')
+
+
+def first_page(qs):
+    page = Paginator(qs, PAGE_SIZE).page(1)
+    return list(page.object_list)
+
+
+def simulated_rtt(rtt_ms):
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(rtt_ms / 1000)
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+def measure(label, build, rtt_ms=0, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx, connection.execute_wrapper(simulated_rtt(rtt_ms)):
+            start = time.perf_counter()
+            first_page(build())
+            timings.append((time.perf_counter() - start) * 1000)
+    print(f'  {label:<10} queries={len(ctx.captured_queries):<3} median={sorted(timings)[len(timings) // 2]:8.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--providers', type=int, default=50000)
+    parser.add_argument('--rtt-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f'Seeding {args.providers} providers...')
+        upazilas = seed(args.providers)
+        empty_upazila = Upazila.objects.create(district=upazilas[0].district, name_en='Empty', name_bn='Empty')
+
+        scenarios = {
+            'radius hit': dict(lat=23.8103, lng=90.4125),
+            'radius -> upazila': dict(lat=10.0, lng=80.0, upazila_id=upazilas[3].id),
+            'upazila hit': dict(upazila_id=upazilas[5].id),
+            'upazila -> district': dict(upazila_id=empty_upazila.id, district_id=upazilas[9].district_id),
+            'upazila -> district -> global': dict(upazila_id=empty_upazila.id, district_id=999999),
+        }
+        for name, params in scenarios.items():
+            # Region IDs come from the user profile, as in the implicit cascade
+            profile = type('Profile', (), {
+                'upazila_id': params.get('upazila_id'), 'district_id': params.get('district_id'),
+            })()
+            base_qs = ServiceProvider.objects.filter(is_verified=True, is_active=True)
+            print(f'\n{name}')
+            measure('legacy', lambda: legacy_get_local_providers(**params), args.rtt_ms)
+            measure('cascade', lambda: get_local_providers(
+                user=profile, lat=params.get('lat'), lng=params.get('lng'), base_qs=base_qs), args.rtt_ms)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
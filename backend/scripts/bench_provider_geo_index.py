@@ -0,0 +1,96 @@
+"""
+Benchmark: in-process provider geo index vs the ORM radius path.
+
+For each size, seeds a throwaway test database with verified providers
+spread over Bangladesh (see bench_provider_cascade.seed), builds the
+in-process index and compares, for a dense (Dhaka) and a sparse point:
+
+- orm       get_local_providers(lat, lng) + paginator COUNT + first page
+- index     ProviderGeoIndex.nearest(k=PAGE_SIZE) + in_bulk() of the page IDs
+- query     the index lookup alone, without the page fetch
+
+Run: python scripts/bench_provider_geo_index.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.providers.geo_index import ProviderGeoIndex
+from apps.providers.models import ServiceProvider
+from common.utils import get_local_providers
+from bench_provider_cascade import PAGE_SIZE, first_page, seed
+
+POINTS = {
+    'dense (Dhaka)': (23.8103, 90.4125),
+    'sparse (Bay of Bengal)': (20.2000, 91.9000),
+}
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def report(label, fn, repeat):
+    with CaptureQueriesContext(connection) as ctx:
+        fn()
+    print(f'  {label:<6} queries={len(ctx.captured_queries):<3} median={median_ms(fn, repeat):9.3f} ms')
+
+
+def run(size, repeat):
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f'\n=== {size} providers ===')
+        seed(size)
+
+        index = ProviderGeoIndex()
+        start = time.perf_counter()
+        index.rebuild()
+        print(f'index build: {(time.perf_counter() - start) * 1000:.0f} ms for {len(index)} rows')
+
+        base_qs = ServiceProvider.objects.filter(is_verified=True, is_active=True)
+        for name, (lat, lng) in POINTS.items():
+            print(f'\n{name}')
+
+            def orm():
+                return first_page(get_local_providers(lat=lat, lng=lng, base_qs=base_qs))
+
+            def indexed():
+                ids = [pk for pk, _ in index.nearest(lat, lng, k=PAGE_SIZE)]
+                page = ServiceProvider.objects.in_bulk(ids)
+                return [page[pk] for pk in ids]
+
+            report('orm', orm, repeat)
+            report('index', indexed, repeat)
+            report('query', lambda: index.nearest(lat, lng, k=PAGE_SIZE), repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: provider text search latency (p50/p95).
+
+Seeds a throwaway test database with N providers and their search documents
+(business names, English/Bangla descriptions, service names drawn from small
+vocabularies), then runs the list view's ProviderSearchFilter for a set of
+English, Bangla and partial-word terms, timing COUNT + first page per query.
+
+On PostgreSQL (DATABASE_URL=postgres://…) this exercises the tsvector and
+pg_trgm GIN indexes; on SQLite it measures the ILIKE fallback.
+
+Run: python scripts/bench_provider_search.py [--providers 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.providers.models import ProviderSearchDocument, ServiceProvider
+from apps.providers.search import ProviderSearchFilter
+from apps.providers.views import ServiceProviderViewSet
+from bench_provider_cascade import PAGE_SIZE, seed
+
+NAME_WORDS = ['Happy', 'Paws', 'City', 'Care', 'Pet', 'Clinic', 'Vet', 'Friends', 'Royal', 'Green']
+EN_WORDS = ['cats', 'dogs', 'birds', 'vaccination', 'surgery', 'grooming', 'emergency', 'dental',
+            'checkup', 'boarding', 'training', 'friendly', 'experienced', 'affordable', 'home']
+BN_WORDS = ['বিড়াল', 'কুকুর', 'পাখি', 'টিকা', 'অস্ত্রোপচার', 'চিকিৎসা', 'জরুরি', 'যত্ন', 'প্রশিক্ষণ']
+SERVICES = ['General Checkup', 'Vaccination', 'Surgery', 'Nail Trimming', 'Daycare', 'Basic Obedience']
+TERMS = ['surgery', 'cats vaccination', 'Happy Paws', 'বিড়াল', 'জরুরি চিকিৎসা', 'vacc', 'nonexistentword']
+
+
+def seed_documents(count):
+    seed(count)
+    rng = random.Random(7)
+    documents = []
+    for provider in ServiceProvider.objects.order_by('pk').iterator(chunk_size=5000):
+        documents.append(ProviderSearchDocument(
+            provider=provider,
+            business_name=' '.join(rng.sample(NAME_WORDS, 3)),
+            description_en=' '.join(rng.choices(EN_WORDS, k=12)),
+            description_bn=' '.join(rng.choices(BN_WORDS, k=10)),
+            provider_type=provider.provider_type,
+            is_verified=True, is_active=True,
+            upazila_id=provider.upazila_id, district_id=provider.district_id,
+            latitude=provider.latitude, longitude=provider.longitude, grid_cell=provider.grid_cell,
+            avg_rating=provider.avg_rating, created_at=provider.created_at,
+            service_names=' '.join(rng.sample(SERVICES, 2)),
+        ))
+        if len(documents) >= 5000:
+            ProviderSearchDocument.objects.bulk_create(documents)
+            documents = []
+    ProviderSearchDocument.objects.bulk_create(documents)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def search_page(term):
+    view = ServiceProviderViewSet()
+    request = Request(APIRequestFactory().get('/', {'search': term}))
+    qs = ProviderSearchFilter().filter_queryset(
+        request, ProviderSearchDocument.objects.filter(is_verified=True, is_active=True), view
+    )
+    return qs.count(), list(qs[:PAGE_SIZE])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--providers', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f'Seeding {args.providers} providers ({connection.vendor})...')
+        seed_documents(args.providers)
+
+        for term in TERMS:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                total, _ = search_page(term)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p50 = timings[len(timings) // 2]
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f'  {term!r:<22} matches={total:<7} p50={p50:8.2f} ms  p95={p95:8.2f} ms')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: /api/v1/search/suggest/ prefix index.
+
+Seeds a throwaway test database with a Bangladesh-sized hierarchy (8
+divisions, 64 districts, 495 upazilas, 4554 unions) of synthetic English and
+Bangla names plus N verified providers, builds the suggestion index and
+times every keystroke of typing sampled names (1 character up to the whole
+name), both against the index alone and through the view.
+
+Run: python scripts/bench_search_suggest.py [--providers 5000] [--names 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+
+from apps.locations.models import Division, District, Upazila, Union
+from apps.providers.models import ServiceProvider
+from apps.search.suggest import SuggestIndex
+
+User = get_user_model()
+
+SYLLABLES_EN = ['ka', 'li', 'gon', 'pur', 'sha', 'dar', 'ra', 'mo', 'nag', 'bari', 'chor', 'tol', 'ha', 'ti', 'ban']
+SYLLABLES_BN = ['কা', 'লি', 'গঞ্জ', 'পুর', 'শা', 'দর', 'রা', 'মো', 'নগ', 'বাড়ি', 'চর', 'তল', 'হা', 'টি', 'বান']
+
+
+def name(rng):
+    picks = [rng.randrange(len(SYLLABLES_EN)) for _ in range(rng.randint(2, 4))]
+    return ''.join(SYLLABLES_EN[i] for i in picks).title(), ''.join(SYLLABLES_BN[i] for i in picks)
+
+
+def seed(provider_count, rng):
+    divisions = [Division.objects.create(name_en=f'Division {d}', name_bn=f'বিভাগ {d}') for d in range(8)]
+    districts = District.objects.bulk_create(
+        [District(division=divisions[i % 8], name_en=en, name_bn=bn) for i, (en, bn) in enumerate(name(rng) for _ in range(64))]
+    )
+    upazilas = Upazila.objects.bulk_create([
+        Upazila(district=districts[i % 64], division_id=districts[i % 64].division_id, name_en=en, name_bn=bn)
+        for i, (en, bn) in enumerate(name(rng) for _ in range(495))
+    ])
+    Union.objects.bulk_create([
+        Union(upazila=upazilas[i % 495], name_en=en, name_bn=bn)
+        for i, (en, bn) in enumerate(name(rng) for _ in range(4554))
+    ], batch_size=2000)
+    users = User.objects.bulk_create(
+        [User(email=f'bench{i}@test.com', full_name=f'Bench {i}', role='provider') for i in range(provider_count)],
+        batch_size=2000,
+    )
+    ServiceProvider.objects.bulk_create([
+        ServiceProvider(
+            user=user, business_name=f'{name(rng)[0]} Pet Clinic', phone='01700000000',
+            district=districts[i % 64], is_verified=True,
+        )
+        for i, user in enumerate(users)
+    ], batch_size=2000)
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)], timings[-1]
+
+
+def run(provider_count, name_count):
+    rng = random.Random(42)
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        seed(provider_count, rng)
+        index = SuggestIndex()
+        start = time.perf_counter()
+        index.load()
+        print(f'index build: {(time.perf_counter() - start) * 1000:.0f} ms for {len(index)} entries')
+
+        names = list(Union.objects.values_list('name_en', 'name_bn'))
+        keystrokes = [
+            text[:end]
+            for pair in rng.sample(names, name_count)
+            for text in pair
+            for end in range(1, len(text) + 1)
+        ]
+
+        timings = []
+        for prefix in keystrokes:
+            start = time.perf_counter()
+            index.suggest(prefix)
+            timings.append((time.perf_counter() - start) * 1000)
+        p50, p99, worst = percentiles(timings)
+        print(f'index  {len(keystrokes)} keystrokes  p50={p50:.3f} ms  p99={p99:.3f} ms  max={worst:.3f} ms')
+
+        client = Client()
+        client.get('/api/v1/search/suggest/', {'q': 'a'})  # warm the process-wide index
+        timings = []
+        for prefix in keystrokes:
+            start = time.perf_counter()
+            client.get('/api/v1/search/suggest/', {'q': prefix})
+            timings.append((time.perf_counter() - start) * 1000)
+        p50, p99, worst = percentiles(timings)
+        print(f'view   {len(keystrokes)} keystrokes  p50={p50:.3f} ms  p99={p99:.3f} ms  max={worst:.3f} ms')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--providers', type=int, default=5000)
+    parser.add_argument('--names', type=int, default=300)
+    args = parser.parse_args()
+    run(args.providers, args.names)
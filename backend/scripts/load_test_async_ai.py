@@ -0,0 +1,179 @@
+"""
+Load test: concurrent AI diagnose calls on sync (WSGI) vs async (ASGI) workers.
+
+Starts a local stand-in for the Gemini API (a fixed diagnosis after
+--latency-ms), migrates a throwaway SQLite database, then for each server:
+
+- wsgi   gunicorn config.wsgi, sync workers (one request per worker)
+- asgi   gunicorn config.asgi with uvicorn workers (start.sh)
+
+fires --concurrency POST /api/v1/ai/diagnose/ at once and, while they run,
+probes GET /api/v1/animals/ every 100 ms. A responsive API keeps the probe
+fast however many model calls are in flight.
+
+Run: python scripts/load_test_async_ai.py [--workers 2] [--concurrency 50] [--latency-ms 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DIAGNOSIS = json.dumps({
+    'query_type': 'disease',
+    'diagnosis': {'possible_problems': 'Mild cold', 'what_owner_can_do': 'Keep warm', 'things_to_care_about': ''},
+    'urgency': {'level': 'monitor_at_home', 'explanation': 'Mild symptoms'},
+    'warning_signs': None, 'positive_signs': None, 'guided_response': '',
+    'resource_keywords': [], 'recommended_provider_type': 'vet', 'suggest_livestock_officer': False,
+})
+COMPLETION = json.dumps({
+    'candidates': [{'content': {'role': 'model', 'parts': [{'text': DIAGNOSIS}]}}],
+}).encode()
+
+
+def stand_in_server(latency_ms):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            time.sleep(latency_ms / 1000)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(COMPLETION)))
+            self.end_headers()
+            self.wfile.write(COMPLETION)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.request_queue_size = 128
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(env):
+    """Migrated database with one animal type; returns its id."""
+    subprocess.run([sys.executable, 'manage.py', 'migrate', '--verbosity', '0'], cwd=BACKEND_DIR, env=env, check=True)
+    created = subprocess.run([sys.executable, 'manage.py', 'shell', '-c', (
+        "from apps.animals.models import AnimalType; "
+        "print(AnimalType.objects.create(name_en='Cat', name_bn='বিড়াল', slug='cat', category='companion', "
+        "icon='cat', supports_services=True).id)"
+    )], cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True)
+    return int(created.stdout.split()[-1])
+
+
+def start_server(kind, port, workers, env):
+    if kind == 'asgi':
+        app, worker_class = 'config.asgi:application', 'uvicorn_worker.UvicornWorker'
+    else:
+        app, worker_class = 'config.wsgi:application', 'sync'
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', app, '-k', worker_class, '--workers', str(workers),
+         '--bind', f'127.0.0.1:{port}', '--timeout', '120', '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            httpx.get(f'{base_url}/', timeout=1)
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f'{kind} server did not start')
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def load(base_url, concurrency, animal_type_id):
+    limits = httpx.Limits(max_connections=concurrency + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        payload = {'animal_type_id': animal_type_id, 'problem_description': 'My cat is sneezing a lot'}
+        probes = []
+        done = asyncio.Event()
+
+        async def diagnose():
+            start = time.perf_counter()
+            response = await client.post('/api/v1/ai/diagnose/', json=payload)
+            return response.status_code, time.perf_counter() - start
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get('/api/v1/animals/')
+                probes.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.1)
+
+        # Warm every worker (imports, the Gemini client) before measuring
+        await asyncio.gather(*[diagnose() for _ in range(4)])
+
+        prober = asyncio.create_task(probe())
+        start = time.perf_counter()
+        results = await asyncio.gather(*[diagnose() for _ in range(concurrency)])
+        wall = time.perf_counter() - start
+        done.set()
+        await prober
+        return results, wall, probes
+
+
+def run(workers, concurrency, latency_ms):
+    server = stand_in_server(latency_ms)
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE='config.settings.development',
+            DATABASE_URL=f'sqlite:///{os.path.join(directory, "load.sqlite3")}',
+            GEMINI_API_KEY='stand-in-key',
+            GEMINI_BASE_URL=f'http://127.0.0.1:{server.server_port}',
+            GEMINI_POOL_SIZE=str(concurrency),
+        )
+        animal_type_id = prepare_database(env)
+
+        print(f'{concurrency} concurrent diagnose calls, {workers} workers, {latency_ms:.0f} ms model latency')
+        for kind in ('wsgi', 'asgi'):
+            process, base_url = start_server(kind, free_port(), workers, env)
+            try:
+                results, wall, probes = asyncio.run(load(base_url, concurrency, animal_type_id))
+            finally:
+                process.terminate()
+                process.wait()
+            ok = sum(1 for code, _ in results if code == 200)
+            durations = [seconds for _, seconds in results]
+            print(
+                f'  {kind}  ok={ok}/{concurrency}  wall={wall:6.2f} s  call p50={percentile(durations, 0.5):6.2f} s  '
+                f'max={max(durations):6.2f} s  |  probe p50={percentile(probes, 0.5):8.1f} ms  '
+                f'p99={percentile(probes, 0.99):8.1f} ms  max={max(probes):8.1f} ms  (n={len(probes)})'
+            )
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=2000)
+    args = parser.parse_args()
+    run(args.workers, args.concurrency, args.latency_ms)
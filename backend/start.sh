@@ -3,5 +3,6 @@
 set -o errexit
 
 
-# Start Gunicorn with a longer timeout for heavy AI imports
-gunicorn config.wsgi:application --bind 0.0.0.0:$PORT --timeout 120
+# Start Gunicorn with uvicorn (ASGI) workers, so async AI views don't hold a
+# worker during model calls, and a longer timeout for heavy AI imports
+gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker --bind 0.0.0.0:$PORT --timeout 120